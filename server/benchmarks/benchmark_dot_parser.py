@@ -0,0 +1,69 @@
+"""
+compares the DOT parser for forbiditerative plan graphs with the pydot
+conversion on the bundled domains:
+
+    python -m server.benchmarks.benchmark_dot_parser
+"""
+
+import argparse
+
+from server.benchmarks.benchmark_helper import (
+    get_benchmark_tasks,
+    get_time,
+    print_table,
+)
+from server.helpers.graph_helper.dot_parser_helper import (
+    parse_plan_graph_dot_str,
+)
+from server.helpers.graph_helper.graph_helper import (
+    convert_dot_str_to_networkx_graph_with_pydot,
+)
+from server.planners.drivers.forbid_iterative_planner_driver import (
+    get_plans_dot,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-plans", type=int, default=100)
+    parser.add_argument("--num-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = list()
+    for task in get_benchmark_tasks(args.num_plans):
+        dot_str = get_plans_dot(task.domain, task.problem, task.plans)
+        g = parse_plan_graph_dot_str(dot_str)
+        pydot_time = get_time(
+            lambda: convert_dot_str_to_networkx_graph_with_pydot(dot_str),
+            args.num_repeats,
+        )
+        parser_time = get_time(
+            lambda: parse_plan_graph_dot_str(dot_str), args.num_repeats
+        )
+        rows.append(
+            [
+                task.name,
+                len(task.plans),
+                g.number_of_nodes(),
+                g.number_of_edges(),
+                f"{pydot_time * 1000:.2f}",
+                f"{parser_time * 1000:.2f}",
+                f"{pydot_time / parser_time:.1f}x",
+            ]
+        )
+    print_table(
+        [
+            "domain",
+            "plans",
+            "nodes",
+            "edges",
+            "pydot (ms)",
+            "parser (ms)",
+            "speedup",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import json
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple
+
+from server.helpers.planner_helper.planner_helper import get_plan_topk
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanningTask,
+)
+from server.planners.drivers.planner_driver_datatype import (
+    Plan,
+    PlanningResult,
+)
+
+SERVER_ROOT = Path(__file__).parent.parent
+BUNDLED_DOMAIN_DIRS = [
+    *sorted((SERVER_ROOT / "data").iterdir()),
+    *sorted(
+        path
+        for path in (SERVER_ROOT / "tests" / "data" / "pddl").iterdir()
+        if path.is_dir()
+    ),
+]
+
+
+class BenchmarkTask(NamedTuple):
+    name: str
+    domain: str
+    problem: str
+    plans: List[Plan]
+
+
+def get_benchmark_tasks(
+    num_plans: int, quality_bound: float = 1.0, use_plans_file: bool = True
+) -> Iterator[BenchmarkTask]:
+    """
+    returns the bundled domains with their plans, computing top-k plans for
+    domains without plans.json or when it is not used
+    """
+    for domain_dir in BUNDLED_DOMAIN_DIRS:
+        domain = (domain_dir / "domain.pddl").read_text()
+        problem = (domain_dir / "problem.pddl").read_text()
+        path_to_plan_file = domain_dir / "plans.json"
+        if use_plans_file and path_to_plan_file.is_file():
+            plans = [
+                Plan.model_validate(item)
+                for item in json.loads(path_to_plan_file.read_text())
+            ]
+        else:
+            planning_result = get_plan_topk(
+                PlanningTask(
+                    domain=domain,
+                    problem=problem,
+                    num_plans=num_plans,
+                    quality_bound=quality_bound,
+                )
+            )
+            plans = [] if planning_result is None else planning_result.plans
+        if len(plans) > 0:
+            # sets plan hashes
+            plans = PlanningResult(plans=plans).plans
+            yield BenchmarkTask(domain_dir.name, domain, problem, plans)
+
+
+def get_time(function: Callable[[], object], num_repeats: int) -> float:
+    """
+    returns the minimum time in seconds of calling a function
+    """
+    times = list()
+    for _ in range(num_repeats):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def print_table(header: List[str], rows: List[List[object]]) -> None:
+    columns = [header] + [[str(item) for item in row] for row in rows]
+    widths = [
+        max(len(column[idx]) for column in columns)
+        for idx in range(len(header))
+    ]
+    for column in columns:
+        print(
+            "  ".join(item.rjust(width) for item, width in zip(column, widths))
+        )
@@ -0,0 +1,79 @@
+"""
+compares building plan graphs with forbiditerative, i.e., dumping and parsing
+DOT, with replaying plans in the grounded task on the bundled domains:
+
+    python -m server.benchmarks.benchmark_plan_graph_backend
+"""
+
+import argparse
+
+from server.benchmarks.benchmark_helper import (
+    get_benchmark_tasks,
+    get_time,
+    print_table,
+)
+from server.helpers.graph_helper.dot_parser_helper import (
+    parse_plan_graph_dot_str,
+)
+from server.helpers.graph_helper.native_plan_graph_helper import (
+    build_native_plan_graph,
+)
+from server.helpers.planner_helper.sas_task_helper import get_sas_task
+from server.planners.drivers.forbid_iterative_planner_driver import (
+    get_plans_dot,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-plans", type=int, default=100)
+    parser.add_argument("--num-repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = list()
+    for task in get_benchmark_tasks(args.num_plans):
+        # the grounded task is translated once per task and cached
+        translate_time = get_time(
+            lambda: get_sas_task(task.domain, task.problem), 1
+        )
+        sas_task = get_sas_task(task.domain, task.problem)
+        g = build_native_plan_graph(sas_task, task.plans).graph
+        forbiditerative_time = get_time(
+            lambda: parse_plan_graph_dot_str(
+                get_plans_dot(task.domain, task.problem, task.plans)
+            ),
+            args.num_repeats,
+        )
+        native_time = get_time(
+            lambda: build_native_plan_graph(sas_task, task.plans),
+            args.num_repeats,
+        )
+        rows.append(
+            [
+                task.name,
+                len(task.plans),
+                g.number_of_nodes(),
+                g.number_of_edges(),
+                f"{translate_time * 1000:.2f}",
+                f"{forbiditerative_time * 1000:.2f}",
+                f"{native_time * 1000:.2f}",
+                f"{forbiditerative_time / native_time:.1f}x",
+            ]
+        )
+    print_table(
+        [
+            "domain",
+            "plans",
+            "nodes",
+            "edges",
+            "translate (ms)",
+            "forbiditerative (ms)",
+            "native (ms)",
+            "speedup",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+compares ways of annotating plan graphs with plan hashes on the plan graphs of
+large sets of top-k plans of the bundled domains, which often have cycles:
+scanning all plans for every edge, looking up an index of the actions of plans,
+both expanding nodes up to the longest plan
+
+    python -m server.benchmarks.benchmark_plan_hash_annotations
+"""
+
+import argparse
+from typing import Any, Dict, List, Set, Tuple
+
+import networkx as nx
+from networkx import Graph
+
+from server.benchmarks.benchmark_helper import (
+    get_benchmark_tasks,
+    get_time,
+    print_table,
+)
+from server.helpers.graph_helper.graph_helper import (
+    get_depth_action_plan_hashes_dict,
+    get_edge_label,
+    get_node_edge_name_plan_hash_list,
+    get_root_node_in_digraph,
+)
+from server.helpers.graph_helper.plan_graph_cache_helper import (
+    get_dot_str_and_graph,
+)
+from server.planners.drivers.planner_driver_datatype import Plan
+
+
+def get_edge_plan_hashes_by_scanning_plans(
+    g: Graph, plans: List[Plan]
+) -> Dict[Tuple[Any, Any], List[str]]:
+    """
+    returns the edge annotations of the annotation pass before the index, which
+    matches edges with the actions of all plans by substrings, expanding nodes
+    up to the longest plan as the annotation pass does
+    """
+    edge_plan_hash_dict: Dict[Tuple[Any, Any], List[str]] = dict()
+    max_depth = max((len(plan.actions) for plan in plans), default=0)
+    queue = list(get_root_node_in_digraph(g, True))
+    depth = 0
+    while len(queue) > 0:
+        new_queue: Dict[Any, None] = dict()
+        for node in queue:
+            plan_hashes_for_node: Set[str] = set()
+            for edge in list(g.out_edges(node)):
+                edge_label = get_edge_label(g, edge)
+                for plan in plans:
+                    if plan.plan_hash is not None:
+                        if depth < len(plan.actions):
+                            if edge_label in plan.actions[depth]:
+                                plan_hashes_for_node.add(plan.plan_hash)
+                                edge_plan_hash_dict.setdefault(
+                                    edge, list()
+                                ).append(plan.plan_hash)
+                if depth < max_depth:
+                    new_queue[edge[1]] = None
+        depth += 1
+        queue = list(new_queue)
+    return edge_plan_hash_dict
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-plans", type=int, default=1000)
+    parser.add_argument("--quality-bound", type=float, default=1000.0)
+    parser.add_argument("--num-repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = list()
+    for task in get_benchmark_tasks(
+        args.num_plans, args.quality_bound, use_plans_file=False
+    ):
+        _, g = get_dot_str_and_graph(task.domain, task.problem, task.plans)
+        _, edge_plan_hash_dict, _ = get_node_edge_name_plan_hash_list(
+            g, task.plans, True
+        )
+        is_same = edge_plan_hash_dict == get_edge_plan_hashes_by_scanning_plans(
+            g, task.plans
+        )
+        scan_time = get_time(
+            lambda: get_edge_plan_hashes_by_scanning_plans(g, task.plans),
+            args.num_repeats,
+        )
+        lookup_time = get_time(
+            lambda: get_node_edge_name_plan_hash_list(
+                g,
+                task.plans,
+                True,
+                get_depth_action_plan_hashes_dict(task.plans),
+            ),
+            args.num_repeats,
+        )
+        rows.append(
+            [
+                task.name,
+                len(task.plans),
+                g.number_of_nodes(),
+                g.number_of_edges(),
+                nx.is_directed_acyclic_graph(g),
+                f"{scan_time * 1000:.2f}",
+                f"{lookup_time * 1000:.2f}",
+                is_same,
+            ]
+        )
+    print_table(
+        [
+            "domain",
+            "plans",
+            "nodes",
+            "edges",
+            "acyclic",
+            "scan (ms)",
+            "index + lookup (ms)",
+            "same",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from server.helpers.catalog_helper.catalog_helper_data_types import (
+    DomainCatalogEntry,
+    DomainCatalogInfo,
+    DomainWarmUpStatus,
+)
+from server.helpers.common_helper.config_helper import (
+    get_env_bool,
+    get_env_float,
+    get_env_int,
+    get_env_str,
+)
+from server.helpers.common_helper.exception_handler import (
+    planner_exception_handler,
+)
+from server.helpers.common_helper.executor_helper import planner_executor
+from server.helpers.common_helper.file_helper import (
+    get_subfolder_paths_in_folder,
+)
+from server.helpers.common_helper.hash_helper import get_str_hash
+from server.helpers.common_helper.response_cache_helper import (
+    get_files_fingerprint,
+)
+from server.helpers.graph_helper.plan_graph_cache_helper import (
+    PlanGraph,
+    get_plan_graph,
+)
+from server.helpers.nl2plan_helper.nl2ltl_helper import CachedPrompt
+from server.helpers.planner_helper.planner_helper import (
+    get_landmarks_by_landmark_category,
+    get_plan_topk,
+)
+from server.helpers.planner_helper.planner_helper_data_types import (
+    LemmingTask,
+    Plan,
+    PlanningTask,
+)
+from server.planners.drivers.landmark_driver_datatype import Landmark
+from server.planners.drivers.planner_driver_datatype import PlanningResult
+
+SERVER_ROOT = Path(__file__).parent.parent.parent
+CATALOG_DATA_DIR = get_env_str(
+    "LEMMING_CATALOG_DATA_DIR", str(SERVER_ROOT / "data")
+)
+CATALOG_WARM_UP = get_env_bool("LEMMING_CATALOG_WARM_UP", True)
+# the defaults of the client controls, so that its first requests hit the
+# caches
+CATALOG_NUM_PLANS = get_env_int("LEMMING_CATALOG_NUM_PLANS", 10)
+CATALOG_QUALITY_BOUND = get_env_float("LEMMING_CATALOG_QUALITY_BOUND", 1.2)
+CATALOG_LANDMARK_CATEGORY = get_env_str(
+    "LEMMING_CATALOG_LANDMARK_CATEGORY", "rhw"
+)
+
+
+def get_domain_file_paths(
+    data_dir: Path, domain_name: str
+) -> Tuple[Path, Path, Path, Path]:
+    """
+    returns the paths of domain.pddl, problem.pddl, plans.json and
+    prompt.json of a domain
+    """
+    domain_dir = (data_dir / domain_name).resolve()
+    return (
+        domain_dir / "domain.pddl",
+        domain_dir / "problem.pddl",
+        domain_dir / "plans.json",
+        domain_dir / "prompt.json",
+    )
+
+
+def read_lemming_task(
+    data_dir: Path, domain_name: str
+) -> Tuple[LemmingTask, DomainCatalogEntry]:
+    """
+    returns a domain in the data folder, raising an exception if any of its
+    files is invalid
+    """
+    (
+        path_to_domain_file,
+        path_to_problem_file,
+        path_to_plan_file,
+        path_to_prompt_file,
+    ) = get_domain_file_paths(data_dir, domain_name)
+    planning_task = PlanningTask(
+        domain=path_to_domain_file.read_text(),
+        problem=path_to_problem_file.read_text(),
+    )
+    plans: List[Plan] = []
+    if path_to_plan_file.is_file():
+        plans = [
+            Plan.model_validate(item)
+            for item in json.loads(path_to_plan_file.read_text())
+        ]
+    nl_prompts: List[CachedPrompt] = []
+    if path_to_prompt_file.is_file():
+        nl_prompts = [
+            CachedPrompt.model_validate(item)
+            for item in json.loads(path_to_prompt_file.read_text())
+        ]
+    lemming_task = LemmingTask(
+        planning_task=planning_task, plans=plans, nl_prompts=nl_prompts
+    )
+    return lemming_task, DomainCatalogEntry(
+        domain_name=domain_name,
+        is_valid=True,
+        has_plans_file=path_to_plan_file.is_file(),
+        has_prompt_file=path_to_prompt_file.is_file(),
+        num_plans=len(plans),
+        num_prompts=len(nl_prompts),
+    )
+
+
+@planner_exception_handler  # type: ignore
+def get_warm_up_plan_graph(
+    domain: str, problem: str, plans: List[Plan]
+) -> PlanGraph:
+    return get_plan_graph(domain, problem, plans)
+
+
+class DomainCatalog:
+    """
+    keeps the domains of the data folder in memory and precomputes their
+    plans, landmarks and plan graphs in the background
+    """
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = CATALOG_DATA_DIR,
+        num_plans: int = CATALOG_NUM_PLANS,
+        quality_bound: float = CATALOG_QUALITY_BOUND,
+        landmark_category: Optional[str] = CATALOG_LANDMARK_CATEGORY,
+    ) -> None:
+        self.data_dir = Path(data_dir or SERVER_ROOT / "data")
+        self.num_plans = num_plans
+        self.quality_bound = quality_bound
+        self.landmark_category = landmark_category
+        self._entries: Dict[str, DomainCatalogEntry] = dict()
+        self._lemming_tasks: Dict[str, LemmingTask] = dict()
+        self._files_fingerprints: Dict[str, str] = dict()
+        self._lock = threading.RLock()
+
+    def scan(self) -> None:
+        if not self.data_dir.is_dir():
+            return
+        for domain_dir in sorted(
+            get_subfolder_paths_in_folder(str(self.data_dir))
+        ):
+            self.load_domain(Path(domain_dir).name)
+
+    def load_domain(self, domain_name: str) -> Optional[LemmingTask]:
+        files_fingerprint = get_files_fingerprint(
+            *get_domain_file_paths(self.data_dir, domain_name)
+        )
+        try:
+            lemming_task, entry = read_lemming_task(self.data_dir, domain_name)
+        except Exception as e:
+            print(e)
+            lemming_task = None
+            entry = DomainCatalogEntry(
+                domain_name=domain_name,
+                error=str(getattr(e, "detail", e)),
+                warm_up_status=DomainWarmUpStatus.SKIPPED,
+            )
+        with self._lock:
+            self._entries[domain_name] = entry
+            self._files_fingerprints[domain_name] = files_fingerprint
+            if lemming_task is None:
+                self._lemming_tasks.pop(domain_name, None)
+            else:
+                self._lemming_tasks[domain_name] = lemming_task
+        return lemming_task
+
+    def get_lemming_task(self, domain_name: str) -> Optional[LemmingTask]:
+        """
+        returns a domain of the catalog, reloading it if its files changed,
+        or None if it is not in the catalog or invalid
+        """
+        with self._lock:
+            if domain_name not in self._entries:
+                return None
+            if self._files_fingerprints[domain_name] == get_files_fingerprint(
+                *get_domain_file_paths(self.data_dir, domain_name)
+            ):
+                return self._lemming_tasks.get(domain_name)
+        return self.load_domain(domain_name)
+
+    def get_fingerprint(self, domain_name: str) -> str:
+        """
+        returns a fingerprint of a domain, which changes with its files and
+        when its plans are precomputed
+        """
+        with self._lock:
+            entry = self._entries.get(domain_name)
+            return get_str_hash(
+                get_files_fingerprint(
+                    *get_domain_file_paths(self.data_dir, domain_name)
+                ),
+                str(None if entry is None else entry.num_plans),
+            )
+
+    def warm_up(self) -> None:
+        with self._lock:
+            domain_names = [
+                domain_name
+                for domain_name, entry in self._entries.items()
+                if entry.is_valid
+            ]
+        for domain_name in domain_names:
+            self.warm_up_domain(domain_name)
+
+    def warm_up_domain(self, domain_name: str) -> None:
+        lemming_task = self.get_lemming_task(domain_name)
+        if lemming_task is None:
+            return
+        self._update_entry(
+            domain_name, warm_up_status=DomainWarmUpStatus.RUNNING
+        )
+        start_time = time.perf_counter()
+        try:
+            domain = lemming_task.planning_task.domain
+            problem = lemming_task.planning_task.problem
+            plans = lemming_task.plans
+            if len(plans) == 0:
+                planning_result: Optional[PlanningResult] = (
+                    planner_executor.submit(
+                        get_plan_topk,
+                        PlanningTask(
+                            domain=domain,
+                            problem=problem,
+                            num_plans=self.num_plans,
+                            quality_bound=self.quality_bound,
+                        ),
+                    ).result()
+                )
+                if planning_result is None or len(planning_result.plans) == 0:
+                    raise ValueError(f"no plans are found for {domain_name}")
+                plans = planning_result.plans
+                lemming_task = lemming_task.model_copy(update={"plans": plans})
+                with self._lock:
+                    self._lemming_tasks[domain_name] = lemming_task
+            num_landmarks = None
+            if self.landmark_category is not None:
+                landmarks: Optional[List[Landmark]] = planner_executor.submit(
+                    get_landmarks_by_landmark_category,
+                    lemming_task.planning_task,
+                    self.landmark_category,
+                ).result()
+                if landmarks is not None:
+                    num_landmarks = len(landmarks)
+            plan_graph: Optional[PlanGraph] = planner_executor.submit(
+                get_warm_up_plan_graph, domain, problem, plans
+            ).result()
+            if plan_graph is None:
+                raise ValueError(f"no plan graph is built for {domain_name}")
+        except (HTTPException, ValueError) as e:
+            self._update_entry(
+                domain_name,
+                warm_up_status=DomainWarmUpStatus.FAILED,
+                warm_up_error=str(getattr(e, "detail", e)),
+                warm_up_time=time.perf_counter() - start_time,
+            )
+            return
+        self._update_entry(
+            domain_name,
+            num_plans=len(plans),
+            num_landmarks=num_landmarks,
+            num_nodes=plan_graph.graph.number_of_nodes(),
+            num_edges=plan_graph.graph.number_of_edges(),
+            warm_up_status=DomainWarmUpStatus.READY,
+            warm_up_time=time.perf_counter() - start_time,
+        )
+
+    def start_warm_up(self) -> threading.Thread:
+        thread = threading.Thread(
+            target=self.warm_up, name="catalog-warm-up", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def get_catalog_info(self) -> DomainCatalogInfo:
+        with self._lock:
+            return DomainCatalogInfo(
+                domains=[entry.model_copy() for entry in self._entries.values()]
+            )
+
+    def _update_entry(self, domain_name: str, **fields: object) -> None:
+        with self._lock:
+            entry = self._entries.get(domain_name)
+            if entry is not None:
+                self._entries[domain_name] = entry.model_copy(update=fields)
+
+
+domain_catalog = DomainCatalog()
@@ -0,0 +1,31 @@
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class DomainWarmUpStatus(Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    READY = "READY"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+
+
+class DomainCatalogEntry(BaseModel):
+    domain_name: str
+    is_valid: bool = False
+    error: Optional[str] = None
+    has_plans_file: bool = False
+    has_prompt_file: bool = False
+    num_plans: int = 0
+    num_prompts: int = 0
+    warm_up_status: DomainWarmUpStatus = DomainWarmUpStatus.PENDING
+    warm_up_error: Optional[str] = None
+    warm_up_time: Optional[float] = None
+    num_landmarks: Optional[int] = None
+    num_nodes: Optional[int] = None
+    num_edges: Optional[int] = None
+
+
+class DomainCatalogInfo(BaseModel):
+    domains: List[DomainCatalogEntry] = []
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(BaseModel):
+    name: str = ""
+    num_entries: int = 0
+    size: int = 0
+    max_entries: Optional[int] = None
+    max_size: Optional[int] = None
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def get_hit_ratio(self) -> float:
+        num_lookups = self.hits + self.misses
+        return 0.0 if num_lookups == 0 else self.hits / num_lookups
+
+
+class LRUCache(Generic[K, V]):
+    """
+    a thread-safe least-recently-used cache bounded by the number of entries
+    and/or by the total size of its values (as measured by get_size);
+    entries not accessed within ttl seconds are dropped
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        max_entries: Optional[int] = 128,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+        get_size: Callable[[V], int] = lambda _: 1,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self._get_size = get_size
+        # key -> (value, size, time of last access)
+        self._entries: OrderedDict[K, Tuple[V, int, float]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_expired_entries()
+            return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            self._remove_expired_entries()
+            return key in self._entries
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            self._remove_expired_entries()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            value, size, _ = self._entries[key]
+            self._entries[key] = (value, size, time.monotonic())
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: K, value: V) -> bool:
+        """
+        caches an entry, and returns whether it is cached
+        """
+        size = self._get_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            if self.max_size is not None and size > self.max_size:
+                # an entry larger than the whole budget is never cached
+                self.evictions += 1
+                return False
+            self._entries[key] = (value, size, time.monotonic())
+            self._size += size
+            self._remove_expired_entries()
+            self._evict_to_budget()
+            return True
+
+    def pop(self, key: K) -> Optional[V]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            value, size, _ = self._entries.pop(key)
+            self._size -= size
+            return value
+
+    def resize(self, key: K) -> None:
+        """
+        re-measures the size of an entry whose value was updated in place
+        """
+        with self._lock:
+            if key not in self._entries:
+                return
+            value, size, last_access = self._entries[key]
+            new_size = self._get_size(value)
+            self._entries[key] = (value, new_size, last_access)
+            self._size += new_size - size
+            self._evict_to_budget(keep=key)
+
+    def keys(self) -> List[K]:
+        with self._lock:
+            self._remove_expired_entries()
+            return list(self._entries.keys())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                name=self.name,
+                num_entries=len(self._entries),
+                size=self._size,
+                max_entries=self.max_entries,
+                max_size=self.max_size,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def _is_over_budget(self) -> bool:
+        return (
+            self.max_entries is not None
+            and len(self._entries) > self.max_entries
+        ) or (self.max_size is not None and self._size > self.max_size)
+
+    def _evict_to_budget(self, keep: Optional[K] = None) -> None:
+        while self._is_over_budget() and len(self._entries) > 0:
+            oldest_key = next(iter(self._entries))
+            if oldest_key == keep:
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(oldest_key)
+                continue
+            self._size -= self._entries.pop(oldest_key)[1]
+            self.evictions += 1
+
+    def _remove_expired_entries(self) -> None:
+        if self.ttl is None:
+            return
+        now = time.monotonic()
+        # entries are ordered by last access, so expired ones come first
+        while len(self._entries) > 0:
+            oldest_key = next(iter(self._entries))
+            if now - self._entries[oldest_key][2] <= self.ttl:
+                break
+            self._size -= self._entries.pop(oldest_key)[1]
+            self.evictions += 1
@@ -0,0 +1,36 @@
+import os
+from typing import Optional
+
+
+def get_env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    value = os.environ.get(name)
+    if value is None or len(value.strip()) == 0:
+        return default
+    return value.strip()
+
+
+def get_env_int(name: str, default: int) -> int:
+    value = get_env_str(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError as e:
+        raise ValueError(f"{name} must be an integer: {e}") from e
+
+
+def get_env_float(name: str, default: float) -> float:
+    value = get_env_str(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError as e:
+        raise ValueError(f"{name} must be a number: {e}") from e
+
+
+def get_env_bool(name: str, default: bool) -> bool:
+    value = get_env_str(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
@@ -1,5 +1,7 @@
 from typing import Any, Callable
 
+from server.helpers.common_helper.metrics_helper import exceptions
+
 
 def planner_exception_handler(function: Callable[[Any], Any]) -> Any:
     def wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -8,6 +10,7 @@ def planner_exception_handler(function: Callable[[Any], Any]) -> Any:
             return result
         except Exception as e:
             print(e)
+            exceptions.inc(function=function.__name__)
             return None
 
     return wrapper
@@ -0,0 +1,122 @@
+import asyncio
+import contextvars
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Generator, Iterator, TypeVar
+
+from fastapi import HTTPException
+
+from server.helpers.common_helper.config_helper import get_env_int
+
+PLANNER_CONCURRENCY = get_env_int("LEMMING_PLANNER_CONCURRENCY", 4)
+PLANNER_QUEUE_SIZE = get_env_int("LEMMING_PLANNER_QUEUE_SIZE", 16)
+
+T = TypeVar("T")
+
+
+class PlannerExecutor:
+    """
+    runs blocking planner calls off the event loop with at most max_workers
+    calls at a time and at most max_queue_size calls waiting; calls beyond
+    that are rejected right away with 503
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PLANNER_CONCURRENCY,
+        max_queue_size: int = PLANNER_QUEUE_SIZE,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(0, max_queue_size)
+        # planners run as subprocesses, so threads only wait for them
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="planner"
+        )
+        self._lock = threading.Lock()
+        self._num_calls = 0  # running and waiting
+
+    @property
+    def num_calls(self) -> int:
+        return self._num_calls
+
+    def acquire(self) -> None:
+        """
+        takes a slot for a planner call, or raises 503 when there is none
+        """
+        with self._lock:
+            if self._num_calls >= self.max_workers + self.max_queue_size:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Service Unavailable: too many planner requests",
+                    headers={"Retry-After": "1"},
+                )
+            self._num_calls += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._num_calls -= 1
+
+    def submit(
+        self, function: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> "Future[T]":
+        """
+        returns the future of a planner call, whose slot is released only
+        when the call is done or cancelled before it starts
+        """
+        self.acquire()
+        # planner calls are traced within the spans of their requests
+        context = contextvars.copy_context()
+
+        def run_in_context() -> T:
+            return context.run(function, *args, **kwargs)
+
+        try:
+            future = self._executor.submit(run_in_context)
+        except BaseException:
+            self.release()
+            raise
+        future.add_done_callback(lambda _: self.release())
+        return future
+
+    async def run(
+        self, function: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        # a cancelled request leaves a running call to finish in its thread,
+        # which keeps its slot until then
+        return await asyncio.wrap_future(self.submit(function, *args, **kwargs))
+
+    def iterate(self, iterator: Iterator[T]) -> Generator[T, None, None]:
+        """
+        returns an iterator holding a slot for its whole iteration, such as a
+        planner streaming its plans, or raises 503 when there is none; the
+        slot is released once the iterator is exhausted, closed or dropped
+        """
+        self.acquire()
+        lock = threading.Lock()
+        is_released = False
+
+        def release_once() -> None:
+            nonlocal is_released
+            with lock:
+                if is_released:
+                    return
+                is_released = True
+            self.release()
+
+        def iterate_with_slot() -> Generator[T, None, None]:
+            try:
+                yield from iterator
+            finally:
+                release_once()
+
+        iterator_with_slot = iterate_with_slot()
+        # an iterator dropped before it starts never runs its finally block
+        weakref.finalize(iterator_with_slot, release_once)
+        return iterator_with_slot
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+planner_executor = PlannerExecutor()
@@ -12,3 +12,35 @@ def get_list_hash(lst: List[str]) -> str:
     if len(lst) > 0:
         return get_hash(bytearray(str(tuple(lst)), "utf-8"))
     return ""
+
+
+def get_str_hash(*strs: str) -> str:
+    dhash = hashlib.md5()
+    for s in strs:
+        # the length prefix keeps ("ab", "c") and ("a", "bc") apart
+        dhash.update(f"{len(s)}:".encode("utf-8"))
+        dhash.update(s.encode("utf-8"))
+    return dhash.hexdigest()
+
+
+def get_plan_set_fingerprint(
+    domain: str, problem: str, plan_hashes: List[str]
+) -> str:
+    """
+    returns a fingerprint of a task and a set of plans, which does not depend
+    on the order of the plans
+    """
+    return get_str_hash(domain, problem, *sorted(plan_hashes))
+
+
+def get_canonical_pddl(pddl: str) -> str:
+    """
+    returns PDDL without comments, letter case and layout, which do not change
+    the task
+    """
+    lines = [line.split(";", 1)[0] for line in pddl.splitlines()]
+    return " ".join(" ".join(lines).split()).lower()
+
+
+def get_task_fingerprint(domain: str, problem: str) -> str:
+    return get_str_hash(get_canonical_pddl(domain), get_canonical_pddl(problem))
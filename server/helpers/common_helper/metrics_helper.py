@@ -0,0 +1,308 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from server.helpers.common_helper.cache_helper import CacheStats
+from server.helpers.common_helper.trace_helper import (
+    AttributeValue,
+    Span,
+    tracer,
+)
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+SIZE_BUCKETS = tuple(float(4**exponent * 256) for exponent in range(11))
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def get_labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def get_label_str(labels: Labels, extra_label: str = "") -> str:
+    """
+    returns labels in the Prometheus text format, e.g., {stage="parse_dot"}
+    """
+    escaped_labels = [
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in labels
+    ]
+    if extra_label:
+        escaped_labels.append(extra_label)
+    return "{" + ",".join(escaped_labels) + "}" if escaped_labels else ""
+
+
+def get_number_str(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return (
+        repr(float(value)) if not float(value).is_integer() else str(int(value))
+    )
+
+
+class Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+
+    def get_sample_lines(self) -> List[str]:
+        raise NotImplementedError
+
+    def get_lines(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ] + self.get_sample_lines()
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str) -> None:
+        super().__init__(name, description)
+        self._values: Dict[Labels, float] = dict()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = get_labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get_value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(get_labels(labels), 0.0)
+
+    def get_sample_lines(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{get_label_str(labels)} {get_number_str(value)}"
+                for labels, value in sorted(self._values.items())
+            ]
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[get_labels(labels)] = value
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # bucket counts, sum and count by labels
+        self._values: Dict[Labels, Tuple[List[int], float, int]] = dict()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = get_labels(labels)
+        with self._lock:
+            bucket_counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for idx, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    bucket_counts[idx] += 1
+                    break
+            self._values[key] = (bucket_counts, total + value, count + 1)
+
+    def get_count(self, **labels: str) -> int:
+        with self._lock:
+            return self._values.get(get_labels(labels), ([], 0.0, 0))[2]
+
+    def get_sample_lines(self) -> List[str]:
+        lines: List[str] = list()
+        with self._lock:
+            for labels, (bucket_counts, total, count) in sorted(
+                self._values.items()
+            ):
+                cumulative_count = 0
+                for bucket, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative_count += bucket_count
+                    le = 'le="{}"'.format(get_number_str(bucket))
+                    lines.append(
+                        f"{self.name}_bucket{get_label_str(labels, le)}"
+                        f" {cumulative_count}"
+                    )
+                label_str = get_label_str(labels)
+                lines.append(f"{self.name}_sum{label_str} {total!r}")
+                lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    keeps metrics and renders them in the Prometheus text format; cache stats
+    are read when the metrics are rendered
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = dict()
+        self._cache_stats_getters: Dict[str, Callable[[], CacheStats]] = dict()
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self.register(Counter(name, description))  # type: ignore
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self.register(Gauge(name, description))  # type: ignore
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(
+            Histogram(name, description, buckets)
+        )  # type: ignore
+
+    def register_cache(
+        self, name: str, get_stats: Callable[[], CacheStats]
+    ) -> None:
+        with self._lock:
+            self._cache_stats_getters[name] = get_stats
+
+    def get_cache_metrics(self) -> List[Metric]:
+        with self._lock:
+            cache_stats_getters = list(self._cache_stats_getters.items())
+        gauges = {
+            "hits": Gauge("lemming_cache_hits", "Lookups found in a cache."),
+            "misses": Gauge(
+                "lemming_cache_misses", "Lookups not found in a cache."
+            ),
+            "evictions": Gauge(
+                "lemming_cache_evictions", "Entries evicted from a cache."
+            ),
+            "hit_ratio": Gauge(
+                "lemming_cache_hit_ratio", "Ratio of lookups found in a cache."
+            ),
+            "num_entries": Gauge(
+                "lemming_cache_entries", "Number of entries in a cache."
+            ),
+            "size": Gauge(
+                "lemming_cache_size_bytes",
+                "Approximate number of bytes held by a cache.",
+            ),
+        }
+        for name, get_stats in cache_stats_getters:
+            stats = get_stats()
+            gauges["hits"].set(stats.hits, cache=name)
+            gauges["misses"].set(stats.misses, cache=name)
+            gauges["evictions"].set(stats.evictions, cache=name)
+            gauges["hit_ratio"].set(stats.get_hit_ratio(), cache=name)
+            gauges["num_entries"].set(stats.num_entries, cache=name)
+            gauges["size"].set(stats.size, cache=name)
+        return list(gauges.values())
+
+    def get_text(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = list()
+        for metric in metrics + self.get_cache_metrics():
+            lines.extend(metric.get_lines())
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+request_latency = metrics_registry.histogram(
+    "lemming_http_request_duration_seconds",
+    "Latency of HTTP requests by method, endpoint and status.",
+)
+response_size = metrics_registry.histogram(
+    "lemming_http_response_size_bytes",
+    "Size of HTTP response bodies by endpoint.",
+    SIZE_BUCKETS,
+)
+stage_latency = metrics_registry.histogram(
+    "lemming_stage_duration_seconds",
+    "Latency of the stages of planning and plan disambiguation.",
+)
+planner_calls = metrics_registry.counter(
+    "lemming_planner_calls_total", "Planner subprocess calls by planner."
+)
+planner_calls_running = metrics_registry.gauge(
+    "lemming_planner_calls_running",
+    "Planner subprocess calls running by planner.",
+)
+exceptions = metrics_registry.counter(
+    "lemming_exceptions_total", "Exceptions caught by function."
+)
+
+
+@contextmanager
+def observe_stage(stage: str, **attributes: AttributeValue) -> Iterator[Span]:
+    """
+    observes the latency of a stage and traces it as a span
+    """
+    start_time = time.perf_counter()
+    try:
+        with tracer.span(stage, **attributes) as span:
+            yield span
+    finally:
+        stage_latency.observe(time.perf_counter() - start_time, stage=stage)
+
+
+@contextmanager
+def observe_planner_call(
+    planner: str, **attributes: AttributeValue
+) -> Iterator[Span]:
+    """
+    counts a planner subprocess call and observes its latency as a stage
+    """
+    planner_calls.inc(planner=planner)
+    planner_calls_running.inc(planner=planner)
+    try:
+        with observe_stage(f"planner_{planner}", **attributes) as span:
+            yield span
+    finally:
+        planner_calls_running.inc(-1, planner=planner)
+
+
+def get_route_name(path: Optional[str]) -> str:
+    return path if path is not None else "unmatched"
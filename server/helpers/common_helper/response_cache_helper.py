@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from server.helpers.common_helper.cache_helper import CacheStats, LRUCache
+from server.helpers.common_helper.config_helper import get_env_int
+from server.helpers.common_helper.hash_helper import get_str_hash
+from server.helpers.common_helper.metrics_helper import observe_stage
+from server.helpers.profile_helper.profile_helper import is_profiling
+
+RESPONSE_CACHE_MAX_NUM = get_env_int("LEMMING_RESPONSE_CACHE_MAX_NUM", 256)
+RESPONSE_CACHE_MEMORY_BUDGET = get_env_int(
+    "LEMMING_RESPONSE_CACHE_MEMORY_BUDGET", 64 * 1024 * 1024
+)
+# bump when the same inputs produce different responses, so that clients do
+# not keep stale responses
+RESPONSE_FORMAT_VERSION = "1"
+
+
+def get_request_fingerprint(endpoint: str, *inputs: Any) -> str:
+    """
+    returns a fingerprint of an endpoint and its inputs, which identifies its
+    response
+    """
+    return get_str_hash(
+        RESPONSE_FORMAT_VERSION,
+        endpoint,
+        *[
+            (
+                request_input.model_dump_json()
+                if isinstance(request_input, BaseModel)
+                else json.dumps(request_input, sort_keys=True)
+            )
+            for request_input in inputs
+        ],
+    )
+
+
+def get_files_fingerprint(*paths: Path) -> str:
+    """
+    returns a fingerprint of files from their modification times and sizes,
+    without reading them
+    """
+    file_stats = list()
+    for path in paths:
+        try:
+            stat = path.stat()
+            file_stats.append(f"{path}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            file_stats.append(f"{path}:missing")
+    return get_str_hash(*file_stats)
+
+
+def get_etag(fingerprint: str) -> str:
+    return f'"{fingerprint}"'
+
+
+class ResponseCache:
+    """
+    keeps serialized responses by the fingerprint of their inputs, which is
+    also their ETag
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = RESPONSE_CACHE_MAX_NUM,
+        memory_budget: Optional[int] = RESPONSE_CACHE_MEMORY_BUDGET,
+    ) -> None:
+        self._responses: LRUCache[str, bytes] = LRUCache(
+            name="response",
+            max_entries=max_entries,
+            max_size=memory_budget,
+            get_size=len,
+        )
+
+    def get_response(
+        self,
+        fingerprint: Optional[str],
+        get_content: Callable[[], BaseModel],
+    ) -> Response:
+        """
+        returns the cached response or a new response from get_content, with
+        the fingerprint as its ETag; responses without a fingerprint, such as
+        random selections, and profiled responses are never cached
+        """
+        headers: Dict[str, str] = dict()
+        if fingerprint is not None:
+            headers["ETag"] = get_etag(fingerprint)
+        cache_key = None if is_profiling() else fingerprint
+        content = None if cache_key is None else self._responses.get(cache_key)
+        if content is None:
+            output = get_content()
+            with observe_stage("serialize") as span:
+                content = output.model_dump_json().encode("utf-8")
+                span.set_attribute("size", len(content))
+            if cache_key is not None:
+                self._responses.put(cache_key, content)
+        return Response(
+            content=content, media_type="application/json", headers=headers
+        )
+
+    def clear(self) -> None:
+        self._responses.clear()
+
+    def get_stats(self) -> CacheStats:
+        return self._responses.get_stats()
+
+
+response_cache = ResponseCache()
@@ -26,3 +26,11 @@ def format_plans(planning_results: PlanningResult) -> PlanningResult:
             Plan(actions=format_plan(plan.actions), cost=plan.cost)
         )
     return PlanningResult(plans=formatted_plans)
+
+
+def get_server_sent_event(event: str, data: str) -> str:
+    """
+    returns a server-sent event, with one data field per line of data
+    """
+    data_lines = "".join(f"data: {line}\n" for line in data.split("\n"))
+    return f"event: {event}\n{data_lines}\n"
@@ -0,0 +1,279 @@
+import json
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from server.helpers.common_helper.config_helper import get_env_int, get_env_str
+
+# traces are only recorded when at least one exporter is set
+TRACE_FILE = get_env_str("LEMMING_TRACE_FILE")
+TRACE_OTLP_ENDPOINT = get_env_str("LEMMING_TRACE_OTLP_ENDPOINT")
+TRACE_OTLP_QUEUE_SIZE = get_env_int("LEMMING_TRACE_OTLP_QUEUE_SIZE", 256)
+TRACE_SERVICE_NAME = "lemming"
+TRACE_OTLP_TIMEOUT = 5.0
+
+AttributeValue = Union[str, int, float, bool]
+
+
+class Span:
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent: Optional["Span"] = None,
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = None if parent is None else parent.span_id
+        self.attributes: Dict[str, AttributeValue] = dict(attributes or {})
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self.error: Optional[str] = None
+        # spans of a trace are collected by its root span
+        self.finished_spans: List[Span] = (
+            [] if parent is None else parent.finished_spans
+        )
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: AttributeValue) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.end_time_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.finished_spans.append(self)
+
+    def get_duration(self) -> float:
+        end_time_ns = self.end_time_ns or time.time_ns()
+        return (end_time_ns - self.start_time_ns) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time": self.start_time_ns / 1e9,
+            "duration": self.get_duration(),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class NoopSpan(Span):
+    """
+    stands in for spans when tracing is disabled
+    """
+
+    def __init__(self) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+    def set_attributes(self, **attributes: AttributeValue) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class TraceExporter:
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+
+class JsonFileTraceExporter(TraceExporter):
+    """
+    appends each trace to a file as a line of JSON with its spans
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(
+            {
+                "trace_id": spans[0].trace_id,
+                "spans": [span.to_dict() for span in spans],
+            }
+        )
+        with self._lock:
+            with open(self.path, "a") as trace_file:
+                trace_file.write(line + "\n")
+
+
+def get_otlp_attribute_value(value: AttributeValue) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def get_otlp_span(span: Span) -> Dict[str, Any]:
+    status: Dict[str, Any] = {"code": 1}  # ok
+    if span.error is not None:
+        status = {"code": 2, "message": span.error}
+    otlp_span: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # internal
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns),
+        "attributes": [
+            {"key": key, "value": get_otlp_attribute_value(value)}
+            for key, value in span.attributes.items()
+        ],
+        "status": status,
+    }
+    if span.parent_span_id is not None:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    return otlp_span
+
+
+def get_otlp_trace(spans: List[Span]) -> Dict[str, Any]:
+    """
+    returns spans in the JSON encoding of an OTLP/HTTP trace export request
+    """
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {
+                            "key": "service.name",
+                            "value": {"stringValue": TRACE_SERVICE_NAME},
+                        }
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "lemming"},
+                        "spans": [get_otlp_span(span) for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OtlpHttpTraceExporter(TraceExporter):
+    """
+    posts traces to an OTLP/HTTP collector from a background thread; traces
+    are dropped when the collector cannot keep up
+    """
+
+    def __init__(
+        self, endpoint: str, max_queue_size: int = TRACE_OTLP_QUEUE_SIZE
+    ) -> None:
+        self.endpoint = endpoint
+        self._queue: queue.Queue[List[Span]] = queue.Queue(
+            maxsize=max(1, max_queue_size)
+        )
+        self._thread = threading.Thread(
+            target=self._post_traces, name="trace-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            pass
+
+    def _post_traces(self) -> None:
+        while True:
+            spans = self._queue.get()
+            request = urllib.request.Request(
+                self.endpoint,
+                data=json.dumps(get_otlp_trace(spans)).encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                method="POST",
+            )
+            try:
+                with urllib.request.urlopen(
+                    request, timeout=TRACE_OTLP_TIMEOUT
+                ):
+                    pass
+            except Exception as e:
+                print(e)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar(
+    "current_span", default=None
+)
+
+
+class Tracer:
+    """
+    records nested spans of a request and exports them as one trace when its
+    root span finishes; spans finishing after their root are dropped
+    """
+
+    def __init__(self, exporters: Optional[List[TraceExporter]] = None) -> None:
+        self.exporters: List[TraceExporter] = list(exporters or [])
+
+    def is_enabled(self) -> bool:
+        return len(self.exporters) > 0
+
+    @contextmanager
+    def span(self, name: str, **attributes: AttributeValue) -> Iterator[Span]:
+        if not self.is_enabled():
+            yield NOOP_SPAN
+            return
+        parent = _current_span.get()
+        span = Span(
+            name,
+            secrets.token_hex(16) if parent is None else parent.trace_id,
+            parent,
+            attributes,
+        )
+        # the parent is set back rather than reset with a token, as a span
+        # in a generator may finish in another context
+        _current_span.set(span)
+        error: Optional[BaseException] = None
+        try:
+            yield span
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            _current_span.set(parent)
+            span.finish(error)
+            if parent is None:
+                self._export(span.finished_spans)
+
+    def _export(self, spans: List[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                print(e)
+
+
+def get_trace_exporters() -> List[TraceExporter]:
+    exporters: List[TraceExporter] = []
+    if TRACE_FILE is not None:
+        exporters.append(JsonFileTraceExporter(TRACE_FILE))
+    if TRACE_OTLP_ENDPOINT is not None:
+        exporters.append(OtlpHttpTraceExporter(TRACE_OTLP_ENDPOINT))
+    return exporters
+
+
+tracer = Tracer(get_trace_exporters())
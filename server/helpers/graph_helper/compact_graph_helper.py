@@ -0,0 +1,169 @@
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from networkx import Graph
+
+# the type code of the arrays of node and label ids
+ID_TYPE_CODE = "l"
+
+
+class CompactGraph(NamedTuple):
+    """
+    an immutable graph with integer node ids in the order of the nodes of a
+    networkx graph and its forward and reverse adjacency in compressed sparse
+    row arrays, where the edges of node i are edges out_offsets[i] up to
+    out_offsets[i + 1]; parallel edges are kept in the order networkx yields
+    them, with the labels of get_edge_label interned once
+    """
+
+    node_names: Tuple[Any, ...]
+    node_ids: Dict[Any, int]
+    labels: Tuple[str, ...]
+    out_offsets: "array[int]"
+    out_targets: "array[int]"
+    out_labels: "array[int]"
+    in_offsets: "array[int]"
+    in_sources: "array[int]"
+    in_labels: "array[int]"
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_names)
+
+    def number_of_edges(self) -> int:
+        return len(self.out_targets)
+
+    def get_adjacency(
+        self, is_forward: bool
+    ) -> Tuple["array[int]", "array[int]", "array[int]"]:
+        """
+        returns the offsets, adjacent nodes and labels of the edges out of
+        nodes when going forward and into nodes when going backward
+        """
+        if is_forward:
+            return self.out_offsets, self.out_targets, self.out_labels
+        return self.in_offsets, self.in_sources, self.in_labels
+
+
+def get_edge_data_label(edge_data: Optional[Dict[Any, Any]]) -> str:
+    """
+    returns the label of the first of parallel edges without quotes in lower
+    case, or an empty string without label
+    """
+    if (
+        (edge_data is not None)
+        and (0 in edge_data)
+        and ("label" in edge_data[0])
+    ):
+        label: str = edge_data[0]["label"].replace('"', "").strip().lower()
+        return label
+    return ""
+
+
+def build_compact_graph(g: Graph) -> CompactGraph:
+    node_names = tuple(g.nodes)
+    node_ids = {node: node_id for node_id, node in enumerate(node_names)}
+    labels: List[str] = list()
+    label_ids: Dict[str, int] = dict()
+    edge_label_ids: Dict[Tuple[Any, Any], int] = dict()
+    is_multigraph = g.is_multigraph()
+
+    def get_edge_label_id(source: Any, target: Any) -> int:
+        edge = (source, target)
+        label_id = edge_label_ids.get(edge)
+        if label_id is None:
+            label = get_edge_data_label(g.get_edge_data(source, target))
+            label_id = label_ids.get(label)
+            if label_id is None:
+                label_id = len(labels)
+                label_ids[label] = label_id
+                labels.append(label)
+            edge_label_ids[edge] = label_id
+        return label_id
+
+    def get_adjacency(
+        adjacency: Any, is_forward: bool
+    ) -> Tuple["array[int]", "array[int]", "array[int]"]:
+        offsets = array(ID_TYPE_CODE, [0])
+        nodes = array(ID_TYPE_CODE)
+        edge_labels = array(ID_TYPE_CODE)
+        for node in node_names:
+            for adjacent_node, edge_data in adjacency[node].items():
+                label_id = (
+                    get_edge_label_id(node, adjacent_node)
+                    if is_forward
+                    else get_edge_label_id(adjacent_node, node)
+                )
+                for _ in range(len(edge_data) if is_multigraph else 1):
+                    nodes.append(node_ids[adjacent_node])
+                    edge_labels.append(label_id)
+            offsets.append(len(nodes))
+        return offsets, nodes, edge_labels
+
+    out_offsets, out_targets, out_labels = get_adjacency(g.adj, True)
+    in_offsets, in_sources, in_labels = get_adjacency(
+        g.pred if g.is_directed() else g.adj, False
+    )
+    return CompactGraph(
+        node_names=node_names,
+        node_ids=node_ids,
+        labels=tuple(labels),
+        out_offsets=out_offsets,
+        out_targets=out_targets,
+        out_labels=out_labels,
+        in_offsets=in_offsets,
+        in_sources=in_sources,
+        in_labels=in_labels,
+    )
+
+
+# the compact graphs of networkx graphs, kept as long as their graphs are
+compact_graphs: "WeakKeyDictionary[Graph, CompactGraph]" = WeakKeyDictionary()
+
+
+def set_compact_graph(g: Graph, cg: CompactGraph) -> None:
+    """
+    sets the compact graph of a networkx graph with the same nodes and edges
+    """
+    compact_graphs[g] = cg
+
+
+def get_compact_graph(g: Union[Graph, CompactGraph]) -> CompactGraph:
+    """
+    returns the compact graph of a networkx graph, built only once unless
+    nodes or edges are added to or removed from the graph, or a compact graph
+    as is
+    """
+    if isinstance(g, CompactGraph):
+        return g
+    cg = compact_graphs.get(g)
+    if (
+        cg is None
+        or cg.number_of_nodes() != g.number_of_nodes()
+        or cg.number_of_edges() != g.number_of_edges()
+    ):
+        cg = build_compact_graph(g)
+        set_compact_graph(g, cg)
+    return cg
+
+
+def get_compact_graph_size(cg: CompactGraph) -> int:
+    """
+    returns an estimate of the number of bytes held by a compact graph besides
+    its node names and labels, which are shared with its networkx graph
+    """
+    return (
+        sum(
+            len(ids) * ids.itemsize
+            for ids in [
+                cg.out_offsets,
+                cg.out_targets,
+                cg.out_labels,
+                cg.in_offsets,
+                cg.in_sources,
+                cg.in_labels,
+            ]
+        )
+        # a dictionary entry of a node id
+        + 100 * cg.number_of_nodes()
+    )
@@ -0,0 +1,124 @@
+import sys
+from array import array
+from typing import Any, Iterator, List, Mapping, NamedTuple, Sequence
+
+from server.helpers.graph_helper.compact_graph_helper import (
+    ID_TYPE_CODE,
+    CompactGraph,
+)
+
+# the distance of nodes not reached
+UNREACHED = -1
+
+
+class NodeDistances(Mapping[Any, int]):
+    """
+    a read-only dictionary of node names (keys) and distances of the nodes
+    reached from the roots of a graph, in the order they are reached
+    """
+
+    def __init__(
+        self, cg: CompactGraph, distances: "array[int]", order: Sequence[int]
+    ) -> None:
+        self.cg = cg
+        self.distances = distances
+        self.order = order
+
+    def __getitem__(self, node: Any) -> int:
+        node_id = self.cg.node_ids.get(node)
+        if node_id is None or self.distances[node_id] == UNREACHED:
+            raise KeyError(node)
+        distance: int = self.distances[node_id]
+        return distance
+
+    def __contains__(self, node: object) -> bool:
+        node_id = self.cg.node_ids.get(node)
+        return node_id is not None and self.distances[node_id] != UNREACHED
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self.cg.node_names[node_id] for node_id in self.order)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def get_min_distance(self, nodes: Sequence[Any]) -> int:
+        """
+        returns the minimum distance of nodes, or sys.maxsize when none of
+        them is reached
+        """
+        return min(
+            (self[node] for node in nodes if node in self),
+            default=sys.maxsize,
+        )
+
+
+class DistanceIndex(NamedTuple):
+    """
+    the distances of the nodes of a graph from its initial state and to its
+    end states, computed once per graph
+    """
+
+    dist_from_initial_state: NodeDistances
+    dist_to_end_state: NodeDistances
+
+    def get_node_distances(self, is_forward: bool) -> NodeDistances:
+        return (
+            self.dist_from_initial_state
+            if is_forward
+            else self.dist_to_end_state
+        )
+
+
+def get_root_node_ids(cg: CompactGraph, is_forward: bool) -> List[int]:
+    offsets, _, _ = cg.get_adjacency(not is_forward)
+    return [
+        node_id
+        for node_id in range(cg.number_of_nodes())
+        if offsets[node_id] == offsets[node_id + 1]
+    ]
+
+
+def get_node_distances(cg: CompactGraph, is_forward: bool) -> NodeDistances:
+    """
+    returns the number of edges from the nearest root going forward, or to the
+    nearest end state going backward, by breadth first search
+    """
+    offsets, adjacent_node_ids, _ = cg.get_adjacency(is_forward)
+    distances = array(ID_TYPE_CODE, [UNREACHED]) * cg.number_of_nodes()
+    order = get_root_node_ids(cg, is_forward)
+    for node_id in order:
+        distances[node_id] = 0
+    # the order grows while it is traversed
+    for node_id in order:
+        distance = distances[node_id] + 1
+        for target_node_id in adjacent_node_ids[
+            offsets[node_id] : offsets[node_id + 1]
+        ]:
+            if distances[target_node_id] == UNREACHED:
+                distances[target_node_id] = distance
+                order.append(target_node_id)
+    return NodeDistances(cg, distances, order)
+
+
+def get_distance_index(cg: CompactGraph) -> DistanceIndex:
+    return DistanceIndex(
+        dist_from_initial_state=get_node_distances(cg, True),
+        dist_to_end_state=get_node_distances(cg, False),
+    )
+
+
+def get_distance_index_size(distance_index: DistanceIndex) -> int:
+    """
+    returns an estimate of the number of bytes held by a distance index
+    besides its compact graph
+    """
+    return sum(
+        len(ids) * ids.itemsize
+        for ids in [
+            distance_index.dist_from_initial_state.distances,
+            distance_index.dist_to_end_state.distances,
+        ]
+    ) + 8 * (
+        len(distance_index.dist_from_initial_state)
+        + len(distance_index.dist_to_end_state)
+    )
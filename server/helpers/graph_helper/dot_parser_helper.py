@@ -0,0 +1,98 @@
+import re
+from typing import Dict, List, Tuple
+
+from networkx import MultiDiGraph
+
+# the subset of DOT written by forbiditerative: a digraph of node statements
+# and single edge statements with attribute lists, without defaults, subgraphs
+# or comments
+_ID = (
+    r"[A-Za-z_\u0080-\uffff][\w\u0080-\uffff]*"
+    r"|-?(?:\.\d+|\d+(?:\.\d*)?)"
+    r'|"(?:[^"\\]|\\.)*"'
+)
+_HEADER_PATTERN = re.compile(rf"\s*digraph\s*({_ID})?\s*\{{", re.DOTALL)
+_STATEMENT_PATTERN = re.compile(
+    rf"\s*({_ID})\s*(?:->\s*({_ID})\s*)?"
+    r'(?:\[((?:[^\]"]|"(?:[^"\\]|\\.)*")*)\])?\s*;?',
+    re.DOTALL,
+)
+_ATTRIBUTE_PATTERN = re.compile(rf"\s*({_ID})\s*=\s*({_ID})\s*[,;]?", re.DOTALL)
+_FOOTER_PATTERN = re.compile(r"\s*\}\s*", re.DOTALL)
+_KEYWORDS = {"node", "edge", "graph", "subgraph", "digraph", "strict"}
+_PARENTHESES_PATTERN = re.compile(r"\(.*?\)")
+
+
+def get_normalized_edge_label(label: str) -> str:
+    """
+    returns an edge label without its quotes and action parameters in
+    parentheses, e.g., "pick ball1 rooma left " for "pick(ball1 rooma left) "
+    """
+    return _PARENTHESES_PATTERN.sub("", label).strip('"').strip()
+
+
+def parse_attributes(attributes_str: str) -> Dict[str, str]:
+    """
+    returns the attributes of an attribute list with their values as written,
+    keeping quotes as pydot does
+    """
+    attributes: Dict[str, str] = dict()
+    position = 0
+    while position < len(attributes_str):
+        match = _ATTRIBUTE_PATTERN.match(attributes_str, position)
+        if match is None:
+            if attributes_str[position:].strip() == "":
+                break
+            raise ValueError(f"unsupported DOT attributes at {position}")
+        attributes[match.group(1).strip('"')] = match.group(2)
+        position = match.end()
+    return attributes
+
+
+def parse_plan_graph_dot_str(dot_str: str) -> MultiDiGraph:
+    """
+    returns the graph of a DOT string written by forbiditerative in one pass,
+    with the nodes, edges and attributes that networkx.nx_pydot.from_pydot
+    and edit_edge_labels produce; raises ValueError on other DOT strings
+    """
+    header_match = _HEADER_PATTERN.match(dot_str)
+    if header_match is None:
+        raise ValueError("unsupported DOT graph type")
+    graph_name = (header_match.group(1) or "G").strip('"')
+
+    nodes: List[Tuple[str, Dict[str, str]]] = list()
+    edges: List[Tuple[str, str, Dict[str, str]]] = list()
+    position = header_match.end()
+    while True:
+        footer_match = _FOOTER_PATTERN.match(dot_str, position)
+        if footer_match is not None and footer_match.end() == len(dot_str):
+            break
+        match = _STATEMENT_PATTERN.match(dot_str, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"unsupported DOT statement at {position}")
+        source, target, attributes_str = match.groups()
+        source = source.strip('"')
+        if source in _KEYWORDS:
+            raise ValueError(f"unsupported DOT statement at {position}")
+        attributes = parse_attributes(attributes_str or "")
+        if target is None:
+            nodes.append((source, attributes))
+        else:
+            target = target.strip('"')
+            if target in _KEYWORDS:
+                raise ValueError(f"unsupported DOT statement at {position}")
+            edges.append((source, target, attributes))
+        position = match.end()
+
+    g = MultiDiGraph(name=graph_name)
+    for node, attributes in nodes:
+        g.add_node(node, **attributes)
+    for source, target, attributes in edges:
+        key = g.add_edge(source, target, **attributes)
+        # only the labels of the first of parallel edges are normalized, as
+        # edit_edge_labels does
+        if key == 0 and "label" in attributes:
+            g.edges[source, target, key]["label"] = get_normalized_edge_label(
+                attributes["label"]
+            )
+    return g
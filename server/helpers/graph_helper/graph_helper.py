@@ -2,15 +2,31 @@ from __future__ import annotations
 
 import re
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import pydot
 from server.helpers.common_helper.data_type_helper import merge_sets
+from server.helpers.graph_helper.compact_graph_helper import (
+    CompactGraph,
+    get_compact_graph,
+    get_edge_data_label,
+)
+from server.helpers.graph_helper.distance_index_helper import (
+    get_node_distances,
+    get_root_node_ids,
+)
+from server.helpers.graph_helper.reachability_index_helper import (
+    ReachabilityIndex,
+    get_reachable_nodes,
+)
+from server.helpers.graph_helper.dot_parser_helper import (
+    parse_plan_graph_dot_str,
+)
 from server.helpers.planner_helper.planner_helper_data_types import (
     Landmark,
     Plan,
 )
-from networkx import Graph, nx_pydot, set_node_attributes
+from networkx import Graph, nx_pydot, restricted_view, set_node_attributes
 from networkx.readwrite import json_graph
 
 
@@ -31,22 +47,34 @@ def edit_edge_labels(g: Graph) -> Graph:
     return new_graph
 
 
-def convert_dot_str_to_networkx_graph(dot_str: str) -> Graph:
+def convert_dot_str_to_networkx_graph_with_pydot(dot_str: str) -> Graph:
     graphs = pydot.graph_from_dot_data(dot_str)  # convert to Pydot Objects
     networkx_grapg = nx_pydot.from_pydot(graphs[0])
     return edit_edge_labels(networkx_grapg)
 
 
+def convert_dot_str_to_networkx_graph(dot_str: str) -> Graph:
+    """
+    returns a graph of a DOT string, parsing the DOT strings of
+    forbiditerative without pydot
+    """
+    try:
+        return parse_plan_graph_dot_str(dot_str)
+    except ValueError:
+        return convert_dot_str_to_networkx_graph_with_pydot(dot_str)
+
+
 def get_dict_from_graph(g: Graph) -> Any:
     return json_graph.node_link_data(g)
 
 
-def get_root_node_in_digraph(g: Graph, is_forward: bool) -> List[Any]:
-    if len(g.nodes) == 0:
-        return []
-    degrees = g.in_degree() if is_forward else g.out_degree()
-    root = [n for n, d in degrees if d == 0]
-    return root
+def get_root_node_in_digraph(
+    g: Union[Graph, CompactGraph], is_forward: bool
+) -> List[Any]:
+    cg = get_compact_graph(g)
+    return [
+        cg.node_names[node_id] for node_id in get_root_node_ids(cg, is_forward)
+    ]
 
 
 def get_end_goal_node_in_digraph(g: Graph) -> Optional[Any]:
@@ -59,103 +87,107 @@ def get_end_goal_node_in_digraph(g: Graph) -> Optional[Any]:
 def get_edge_label(g: Graph, edge: Tuple[str, str]) -> str:
     if len(g.nodes) == 0:
         return ""
-    edge_data = g.get_edge_data(edge[0], edge[1])
-    if (
-        (edge_data is not None)
-        and (0 in edge_data)
-        and ("label" in edge_data[0])
-    ):
-        label = edge_data[0]["label"][:]
-        edge_label: str = label.replace('"', "").strip().lower()
-        return edge_label
-    return ""
-
-
-def add_node_to_queue(
-    g: Graph,
-    edges: List[Tuple[str, str]],
-    edges_traversed: List[str],
-    queue: List[Tuple[str, List[str]]],
-    is_forward: bool,
-) -> List[Tuple[str, List[str]]]:
-    new_queue = deepcopy(queue)
-    for edge in edges:
-        edge_label = get_edge_label(g, edge)
-        tmp_edge = edge[1][:] if is_forward else edge[0][:]
-        new_queue.append((tmp_edge, deepcopy(edges_traversed + [edge_label])))
-    return new_queue
+    return get_edge_data_label(g.get_edge_data(edge[0], edge[1]))
+
+
+def get_edges(
+    cg: CompactGraph, node_id: int, is_forward: bool
+) -> List[Tuple[Any, Any]]:
+    """
+    returns the edges out of a node when going forward and into a node when
+    going backward, as networkx yields them
+    """
+    offsets, adjacent_node_ids, _ = cg.get_adjacency(is_forward)
+    node = cg.node_names[node_id]
+    return [
+        (
+            (node, cg.node_names[adjacent_node_id])
+            if is_forward
+            else (cg.node_names[adjacent_node_id], node)
+        )
+        for adjacent_node_id in adjacent_node_ids[
+            offsets[node_id] : offsets[node_id + 1]
+        ]
+    ]
+
+
+def get_edges_traversed(
+    cg: CompactGraph,
+    path_parents: List[int],
+    path_label_ids: List[int],
+    path_id: int,
+) -> List[str]:
+    """
+    returns the labels of the edges of a path from a root, where a path is the
+    label of its last edge and the id of the path up to it, or -1 for no edges
+    """
+    label_ids: List[int] = list()
+    while path_id >= 0:
+        label_ids.append(path_label_ids[path_id])
+        path_id = path_parents[path_id]
+    return [cg.labels[label_id] for label_id in reversed(label_ids)]
 
 
 def get_first_node_with_multiple_out_edges(
-    g: Graph,
+    g: Union[Graph, CompactGraph],
     is_forward: bool,
 ) -> Tuple[List[Tuple[Any, List[Any], List[Any]]], Set[Any]]:
     """
     returns a list of tuples of 1) node with multiple out edges, 2) out edges
-    from the node, 3) edges traversed up to the node, nodes traversed
+    from the node, 3) edges traversed up to the node, nodes traversed; the
+    edges traversed up to a node are those of the first path reaching it in
+    breadth first order, and each node is visited once
     """
+    cg = get_compact_graph(g)
     nodes_with_multiple_edges: List[Tuple[Any, List[Any], List[Any]]] = list()
-    nodes_visited: Set[Any] = set()
+    nodes_visited: Set[int] = set()
 
-    if len(g.nodes) == 0:
-        return nodes_with_multiple_edges, nodes_visited
+    out_offsets = cg.out_offsets
+    offsets, adjacent_node_ids, label_ids = cg.get_adjacency(is_forward)
+    # paths share their prefixes, see get_edges_traversed
+    path_parents: List[int] = list()
+    path_label_ids: List[int] = list()
     # find a node to start
-    roots = get_root_node_in_digraph(g, is_forward)
-    queue: List[Tuple[Any, List[Any]]] = list()
-    queue.extend(list(map(lambda root: (root, []), roots)))
+    queue: List[Tuple[int, int]] = [
+        (cg.node_ids[root], -1)
+        for root in get_root_node_in_digraph(cg, is_forward)
+    ]
+    nodes_reached = {node_id for node_id, _ in queue}
     while len(queue) > 0:
-        new_queue: List[Any] = list()
-        for node, edges_traversed in queue:
-            if node in nodes_visited:
+        new_queue: List[Tuple[int, int]] = list()
+        for node_id, path_id in queue:
+            nodes_visited.add(node_id)
+            num_edges = offsets[node_id + 1] - offsets[node_id]
+            # branching is on out edges going forward and backward alike
+            num_out_edges = out_offsets[node_id + 1] - out_offsets[node_id]
+
+            if num_edges == 0:
                 continue
-            out_edges = list(g.out_edges(node))  # this is for backward
-            edges = (
-                list(g.out_edges(node))
-                if is_forward
-                else list(g.in_edges(node))
-            )
 
-            if edges is None or len(edges) == 0:
-                nodes_visited.add(node)
+            if num_out_edges > 1 or (is_forward and num_edges > 1):
+                nodes_with_multiple_edges.append(
+                    (
+                        cg.node_names[node_id],
+                        get_edges(cg, node_id, True),
+                        get_edges_traversed(
+                            cg, path_parents, path_label_ids, path_id
+                        ),
+                    )
+                )
                 continue
 
-            if is_forward:
-                if len(edges) == 1:
-                    new_queue = add_node_to_queue(
-                        g=g,
-                        edges=edges,
-                        edges_traversed=edges_traversed,
-                        queue=new_queue,
-                        is_forward=is_forward,
-                    )
-                else:
-                    nodes_with_multiple_edges.append(
-                        (
-                            deepcopy(node),
-                            deepcopy(edges),
-                            deepcopy(edges_traversed),
-                        )
-                    )
-            else:  # backward
-                if len(out_edges) > 1:
-                    nodes_with_multiple_edges.append(
-                        (
-                            deepcopy(node),
-                            deepcopy(out_edges),
-                            deepcopy(edges_traversed),
-                        )
-                    )
-                else:
-                    new_queue = add_node_to_queue(
-                        g=g,
-                        edges=edges,
-                        edges_traversed=edges_traversed,
-                        queue=new_queue,
-                        is_forward=is_forward,
-                    )
-            nodes_visited.add(node)
+            for edge_id in range(offsets[node_id], offsets[node_id + 1]):
+                target_node_id = adjacent_node_ids[edge_id]
+                # the first path reaching a node is the one it is visited on
+                if target_node_id not in nodes_reached:
+                    nodes_reached.add(target_node_id)
+                    path_parents.append(path_id)
+                    path_label_ids.append(label_ids[edge_id])
+                    new_queue.append((target_node_id, len(path_parents) - 1))
         queue = new_queue
-    return nodes_with_multiple_edges, nodes_visited
+    return nodes_with_multiple_edges, {
+        cg.node_names[node_id] for node_id in nodes_visited
+    }
 
 
 def get_landmarks_in_edges(
@@ -184,48 +216,55 @@ def get_landmarks_in_edges(
 
 
 def get_all_nodes_coming_from_node(
-    g: Graph,
+    g: Union[Graph, CompactGraph],
     source_node: Any,
     nodes_to_exclude: Set[Any] = set(),
     is_forward: bool = True,
 ) -> Set[Any]:
-    if len(g.nodes) == 0:
+    cg = get_compact_graph(g)
+    if source_node not in cg.node_ids:
         return set()
-    nodes: Set[Any] = set()
-    queue: List[Any] = list()
-    queue.append(source_node)
+    offsets, adjacent_node_ids, _ = cg.get_adjacency(is_forward)
+    excluded_node_ids = {
+        cg.node_ids[node] for node in nodes_to_exclude if node in cg.node_ids
+    }
+    node_ids: Set[int] = set()
+    queue: List[int] = [cg.node_ids[source_node]]
     while len(queue) > 0:
-        new_queue: List[Any] = list()
-        for node in queue:
-            edges = (
-                list(g.out_edges(node))
-                if is_forward
-                else list(g.in_edges(node))
-            )
-            for edge in edges:
-                target_node = edge[1] if is_forward else edge[0]
+        new_queue: List[int] = list()
+        for node_id in queue:
+            for target_node_id in adjacent_node_ids[
+                offsets[node_id] : offsets[node_id + 1]
+            ]:
                 if (
-                    target_node not in nodes
-                    and target_node not in nodes_to_exclude
+                    target_node_id not in node_ids
+                    and target_node_id not in excluded_node_ids
                 ):
-                    nodes.add(target_node)
-                    new_queue.append(target_node)
+                    node_ids.add(target_node_id)
+                    new_queue.append(target_node_id)
         queue = new_queue
-    return nodes
+    return {cg.node_names[node_id] for node_id in node_ids}
 
 
 def get_nodes_to_exclude(
-    g: Graph,
+    g: Union[Graph, CompactGraph],
     nodes_to_start: Set[Any],
     nodes_traversed: Set[Any],
     is_forward: bool,
+    reachability_index: Optional[ReachabilityIndex] = None,
 ) -> Set[Any]:
-    if len(g.nodes) == 0:
-        return set()
+    cg = get_compact_graph(g)
+    nodes_to_exclude = nodes_traversed.union(nodes_to_start)
+    if reachability_index is not None:
+        reachable_nodes = get_reachable_nodes(
+            cg, reachability_index, nodes_to_start, nodes_to_exclude, is_forward
+        )
+        if reachable_nodes is not None:
+            return reachable_nodes
     nodes_to_remove: List[Set[Any]] = list()
     for node_start in nodes_to_start:
         nodes_from_a_node = get_all_nodes_coming_from_node(
-            g, node_start, nodes_traversed.union(nodes_to_start), is_forward
+            cg, node_start, nodes_to_exclude, is_forward
         )
         nodes_to_remove.append(nodes_from_a_node)
 
@@ -233,65 +272,70 @@ def get_nodes_to_exclude(
     return merger
 
 
-def remove_nodes_from_graph(g: Graph, nodes_to_remove: Set[Any]) -> Graph:
-    new_graph = g.copy()
-    if len(g.nodes) == 0:
-        return new_graph
-    new_graph.remove_nodes_from(list(nodes_to_remove))
-    return new_graph
-
-
 def get_graph_upto_nodes(
     g: Graph,
     nodes_to_end: Set[Any],
     nodes_traversed: Set[Any],
     is_forward: bool,
+    cg: Optional[CompactGraph] = None,
+    reachability_index: Optional[ReachabilityIndex] = None,
 ) -> Graph:
+    """
+    returns a read-only view of a graph without the nodes coming from the
+    nodes to end, searched on the compact graph and with the reachability
+    index of the graph when they are given
+    """
     if len(g.nodes) == 0:
         return g.copy()
     nodes_to_exclude = get_nodes_to_exclude(
-        g, nodes_to_end, nodes_traversed, is_forward
+        g if cg is None else cg,
+        nodes_to_end,
+        nodes_traversed,
+        is_forward,
+        reachability_index,
     )
-    return remove_nodes_from_graph(g, nodes_to_exclude)
+    return restricted_view(g, nodes_to_exclude, [])
 
 
 def get_node_distance_from_terminal_node(
-    g: Graph, is_forward: bool
+    g: Union[Graph, CompactGraph], is_forward: bool
 ) -> Dict[str, int]:
     """
-    returns a dictionary of node names (keys) and lists of plan hashes
+    returns a dictionary of node names (keys) and the number of edges from the
+    nearest root node going forward or backward, in the order they are reached
     """
-    node_distance_from_terminal_node_dict: Dict[str, int] = dict()
+    return dict(get_node_distances(get_compact_graph(g), is_forward))
 
-    if len(g.nodes) == 0:
-        return node_distance_from_terminal_node_dict
 
-    start_nodes = get_root_node_in_digraph(g, is_forward)
-    queue: List[Any] = list()
-    queue.extend(start_nodes)
-    depth = 0
+def get_normalized_action_name(action_name: str) -> str:
+    return " ".join(action_name.lower().split())
 
-    while len(queue) > 0:
-        new_queue: List[Any] = list()
-        for node in queue:
-            edges = (
-                list(g.out_edges(node))
-                if is_forward
-                else list(g.in_edges(node))
-            )
-            if node not in node_distance_from_terminal_node_dict:
-                node_distance_from_terminal_node_dict[node] = depth
-            for edge in edges:
-                target_node = edge[1] if is_forward else edge[0]
-                new_queue.append(target_node)
-        depth += 1
-        queue = new_queue
 
-    return node_distance_from_terminal_node_dict
+def get_depth_action_plan_hashes_dict(
+    plans: List[Plan],
+) -> Dict[Tuple[int, str], List[str]]:
+    """
+    returns a dictionary of the positions and normalized names of actions
+    (keys) and the hashes of the plans taking them, in the order of the plans
+    """
+    depth_action_plan_hashes_dict: Dict[Tuple[int, str], List[str]] = dict()
+    for plan in plans:
+        if plan.plan_hash is None:
+            continue
+        for depth, action_name in enumerate(plan.actions):
+            depth_action_plan_hashes_dict.setdefault(
+                (depth, get_normalized_action_name(action_name)), list()
+            ).append(plan.plan_hash)
+    return depth_action_plan_hashes_dict
 
 
 def get_node_edge_name_plan_hash_list(
-    g: Graph, plans: List[Plan], is_forward: bool
+    g: Union[Graph, CompactGraph],
+    plans: List[Plan],
+    is_forward: bool,
+    depth_action_plan_hashes_dict: Optional[
+        Dict[Tuple[int, str], List[str]]
+    ] = None,
 ) -> (
     Tuple[
         Dict[str, List[str]],
@@ -301,50 +345,65 @@ def get_node_edge_name_plan_hash_list(
     | Dict[Any, Any]
 ):
     """
-    returns a dictionary of node names (keys) and lists of plan hashes
+    returns a dictionary of node names (keys) and lists of plan hashes, where
+    an edge at a depth is taken by the plans whose action at that position has
+    the name of the edge; nodes are not expanded beyond the longest plan, so
+    that the search ends on graphs with cycles
     """
-    if len(g.nodes) == 0:
+    cg = get_compact_graph(g)
+    if cg.number_of_nodes() == 0:
         return {}, {}, {}
 
-    start_nodes = get_root_node_in_digraph(g, is_forward)
+    if depth_action_plan_hashes_dict is None:
+        depth_action_plan_hashes_dict = get_depth_action_plan_hashes_dict(plans)
+    # no plan takes an action at a greater depth
+    max_depth = max((len(plan.actions) for plan in plans), default=0)
+
+    offsets, adjacent_node_ids, label_ids = cg.get_adjacency(is_forward)
+    normalized_labels = [
+        get_normalized_action_name(label) for label in cg.labels
+    ]
     node_list_plan_hash_dict: Dict[str, List[str]] = dict()
     edge_list_plan_hash_dict: Dict[Tuple[Any, Any], List[str]] = dict()
     edge_label_nodes_set_dict: Dict[str, Set[str]] = (
         dict()
     )  # a Dictionary of edge labels and sets of nodes
-    queue: List[Any] = list()
-    queue.extend(start_nodes)
+    queue: List[int] = [
+        cg.node_ids[node] for node in get_root_node_in_digraph(cg, is_forward)
+    ]
     depth = 0
     while len(queue) > 0:
-        new_queue: List[Any] = list()
-        for node in queue:
-            edges = (
-                list(g.out_edges(node))
-                if is_forward
-                else list(g.in_edges(node))
-            )
+        # a node reached on several paths of the same length is annotated once
+        new_queue: Dict[int, None] = dict()
+        for node_id in queue:
+            node = cg.node_names[node_id]
             plan_hashes_for_node: Set[str] = set()
-            for edge in edges:
-                edge_label = get_edge_label(g, edge)
+            for edge_id in range(offsets[node_id], offsets[node_id + 1]):
+                edge_label = cg.labels[label_ids[edge_id]]
                 if edge_label not in edge_label_nodes_set_dict:
                     edge_label_nodes_set_dict[edge_label] = set()
                 edge_label_nodes_set_dict[edge_label].add(node)
 
-                for plan in plans:
-                    if plan.plan_hash is not None:
-                        if depth < len(plan.actions):
-                            if edge_label in plan.actions[depth]:
-                                plan_hashes_for_node.add(plan.plan_hash[:])
-                                if edge not in edge_list_plan_hash_dict:
-                                    edge_list_plan_hash_dict[edge] = list()
-                                edge_list_plan_hash_dict[edge].append(
-                                    plan.plan_hash[:]
-                                )
-                target_node = edge[1] if is_forward else edge[0]
-                new_queue.append(target_node)
+                target_node_id = adjacent_node_ids[edge_id]
+                plan_hashes = depth_action_plan_hashes_dict.get(
+                    (depth, normalized_labels[label_ids[edge_id]])
+                )
+                if plan_hashes is not None:
+                    plan_hashes_for_node.update(plan_hashes)
+                    target_node = cg.node_names[target_node_id]
+                    edge = (
+                        (node, target_node)
+                        if is_forward
+                        else (target_node, node)
+                    )
+                    if edge not in edge_list_plan_hash_dict:
+                        edge_list_plan_hash_dict[edge] = list()
+                    edge_list_plan_hash_dict[edge].extend(plan_hashes)
+                if depth < max_depth:
+                    new_queue[target_node_id] = None
             node_list_plan_hash_dict[node] = list(plan_hashes_for_node)
         depth += 1
-        queue = new_queue
+        queue = list(new_queue)
 
     return (
         node_list_plan_hash_dict,
@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from networkx import MultiDiGraph
+
+from server.helpers.graph_helper.dot_parser_helper import (
+    get_normalized_edge_label,
+)
+from server.helpers.planner_helper.sas_task_helper import (
+    SASOperator,
+    SASTask,
+    get_normalized_operator_name,
+)
+from server.planners.drivers.planner_driver_datatype import Plan
+
+State = Tuple[int, ...]
+
+# the node attributes written by forbiditerative, with their quotes
+NODE_ATTRIBUTES = {
+    "peripheries": '"1"',
+    "shape": '"rectangle"',
+    "style": '"rounded, filled"',
+}
+NODE_FILL_COLOR = '"yellow"'
+GOAL_NODE_FILL_COLOR = '"red"'
+
+
+class NativePlanGraph(NamedTuple):
+    """
+    a plan graph built by replaying plans in a grounded task, with the plans
+    passing through each node and edge
+    """
+
+    graph: MultiDiGraph
+    node_plan_hashes_dict: Dict[str, List[str]]
+    edge_plan_hash_dict: Dict[Tuple[Any, Any], List[str]]
+
+
+def is_applicable(operator: SASOperator, state: State) -> bool:
+    return all(state[var] == value for var, value in operator.preconditions)
+
+
+def get_successor_state(operator: SASOperator, state: State) -> State:
+    """
+    returns the state reached by applying an operator, where the conditions of
+    conditional effects are evaluated in the given state
+    """
+    successor_state = list(state)
+    for effect in operator.effects:
+        if all(state[var] == value for var, value in effect.conditions):
+            successor_state[effect.var] = effect.value
+    return tuple(successor_state)
+
+
+def is_goal_state(sas_task: SASTask, state: State) -> bool:
+    return all(state[var] == value for var, value in sas_task.goal)
+
+
+def get_node_label(sas_task: SASTask, node: str, state: State) -> str:
+    value_names = "\n".join(
+        sas_task.value_names[var][value] for var, value in enumerate(state)
+    )
+    return f'"{node}\\n{value_names}\n\\n"'
+
+
+def build_native_plan_graph(
+    sas_task: SASTask, plans: List[Plan]
+) -> NativePlanGraph:
+    """
+    returns the graph forbiditerative dumps for a set of plans, where identical
+    states are merged into nodes numbered in the order they are reached;
+    raises ValueError when a plan cannot be replayed in the task
+    """
+    if sas_task.num_axioms > 0:
+        raise ValueError("tasks with axioms are not supported")
+
+    g = MultiDiGraph(name="G")
+    state_nodes: Dict[State, str] = dict()
+    edge_keys: Dict[Tuple[str, str, str], int] = dict()
+    node_plan_hashes_dict: Dict[str, List[str]] = dict()
+    edge_plan_hash_dict: Dict[Tuple[Any, Any], List[str]] = dict()
+
+    def get_node(state: State) -> str:
+        node = state_nodes.get(state)
+        if node is None:
+            node = f"node{len(state_nodes)}"
+            state_nodes[state] = node
+            g.add_node(
+                node,
+                **NODE_ATTRIBUTES,
+                fillcolor=(
+                    GOAL_NODE_FILL_COLOR
+                    if is_goal_state(sas_task, state)
+                    else NODE_FILL_COLOR
+                ),
+                label=get_node_label(sas_task, node, state),
+            )
+            node_plan_hashes_dict[node] = list()
+        return node
+
+    def add_plan_hash(plan_hashes: List[str], plan_hash: Any) -> None:
+        if plan_hash is not None and plan_hash not in plan_hashes:
+            plan_hashes.append(plan_hash)
+
+    for plan in plans:
+        state = sas_task.initial_state
+        node = get_node(state)
+        add_plan_hash(node_plan_hashes_dict[node], plan.plan_hash)
+        for action in plan.actions:
+            operator = sas_task.operators.get(
+                get_normalized_operator_name(action)
+            )
+            if operator is None:
+                raise ValueError(f"unknown action {action}")
+            if not is_applicable(operator, state):
+                raise ValueError(f"inapplicable action {action}")
+            state = get_successor_state(operator, state)
+            target_node = get_node(state)
+            if (node, target_node, operator.name) not in edge_keys:
+                label = f'"{operator.name}"'
+                # only the labels of the first of parallel edges are
+                # normalized, as edit_edge_labels does
+                key = g.add_edge(node, target_node, label=label)
+                if key == 0:
+                    g.edges[node, target_node, key]["label"] = (
+                        get_normalized_edge_label(label)
+                    )
+                edge_keys[node, target_node, operator.name] = key
+            add_plan_hash(
+                edge_plan_hash_dict.setdefault((node, target_node), list()),
+                plan.plan_hash,
+            )
+            add_plan_hash(node_plan_hashes_dict[target_node], plan.plan_hash)
+            node = target_node
+
+    return NativePlanGraph(
+        graph=g,
+        node_plan_hashes_dict=node_plan_hashes_dict,
+        edge_plan_hash_dict=edge_plan_hash_dict,
+    )
+
+
+def get_dot_str(g: MultiDiGraph) -> str:
+    """
+    returns a plan graph in the DOT format written by forbiditerative
+    """
+    lines = ["digraph {"]
+    for node, attributes in g.nodes(data=True):
+        attributes_str = ", ".join(
+            f"{key}={value}" for key, value in attributes.items()
+        )
+        lines.append(f"{node} [ {attributes_str} ]")
+    for source, target, key, attributes in g.edges(keys=True, data=True):
+        label = attributes["label"]
+        if key == 0:
+            label = f'"{label} "'
+        lines.append(f"{source}  ->  {target} [ label={label} ]")
+    lines.append("}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,303 @@
+import functools
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from networkx import Graph
+
+from server.helpers.common_helper.cache_helper import CacheStats, LRUCache
+from server.helpers.common_helper.config_helper import get_env_int
+from server.helpers.common_helper.hash_helper import get_plan_set_fingerprint
+from server.helpers.common_helper.metrics_helper import observe_stage
+from server.helpers.graph_helper.compact_graph_helper import (
+    CompactGraph,
+    get_compact_graph,
+    get_compact_graph_size,
+    set_compact_graph,
+)
+from server.helpers.graph_helper.distance_index_helper import (
+    DistanceIndex,
+    get_distance_index,
+    get_distance_index_size,
+)
+from server.helpers.graph_helper.graph_helper import (
+    convert_dot_str_to_networkx_graph,
+    get_depth_action_plan_hashes_dict,
+    get_graph_with_number_of_plans_label,
+    get_node_edge_name_plan_hash_list,
+)
+from server.helpers.graph_helper.native_plan_graph_helper import get_dot_str
+from server.helpers.graph_helper.reachability_index_helper import (
+    LazyReachabilityIndex,
+    get_reachability_index_size,
+)
+from server.helpers.graph_helper.plan_graph_projection_helper import (
+    PlanEdge,
+    get_plan_edges_dict,
+    get_projected_plan_graph,
+)
+from server.helpers.planner_helper.planner_helper import (
+    PLAN_GRAPH_BACKEND,
+    get_dot_graph_str,
+    get_native_plan_graph,
+)
+from server.helpers.planner_helper.plan_set_helper import (
+    PlanSet,
+    get_plan_set_size,
+)
+from server.helpers.planner_helper.plan_store_helper import (
+    PLAN_HASH_SIZE,
+    PlanStore,
+    get_plan_store,
+    get_hashed_plans,
+    get_plan_hash,
+    get_plan_store_size,
+)
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanGraphBackend,
+    PlanningTask,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+PLAN_GRAPH_CACHE_MAX_NUM = get_env_int("LEMMING_PLAN_GRAPH_CACHE_MAX_NUM", 256)
+PLAN_GRAPH_CACHE_MEMORY_BUDGET = get_env_int(
+    "LEMMING_PLAN_GRAPH_CACHE_MEMORY_BUDGET", 128 * 1024 * 1024
+)
+PLAN_EDGE_SIZE = 64
+
+
+class PlanGraph(NamedTuple):
+    """
+    a plan graph and its annotations, which are shared by every request for
+    the same set of plans and must not be modified
+    """
+
+    dot_str: str
+    graph: Graph
+    node_plan_hashes_dict: Dict[str, List[str]]
+    edge_plan_hash_dict: Dict[Tuple[Any, Any], List[str]]
+    edge_label_nodes_dict: Dict[str, List[str]]
+    node_dist_from_initial_state: Mapping[str, int]
+    node_dist_from_end_state: Mapping[str, int]
+    # the edges each plan traverses by plan hash, unless the plans cannot be
+    # followed in the graph
+    plan_edges_dict: Optional[Dict[str, List[PlanEdge]]]
+    # the graph with integer node ids the graph passes run on
+    compact_graph: CompactGraph
+    # the distances above
+    distance_index: DistanceIndex
+    # the nodes reachable from each node unless the graph has a cycle, built
+    # on first use
+    reachability_index: LazyReachabilityIndex
+    # the plans of the graph, which selections of its plans are looked up in
+    plan_store: PlanStore
+    # the plans of the graph and the plans of the annotations above as plan
+    # sets of the plan index of the plan store
+    plan_set: PlanSet
+    node_plan_sets: Dict[str, PlanSet]
+    edge_plan_sets: Dict[Tuple[Any, Any], PlanSet]
+
+
+def get_plan_graph_size(plan_graph: PlanGraph) -> int:
+    """
+    returns an estimate of the number of bytes held by a plan graph, where the
+    networkx graph is assumed to be about as large as its DOT text
+    """
+    num_plan_hashes = sum(
+        len(plan_hashes)
+        for plan_hashes in plan_graph.node_plan_hashes_dict.values()
+    ) + sum(
+        len(plan_hashes)
+        for plan_hashes in plan_graph.edge_plan_hash_dict.values()
+    )
+    num_plan_edges = (
+        0
+        if plan_graph.plan_edges_dict is None
+        else sum(
+            len(plan_edges)
+            for plan_edges in plan_graph.plan_edges_dict.values()
+        )
+    )
+    return (
+        2 * len(plan_graph.dot_str)
+        + num_plan_hashes * PLAN_HASH_SIZE
+        + num_plan_edges * PLAN_EDGE_SIZE
+        + get_compact_graph_size(plan_graph.compact_graph)
+        + get_distance_index_size(plan_graph.distance_index)
+        + get_reachability_index_size(
+            plan_graph.reachability_index.get_if_built()
+        )
+        + get_plan_store_size(plan_graph.plan_store)
+        + sum(
+            get_plan_set_size(plan_set)
+            for plan_set in plan_graph.node_plan_sets.values()
+        )
+        + sum(
+            get_plan_set_size(plan_set)
+            for plan_set in plan_graph.edge_plan_sets.values()
+        )
+    )
+
+
+plan_graph_cache: LRUCache[str, PlanGraph] = LRUCache(
+    name="plan_graph",
+    max_entries=PLAN_GRAPH_CACHE_MAX_NUM,
+    max_size=PLAN_GRAPH_CACHE_MEMORY_BUDGET,
+    get_size=get_plan_graph_size,
+)
+
+
+def get_dot_str_and_graph(
+    domain: str, problem: str, plans: List[Plan]
+) -> Tuple[str, Graph]:
+    """
+    returns the plan graph of a set of plans and its DOT string, from the
+    native backend when it is selected and supports the task
+    """
+    planning_task = PlanningTask(domain=domain, problem=problem)
+    # the plans are passed through as they are, with their plan hashes set
+    planning_results = PlanningResult.model_construct(
+        plans=get_hashed_plans(plans)
+    )
+    if PLAN_GRAPH_BACKEND == PlanGraphBackend.NATIVE.value:
+        native_plan_graph = get_native_plan_graph(
+            planning_task, planning_results
+        )
+        if native_plan_graph is not None:
+            return get_dot_str(native_plan_graph.graph), native_plan_graph.graph
+
+    dot_str = get_dot_graph_str(
+        planning_task=planning_task,
+        planning_results=planning_results,
+        backend=PlanGraphBackend.FORBIDITERATIVE.value,
+    )
+    with observe_stage("parse_dot", dot_size=len(dot_str)) as span:
+        g = convert_dot_str_to_networkx_graph(dot_str)
+        span.set_attributes(
+            num_nodes=g.number_of_nodes(), num_edges=g.number_of_edges()
+        )
+    return dot_str, g
+
+
+def get_annotated_plan_graph(
+    dot_str: str, g: Graph, plans: List[Plan]
+) -> PlanGraph:
+    plans = get_hashed_plans(plans)
+    with observe_stage("compact_graph"):
+        cg = get_compact_graph(g)
+    with observe_stage("node_distances"):
+        distance_index = get_distance_index(cg)
+    with observe_stage(
+        "plan_hash_annotations",
+        num_plans=len(plans),
+        num_nodes=g.number_of_nodes(),
+        num_edges=g.number_of_edges(),
+    ):
+        # an edge at a depth is annotated with the plans taking its action at
+        # that depth, as before; the edges each plan traverses are only kept
+        # to project the plan graph onto subsets of the plans
+        (
+            node_plan_hashes_dict,
+            edge_plan_hash_dict,
+            edge_label_nodes_dict,
+        ) = get_node_edge_name_plan_hash_list(
+            cg, plans, True, get_depth_action_plan_hashes_dict(plans)
+        )
+        plan_edges_dict = get_plan_edges_dict(g, plans)
+        plan_store = get_plan_store(plans)
+        node_plan_sets = {
+            node: plan_store.get_plan_set(plan_hashes)
+            for node, plan_hashes in node_plan_hashes_dict.items()
+        }
+        edge_plan_sets = {
+            edge: plan_store.get_plan_set(plan_hashes)
+            for edge, plan_hashes in edge_plan_hash_dict.items()
+        }
+        g = get_graph_with_number_of_plans_label(g, node_plan_hashes_dict)
+        # graph passes on the annotated graph run on the same compact graph
+        set_compact_graph(g, cg)
+    return PlanGraph(
+        dot_str=dot_str,
+        graph=g,
+        node_plan_hashes_dict=node_plan_hashes_dict,
+        edge_plan_hash_dict=edge_plan_hash_dict,
+        edge_label_nodes_dict=edge_label_nodes_dict,
+        node_dist_from_initial_state=distance_index.dist_from_initial_state,
+        node_dist_from_end_state=distance_index.dist_to_end_state,
+        plan_edges_dict=plan_edges_dict,
+        compact_graph=cg,
+        distance_index=distance_index,
+        reachability_index=LazyReachabilityIndex(cg),
+        plan_store=plan_store,
+        plan_set=plan_store.get_all_plans(),
+        node_plan_sets=node_plan_sets,
+        edge_plan_sets=edge_plan_sets,
+    )
+
+
+def build_plan_graph(domain: str, problem: str, plans: List[Plan]) -> PlanGraph:
+    dot_str, g = get_dot_str_and_graph(domain, problem, plans)
+    return get_annotated_plan_graph(dot_str, g, plans)
+
+
+def project_plan_graph(
+    plan_graph: PlanGraph, plans: List[Plan]
+) -> Optional[PlanGraph]:
+    """
+    returns the annotated plan graph of a subset of the plans of a plan graph,
+    projected onto the edges the subset traverses, or None when the plan graph
+    cannot be projected
+    """
+    if plan_graph.plan_edges_dict is None:
+        return None
+    with observe_stage("project_plan_graph", num_plans=len(plans)) as span:
+        g = get_projected_plan_graph(
+            plan_graph.graph, plan_graph.plan_edges_dict, plans
+        )
+        if g is None:
+            return None
+        span.set_attributes(
+            num_nodes=g.number_of_nodes(), num_edges=g.number_of_edges()
+        )
+        dot_str = get_dot_str(g)
+    return get_annotated_plan_graph(dot_str, g, plans)
+
+
+def get_plan_graph(
+    domain: str,
+    problem: str,
+    plans: List[Plan],
+    all_plans: Optional[List[Plan]] = None,
+    all_plans_graph: Optional[PlanGraph] = None,
+) -> PlanGraph:
+    """
+    returns the annotated plan graph of a set of plans, built only once for the
+    same domain, problem and plans; the plan graph of a subset of all plans is
+    projected from the plan graph of all plans, which is either given or built
+    """
+    plan_hashes = [get_plan_hash(plan) for plan in plans]
+    fingerprint = get_plan_set_fingerprint(domain, problem, plan_hashes)
+    plan_graph = plan_graph_cache.get(fingerprint)
+    if plan_graph is None:
+        # the cached plan graph keeps copies of the plans, so that requests
+        # neither change its plans nor get changed through them
+        plans = [
+            plan.model_copy(deep=True, update=dict(plan_hash=plan_hash))
+            for plan, plan_hash in zip(plans, plan_hashes)
+        ]
+        if all_plans_graph is None and all_plans is not None:
+            if len(all_plans) > len(plans):
+                all_plans_graph = get_plan_graph(domain, problem, all_plans)
+        if all_plans_graph is not None:
+            if len(all_plans_graph.plan_store.plans) > len(plans):
+                plan_graph = project_plan_graph(all_plans_graph, plans)
+        if plan_graph is None:
+            plan_graph = build_plan_graph(domain, problem, plans)
+        # the reachability index is charged to the cache once it is built
+        plan_graph.reachability_index.on_build = functools.partial(
+            plan_graph_cache.resize, fingerprint
+        )
+        plan_graph_cache.put(fingerprint, plan_graph)
+    return plan_graph
+
+
+def get_plan_graph_cache_stats() -> CacheStats:
+    return plan_graph_cache.get_stats()
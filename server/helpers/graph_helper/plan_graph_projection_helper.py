@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional, Tuple
+
+from networkx import Graph, MultiDiGraph
+
+from server.helpers.graph_helper.dot_parser_helper import (
+    get_normalized_edge_label,
+)
+from server.helpers.planner_helper.sas_task_helper import (
+    get_normalized_operator_name,
+)
+from server.planners.drivers.planner_driver_datatype import Plan
+
+# states are numbered in the order they are reached, by forbiditerative and
+# the native backend alike, so the first node is the initial state
+INITIAL_STATE_NODE = "node0"
+
+PlanEdge = Tuple[str, str, int]
+
+
+def get_normalized_label(label: str, key: int) -> str:
+    # only the labels of the first of parallel edges are normalized
+    return label if key == 0 else get_normalized_edge_label(label)
+
+
+def get_plan_edges_dict(
+    g: Graph, plans: List[Plan]
+) -> Optional[Dict[str, List[PlanEdge]]]:
+    """
+    returns the edges each plan traverses in a plan graph by plan hash, or None
+    when a plan cannot be followed from the initial state
+    """
+    if INITIAL_STATE_NODE not in g:
+        return None
+    out_edges_by_label: Dict[str, Dict[str, List[PlanEdge]]] = dict()
+    for source, target, key, label in g.edges(keys=True, data="label"):
+        if label is None:
+            return None
+        out_edges_by_label.setdefault(source, dict()).setdefault(
+            get_normalized_operator_name(get_normalized_label(label, key)),
+            list(),
+        ).append((source, target, key))
+
+    plan_edges_dict: Dict[str, List[PlanEdge]] = dict()
+    for plan in plans:
+        if plan.plan_hash is None:
+            return None
+        node = INITIAL_STATE_NODE
+        plan_edges: List[PlanEdge] = list()
+        for action in plan.actions:
+            edges = out_edges_by_label.get(node, dict()).get(
+                get_normalized_operator_name(action), list()
+            )
+            if len(edges) != 1:
+                return None
+            plan_edges.append(edges[0])
+            node = edges[0][1]
+        plan_edges_dict[plan.plan_hash] = plan_edges
+    return plan_edges_dict
+
+
+def get_projected_plan_graph(
+    g: Graph, plan_edges_dict: Dict[str, List[PlanEdge]], plans: List[Plan]
+) -> Optional[MultiDiGraph]:
+    """
+    returns the subgraph of a plan graph traversed by a subset of its plans,
+    with nodes renumbered in the order the plans reach them as in the plan
+    graph of the subset; returns None when a plan is not in the plan graph
+    """
+    if INITIAL_STATE_NODE not in g:
+        return None
+    projected_graph = MultiDiGraph(**g.graph)
+    node_names: Dict[str, str] = dict()
+    projected_edges: Dict[PlanEdge, PlanEdge] = dict()
+
+    def get_node_name(node: str) -> str:
+        node_name = node_names.get(node)
+        if node_name is None:
+            node_name = f"node{len(node_names)}"
+            node_names[node] = node_name
+            attributes = dict(g.nodes[node])
+            if "label" in attributes:
+                attributes["label"] = attributes["label"].replace(
+                    f'"{node}\\n', f'"{node_name}\\n', 1
+                )
+            projected_graph.add_node(node_name, **attributes)
+        return node_name
+
+    for plan in plans:
+        if plan.plan_hash not in plan_edges_dict:
+            return None
+        plan_edges = plan_edges_dict[plan.plan_hash]
+        get_node_name(INITIAL_STATE_NODE)
+        for edge in plan_edges:
+            if edge in projected_edges:
+                continue
+            source, target, key = edge
+            label = g.edges[edge]["label"]
+            projected_source = get_node_name(source)
+            projected_target = get_node_name(target)
+            projected_key = projected_graph.add_edge(
+                projected_source, projected_target
+            )
+            if projected_key == 0:
+                label = get_normalized_label(label, key)
+            elif key == 0:
+                label = f'"{label}"'
+            projected_graph.edges[
+                projected_source, projected_target, projected_key
+            ]["label"] = label
+            projected_edges[edge] = (
+                projected_source,
+                projected_target,
+                projected_key,
+            )
+    return projected_graph
@@ -0,0 +1,170 @@
+import threading
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Set
+
+from server.helpers.common_helper.metrics_helper import observe_stage
+from server.helpers.graph_helper.compact_graph_helper import CompactGraph
+from server.helpers.graph_helper.distance_index_helper import get_root_node_ids
+
+
+class ReachabilityIndex(NamedTuple):
+    """
+    the nodes reachable from each node of an acyclic graph going forward and
+    backward as bitsets, where bit i stands for the node with id i
+    """
+
+    descendants: List[int]
+    ancestors: List[int]
+
+    def get_closures(self, is_forward: bool) -> List[int]:
+        return self.descendants if is_forward else self.ancestors
+
+
+def get_topological_order(cg: CompactGraph) -> Optional[List[int]]:
+    """
+    returns the node ids of a graph in topological order, or None when the
+    graph has a cycle
+    """
+    in_degrees = [
+        cg.in_offsets[node_id + 1] - cg.in_offsets[node_id]
+        for node_id in range(cg.number_of_nodes())
+    ]
+    order = get_root_node_ids(cg, True)
+    # the order grows while it is traversed
+    for node_id in order:
+        for target_node_id in cg.out_targets[
+            cg.out_offsets[node_id] : cg.out_offsets[node_id + 1]
+        ]:
+            in_degrees[target_node_id] -= 1
+            if in_degrees[target_node_id] == 0:
+                order.append(target_node_id)
+    return order if len(order) == cg.number_of_nodes() else None
+
+
+def get_reachability_index(cg: CompactGraph) -> Optional[ReachabilityIndex]:
+    """
+    returns the transitive closures of an acyclic graph, computed in one pass
+    over its nodes in topological order for each direction, or None when the
+    graph has a cycle
+    """
+    order = get_topological_order(cg)
+    if order is None:
+        return None
+
+    def get_closures(node_ids: List[int], is_forward: bool) -> List[int]:
+        offsets, adjacent_node_ids, _ = cg.get_adjacency(is_forward)
+        closures = [0] * cg.number_of_nodes()
+        for node_id in node_ids:
+            closure = 0
+            for adjacent_node_id in adjacent_node_ids[
+                offsets[node_id] : offsets[node_id + 1]
+            ]:
+                closure |= closures[adjacent_node_id] | (1 << adjacent_node_id)
+            closures[node_id] = closure
+        return closures
+
+    return ReachabilityIndex(
+        descendants=get_closures(list(reversed(order)), True),
+        ancestors=get_closures(order, False),
+    )
+
+
+class LazyReachabilityIndex:
+    """
+    the reachability index of a graph, built on its first use, as its size is
+    quadratic in the number of nodes and only build views search with it;
+    on_build is called once it is built
+    """
+
+    def __init__(
+        self, cg: CompactGraph, on_build: Optional[Callable[[], None]] = None
+    ) -> None:
+        self.cg = cg
+        self.on_build = on_build
+        self._reachability_index: Optional[ReachabilityIndex] = None
+        self._is_built = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self._is_built
+
+    def get_if_built(self) -> Optional[ReachabilityIndex]:
+        return self._reachability_index
+
+    def get(self) -> Optional[ReachabilityIndex]:
+        """
+        returns the reachability index, or None when the graph has a cycle
+        """
+        with self._lock:
+            is_built = self._is_built
+            if not is_built:
+                with observe_stage("reachability_index") as span:
+                    self._reachability_index = get_reachability_index(self.cg)
+                    span.set_attribute(
+                        "is_acyclic", self._reachability_index is not None
+                    )
+                self._is_built = True
+        if not is_built and self.on_build is not None:
+            self.on_build()
+        return self._reachability_index
+
+
+def get_bitset(cg: CompactGraph, nodes: Iterable[Any]) -> int:
+    bitset = 0
+    for node in nodes:
+        node_id = cg.node_ids.get(node)
+        if node_id is not None:
+            bitset |= 1 << node_id
+    return bitset
+
+
+def get_nodes_of_bitset(cg: CompactGraph, bitset: int) -> Set[Any]:
+    nodes: Set[Any] = set()
+    while bitset:
+        lowest_bit = bitset & -bitset
+        nodes.add(cg.node_names[lowest_bit.bit_length() - 1])
+        bitset ^= lowest_bit
+    return nodes
+
+
+def get_reachable_nodes(
+    cg: CompactGraph,
+    reachability_index: ReachabilityIndex,
+    nodes_to_start: Iterable[Any],
+    nodes_to_exclude: Iterable[Any],
+    is_forward: bool,
+) -> Optional[Set[Any]]:
+    """
+    returns the nodes reachable from nodes to start without passing through
+    nodes to exclude, or None when a node to exclude is reachable and the
+    nodes must be searched
+    """
+    closures = reachability_index.get_closures(is_forward)
+    start_bitset = get_bitset(cg, nodes_to_start)
+    closure = 0
+    bitset = start_bitset
+    while bitset:
+        lowest_bit = bitset & -bitset
+        closure |= closures[lowest_bit.bit_length() - 1]
+        bitset ^= lowest_bit
+    # the nodes to start are excluded as well, but reaching one of them only
+    # reaches nodes reachable from it
+    if closure & get_bitset(cg, nodes_to_exclude) & ~start_bitset:
+        return None
+    return get_nodes_of_bitset(cg, closure & ~start_bitset)
+
+
+def get_reachability_index_size(
+    reachability_index: Optional[ReachabilityIndex],
+) -> int:
+    """
+    returns an estimate of the number of bytes held by a reachability index
+    """
+    if reachability_index is None:
+        return 0
+    return sum(
+        # an int object of the number of bits of a bitset
+        28 + closure.bit_length() // 8
+        for closures in reachability_index
+        for closure in closures
+    )
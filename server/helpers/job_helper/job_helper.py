@@ -0,0 +1,343 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import List, Optional
+
+from server.helpers.common_helper.cache_helper import CacheStats, LRUCache
+from server.helpers.common_helper.config_helper import (
+    get_env_float,
+    get_env_int,
+)
+from server.helpers.common_helper.executor_helper import (
+    PlannerExecutor,
+    planner_executor,
+)
+from server.helpers.job_helper.job_helper_data_types import (
+    PlanningJobInfo,
+    PlanningJobPlanner,
+    PlanningJobStatus,
+)
+from server.helpers.planner_helper.planner_helper import compute_plan_topk
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanningTask,
+)
+from server.helpers.planner_helper.planning_result_cache_helper import (
+    planning_result_cache,
+)
+from server.planners.drivers.planner_driver_datatype import (
+    Plan,
+    PlanningResult,
+)
+from server.planners.symk import DEFAULT_BIN_SYMK_PATH, SymKPlanner
+
+PLANNING_JOB_MAX_NUM = get_env_int("LEMMING_PLANNING_JOB_MAX_NUM", 256)
+PLANNING_JOB_TTL = get_env_float("LEMMING_PLANNING_JOB_TTL", 3600.0)
+# time limit of jobs whose planning task does not set one
+PLANNING_JOB_TIMEOUT = get_env_float("LEMMING_PLANNING_JOB_TIMEOUT", 3600.0)
+# running jobs that are not polled for this long are cancelled
+PLANNING_JOB_ABANDON_TIMEOUT = get_env_float(
+    "LEMMING_PLANNING_JOB_ABANDON_TIMEOUT", 300.0
+)
+# the planner stops itself at the time limit of a planning task and returns
+# the plans found so far; the job process is only killed after this grace
+PLANNING_JOB_TIMEOUT_GRACE = 5.0
+POLL_INTERVAL = 0.1
+
+FINISHED_STATUSES = {
+    PlanningJobStatus.SUCCEEDED,
+    PlanningJobStatus.FAILED,
+    PlanningJobStatus.CANCELLED,
+    PlanningJobStatus.TIMED_OUT,
+}
+
+
+def run_planning_job_process(
+    planning_task_json: str,
+    planner_name: str,
+    symk_bin_path: str,
+    connection: Connection,
+) -> None:
+    """
+    runs in a job process; the process leads its own process group, so the
+    planner subprocesses are killed along with it; SymK sends each plan as
+    soon as it is found, before the planning result
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    try:
+        planning_task = PlanningTask.model_validate_json(planning_task_json)
+        if planner_name == PlanningJobPlanner.SYMK.value:
+            plans: List[Plan] = list()
+            for plan in SymKPlanner(Path(symk_bin_path)).stream_plans(
+                planning_task
+            ):
+                connection.send(("plan", plan.model_dump_json()))
+                plans.append(plan)
+            planning_result = PlanningResult(
+                plans=plans, planner_name=planner_name
+            )
+        else:
+            planning_result = compute_plan_topk(planning_task)
+        connection.send(("result", planning_result.model_dump_json()))
+    except Exception as e:
+        connection.send(("error", str(e)))
+    finally:
+        connection.close()
+
+
+def kill_job_process(process: BaseProcess) -> None:
+    if process.pid is not None and hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass  # the process group is gone or not created yet
+    if process.is_alive():
+        process.kill()
+    process.join()
+
+
+class PlanningJob:
+    def __init__(
+        self,
+        job_id: str,
+        planning_task: PlanningTask,
+        planner: PlanningJobPlanner = PlanningJobPlanner.TOPK,
+    ) -> None:
+        self.job_id = job_id
+        self.planning_task = planning_task
+        self.planner = planner
+        self.status = PlanningJobStatus.PENDING
+        self.planning_result: Optional[PlanningResult] = None
+        # the plans found so far, until the planning result is known
+        self.plans: List[Plan] = list()
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.last_polled_at = time.monotonic()
+        # the run of the job on the planner executor
+        self.future: Optional["Future[Optional[PlanningResult]]"] = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def is_cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def is_abandoned(self, abandon_timeout: Optional[float]) -> bool:
+        if abandon_timeout is None:
+            return False
+        return time.monotonic() - self.last_polled_at > abandon_timeout
+
+    def request_cancel(self) -> None:
+        self._cancel_event.set()
+
+    def add_plan(self, plan: Plan) -> None:
+        with self._lock:
+            self.plans.append(plan)
+
+    def start(self) -> bool:
+        with self._lock:
+            if self.is_finished():
+                return False
+            self.status = PlanningJobStatus.RUNNING
+            self.started_at = time.time()
+            return True
+
+    def finish(
+        self,
+        status: PlanningJobStatus,
+        planning_result: Optional[PlanningResult] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            if self.is_finished():
+                return
+            self.status = status
+            self.planning_result = planning_result
+            self.error = error
+            self.finished_at = time.time()
+
+    def get_job_info(self) -> PlanningJobInfo:
+        with self._lock:
+            planning_result = self.planning_result
+            if planning_result is None and len(self.plans) > 0:
+                # a running job, or one stopped before it finished, shows the
+                # plans found so far
+                planning_result = PlanningResult(
+                    plans=list(self.plans), planner_name=self.planner.value
+                )
+            return PlanningJobInfo(
+                job_id=self.job_id,
+                planner=self.planner,
+                status=self.status,
+                created_at=self.created_at,
+                started_at=self.started_at,
+                finished_at=self.finished_at,
+                planning_result=planning_result,
+                error=self.error,
+            )
+
+
+class PlanningJobManager:
+    """
+    runs planning tasks in the background, each in its own process, on the
+    slots of the planner executor shared with the planner calls of requests,
+    so that a job waits for a slot and is rejected with 503 when none is left;
+    a job is killed when it is cancelled, exceeds its time limit or is no
+    longer polled; a SymK job shows the plans found so far while it runs,
+    while a top-k job returns the plans of forbiditerative only once it
+    finishes, as forbiditerative reports them only when it exits
+    """
+
+    def __init__(
+        self,
+        executor: PlannerExecutor = planner_executor,
+        max_jobs: int = PLANNING_JOB_MAX_NUM,
+        ttl: Optional[float] = PLANNING_JOB_TTL,
+        timeout: float = PLANNING_JOB_TIMEOUT,
+        abandon_timeout: Optional[float] = PLANNING_JOB_ABANDON_TIMEOUT,
+        symk_bin_path: Path = DEFAULT_BIN_SYMK_PATH,
+    ) -> None:
+        self._jobs: LRUCache[str, PlanningJob] = LRUCache(
+            name="planning_job", max_entries=max_jobs, ttl=ttl
+        )
+        self._executor = executor
+        self.timeout = timeout
+        self.abandon_timeout = abandon_timeout
+        self.symk_bin_path = symk_bin_path
+
+    def submit_job(
+        self,
+        planning_task: PlanningTask,
+        planner: PlanningJobPlanner = PlanningJobPlanner.TOPK,
+    ) -> PlanningJob:
+        job = PlanningJob(str(uuid.uuid4()), planning_task, planner)
+        planning_result = planning_result_cache.get_planning_result(
+            planner.value, planning_task
+        )
+        if planning_result is not None:
+            job.start()
+            job.finish(PlanningJobStatus.SUCCEEDED, planning_result)
+        else:
+            # raises 503 when the planner executor has no slot left
+            job.future = self._executor.submit(self._run_job, job)
+        self._jobs.put(job.job_id, job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[PlanningJob]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.last_polled_at = time.monotonic()
+        return job
+
+    def cancel_job(self, job_id: str) -> Optional[PlanningJob]:
+        job = self.get_job(job_id)
+        if job is not None:
+            job.request_cancel()
+            # a pending job is cancelled right away and gives up its slot
+            if job.status == PlanningJobStatus.PENDING:
+                job.finish(PlanningJobStatus.CANCELLED)
+                if job.future is not None:
+                    job.future.cancel()
+        return job
+
+    def get_stats(self) -> CacheStats:
+        return self._jobs.get_stats()
+
+    def _get_stop_status(
+        self, job: PlanningJob, deadline: Optional[float] = None
+    ) -> Optional[PlanningJobStatus]:
+        """
+        returns the status of a job that has to be stopped, or None
+        """
+        if job.is_cancel_requested() or job.is_abandoned(self.abandon_timeout):
+            return PlanningJobStatus.CANCELLED
+        if deadline is not None and time.monotonic() > deadline:
+            return PlanningJobStatus.TIMED_OUT
+        return None
+
+    def _run_job(self, job: PlanningJob) -> Optional[PlanningResult]:
+        """
+        returns the planning result of a job once it finishes
+        """
+        # a job may be cancelled or abandoned while it waits for a slot
+        stop_status = self._get_stop_status(job)
+        if stop_status is not None:
+            job.finish(stop_status)
+            return None
+        try:
+            if job.start():
+                self._run_job_process(job)
+        except Exception as e:
+            job.finish(PlanningJobStatus.FAILED, error=str(e))
+        return job.planning_result
+
+    def _run_job_process(self, job: PlanningJob) -> None:
+        timeout = job.planning_task.timeout
+        deadline = time.monotonic() + (
+            self.timeout
+            if timeout is None
+            else timeout + PLANNING_JOB_TIMEOUT_GRACE
+        )
+        # forking a multi-threaded server is unsafe
+        context = multiprocessing.get_context("spawn")
+        parent_connection, child_connection = context.Pipe(duplex=False)
+        process = context.Process(
+            target=run_planning_job_process,
+            args=(
+                job.planning_task.model_dump_json(),
+                job.planner.value,
+                str(self.symk_bin_path),
+                child_connection,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        message = None
+        try:
+            while True:
+                if parent_connection.poll(POLL_INTERVAL):
+                    message = parent_connection.recv()
+                    if message[0] != "plan":
+                        break
+                    job.add_plan(Plan.model_validate_json(message[1]))
+                    message = None
+                elif not process.is_alive():
+                    break
+                stop_status = self._get_stop_status(job, deadline)
+                if stop_status is not None:
+                    job.finish(stop_status)
+                    return
+        except EOFError:
+            pass  # the process exited without a result
+        finally:
+            kill_job_process(process)
+            parent_connection.close()
+
+        if message is None:
+            job.finish(
+                PlanningJobStatus.FAILED,
+                error=f"planning job process exited with {process.exitcode}",
+            )
+        elif message[0] == "error":
+            job.finish(PlanningJobStatus.FAILED, error=message[1])
+        else:
+            planning_result = PlanningResult.model_validate_json(message[1])
+            planning_result_cache.add_planning_result(
+                job.planner.value, job.planning_task, planning_result
+            )
+            job.finish(PlanningJobStatus.SUCCEEDED, planning_result)
+
+
+planning_job_manager = PlanningJobManager()
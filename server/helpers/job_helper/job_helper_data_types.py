@@ -0,0 +1,33 @@
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel
+
+from server.planners.drivers.planner_driver_datatype import PlanningResult
+
+
+class PlanningJobPlanner(Enum):
+    # forbiditerative reports the plans of a job only once it finishes
+    TOPK = "topk"
+    # SymK reports each plan of a job as soon as it is found
+    SYMK = "symk"
+
+
+class PlanningJobStatus(Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+    TIMED_OUT = "TIMED_OUT"
+
+
+class PlanningJobInfo(BaseModel):
+    job_id: str
+    planner: PlanningJobPlanner = PlanningJobPlanner.TOPK
+    status: PlanningJobStatus = PlanningJobStatus.PENDING
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # the plans found so far while the job is running
+    planning_result: Optional[PlanningResult] = None
+    error: Optional[str] = None
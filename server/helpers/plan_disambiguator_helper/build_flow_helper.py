@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from networkx import Graph
 from server.helpers.common_helper.exception_handler import (
@@ -12,6 +12,7 @@ from server.helpers.planner_helper.planner_helper_data_types import (
     ChoiceInfo,
 )
 from server.helpers.plan_disambiguator_helper.plan_disambiguator_helper import (
+    FilteredPlanDisambiguatorOutput,
     get_choice_info_multiple_edges_without_landmark,
     get_plan_disambiguator_output_filtered_by_selection_infos,
     sort_choice_info_by_distance_to_terminal_nodes,
@@ -22,6 +23,7 @@ from server.helpers.graph_helper.graph_helper import (
     get_dict_from_graph,
     get_graph_upto_nodes,
 )
+from server.helpers.graph_helper.plan_graph_cache_helper import PlanGraph
 
 
 @planner_exception_handler  # type: ignore
@@ -32,21 +34,29 @@ def get_build_flow_output(
     problem: str,
     plans: List[Plan],
     is_forward: bool,
+    all_plans_graph: Optional[PlanGraph] = None,
 ) -> Tuple[PlanDisambiguatorOutput, Dict[Tuple[str, str], List[str]], Graph]:
-    (
-        selected_plans,
-        _,
-        g,
-        _,
-        node_plan_hashes_dict,
-        edge_plan_hash_dict,
-        _,
-        node_dist_from_initial_state,
-        node_dist_from_end_state,
-    ) = get_plan_disambiguator_output_filtered_by_selection_infos(
-        selection_infos, landmarks, domain, problem, plans
+    filtered_output = get_plan_disambiguator_output_filtered_by_selection_infos(
+        selection_infos, landmarks, domain, problem, plans, all_plans_graph
+    )
+    return get_build_flow_output_from_filtered_output(
+        filtered_output, get_dict_from_graph(filtered_output.g), is_forward
     )
-    networkx_graph = get_dict_from_graph(g)
+
+
+def get_build_flow_output_from_filtered_output(
+    filtered_output: FilteredPlanDisambiguatorOutput,
+    networkx_graph: Any,
+    is_forward: bool,
+) -> Tuple[PlanDisambiguatorOutput, Dict[Tuple[str, str], List[str]], Graph]:
+    """
+    returns the build view of plans already filtered by selection infos
+    """
+    selected_plans = filtered_output.selected_plans
+    plan_graph = filtered_output.plan_graph
+    g = plan_graph.graph
+    node_plan_hashes_dict = plan_graph.node_plan_hashes_dict
+    edge_plan_hash_dict = plan_graph.edge_plan_hash_dict
     if len(selected_plans) <= 1:  # no plans to disambiguate
         return (
             PlanDisambiguatorOutput(
@@ -66,7 +76,9 @@ def get_build_flow_output(
     (
         node_search_results,
         nodes_traversed,
-    ) = get_first_node_with_multiple_out_edges(g, is_forward)
+    ) = get_first_node_with_multiple_out_edges(
+        plan_graph.compact_graph, is_forward
+    )
 
     if len(node_search_results) == 0:  # no selection needed
         return (
@@ -95,10 +107,10 @@ def get_build_flow_output(
             get_choice_info_multiple_edges_without_landmark(
                 g=g,
                 node_with_multiple_edges=node_with_multiple_out_edges,
-                node_plan_hashes_dict=node_plan_hashes_dict,
-                edge_plan_hash_dict=edge_plan_hash_dict,
+                node_plan_sets=plan_graph.node_plan_sets,
+                edge_plan_sets=plan_graph.edge_plan_sets,
                 edges=out_edges_first_node_with_multiple_out_edges,
-                plans=selected_plans,
+                plan_set=plan_graph.plan_set,
             )
         )
         for edge in out_edges_first_node_with_multiple_out_edges:
@@ -111,24 +123,24 @@ def get_build_flow_output(
         )
     )
     networkx_graph = get_dict_from_graph(
-        get_graph_upto_nodes(g, nodes_to_end, nodes_traversed, is_forward)
+        get_graph_upto_nodes(
+            g,
+            nodes_to_end,
+            nodes_traversed,
+            is_forward,
+            plan_graph.compact_graph,
+            plan_graph.reachability_index.get(),
+        )
     )
 
     new_choice_infos = sort_choice_info_by_distance_to_terminal_nodes(
-        new_choice_infos,
-        (
-            node_dist_from_initial_state
-            if is_forward
-            else node_dist_from_end_state
-        ),
+        new_choice_infos, plan_graph.distance_index, is_forward
     )
 
     new_choice_infos = list(
         map(
             lambda choice_info: set_distance_to_terminal_nodes(
-                choice_info,
-                node_dist_from_initial_state,
-                node_dist_from_end_state,
+                choice_info, plan_graph.distance_index
             ),
             new_choice_infos,
         )
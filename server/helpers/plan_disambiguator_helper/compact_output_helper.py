@@ -0,0 +1,121 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from server.helpers.planner_helper.planner_helper_data_types import (
+    ChoiceInfo,
+    CompactChoiceInfo,
+    CompactPlanDisambiguatorOutput,
+    CompactPlanDisambiguatorViewsOutput,
+    PlanDisambiguatorOutput,
+    PlanDisambiguatorViewsOutput,
+)
+
+
+def get_plan_mask(
+    plan_hashes: Iterable[str], plan_idx_dict: Dict[str, int]
+) -> str:
+    """
+    returns a hex string whose i-th bit is set if the i-th plan is in
+    plan_hashes
+    """
+    mask = 0
+    for plan_hash in plan_hashes:
+        if plan_hash in plan_idx_dict:
+            mask |= 1 << plan_idx_dict[plan_hash]
+    return format(mask, "x")
+
+
+def get_plan_indices_from_plan_mask(plan_mask: str) -> List[int]:
+    mask = int(plan_mask, 16)
+    return [idx for idx in range(mask.bit_length()) if (mask >> idx) & 1]
+
+
+def get_compact_choice_info(
+    choice_info: ChoiceInfo, plan_idx_dict: Dict[str, int]
+) -> CompactChoiceInfo:
+    return CompactChoiceInfo(
+        landmark=choice_info.landmark,
+        max_num_plans=choice_info.max_num_plans,
+        action_name_plan_mask={
+            action_name: get_plan_mask(plan_hashes, plan_idx_dict)
+            for action_name, plan_hashes in choice_info.action_name_plan_hash_map.items()
+        },
+        nodes_with_multiple_out_edges=choice_info.nodes_with_multiple_out_edges,
+        is_available_for_choice=choice_info.is_available_for_choice,
+        distance_to_init=choice_info.distance_to_init,
+        distance_to_end=choice_info.distance_to_end,
+    )
+
+
+def get_compact_networkx_graph(
+    plan_disambiguator_output: PlanDisambiguatorOutput,
+    plan_idx_dict: Dict[str, int],
+) -> Dict[str, Any]:
+    """
+    returns networkx_graph with plan masks in place of the plan hashes of
+    nodes and the edge map, without modifying the output
+    """
+    networkx_graph = dict(plan_disambiguator_output.networkx_graph)
+    nodes = []
+    for node in networkx_graph.get("nodes", []):
+        compact_node = {k: v for k, v in node.items() if k != "plan_hashes"}
+        plan_hashes = node.get(
+            "plan_hashes",
+            plan_disambiguator_output.node_plan_hashes_dict.get(
+                node.get("id"), []
+            ),
+        )
+        compact_node["plan_mask"] = get_plan_mask(plan_hashes, plan_idx_dict)
+        nodes.append(compact_node)
+    links = []
+    for link in networkx_graph.get("links", []):
+        plan_hashes = plan_disambiguator_output.edge_plan_hashes_dict.get(
+            f"{link.get('source')}_{link.get('target')}", []
+        )
+        links.append(
+            {**link, "plan_mask": get_plan_mask(plan_hashes, plan_idx_dict)}
+        )
+    networkx_graph["nodes"] = nodes
+    networkx_graph["links"] = links
+    return networkx_graph
+
+
+def get_compact_plan_disambiguator_output(
+    plan_disambiguator_output: PlanDisambiguatorOutput,
+) -> CompactPlanDisambiguatorOutput:
+    """
+    returns an output that sends each plan once and refers to sets of plans
+    by plan masks
+    """
+    plan_idx_dict = {
+        plan.plan_hash: idx
+        for idx, plan in enumerate(plan_disambiguator_output.plans)
+        if plan.plan_hash is not None
+    }
+    return CompactPlanDisambiguatorOutput(
+        plans=plan_disambiguator_output.plans,
+        choice_infos=[
+            get_compact_choice_info(choice_info, plan_idx_dict)
+            for choice_info in plan_disambiguator_output.choice_infos
+        ],
+        networkx_graph=get_compact_networkx_graph(
+            plan_disambiguator_output, plan_idx_dict
+        ),
+        first_achiever_edge_dict=plan_disambiguator_output.first_achiever_edge_dict,
+    )
+
+
+def get_compact_plan_disambiguator_views_output(
+    views_output: PlanDisambiguatorViewsOutput,
+) -> CompactPlanDisambiguatorViewsOutput:
+    def get_compact_output(
+        plan_disambiguator_output: Optional[PlanDisambiguatorOutput],
+    ) -> Optional[CompactPlanDisambiguatorOutput]:
+        if plan_disambiguator_output is None:
+            return None
+        return get_compact_plan_disambiguator_output(plan_disambiguator_output)
+
+    return CompactPlanDisambiguatorViewsOutput(
+        select=get_compact_output(views_output.select),
+        build_forward=get_compact_output(views_output.build_forward),
+        build_backward=get_compact_output(views_output.build_backward),
+    )
@@ -0,0 +1,64 @@
+from typing import List, Optional
+
+from server.helpers.common_helper.exception_handler import (
+    planner_exception_handler,
+)
+from server.helpers.graph_helper.graph_helper import get_dict_from_graph
+from server.helpers.graph_helper.plan_graph_cache_helper import PlanGraph
+from server.helpers.plan_disambiguator_helper.build_flow_helper import (
+    get_build_flow_output_from_filtered_output,
+)
+from server.helpers.plan_disambiguator_helper.plan_disambiguator_helper import (
+    get_plan_disambiguator_output_filtered_by_selection_infos,
+    get_selection_priority,
+)
+from server.helpers.plan_disambiguator_helper.selection_flow_helper import (
+    get_selection_flow_output_from_filtered_output,
+)
+from server.helpers.planner_helper.planner_helper_data_types import (
+    Landmark,
+    Plan,
+    PlanDisambiguationView,
+    PlanDisambiguatorViewsOutput,
+    SelectionInfo,
+)
+
+
+@planner_exception_handler  # type: ignore
+def get_plan_disambiguator_views_output(
+    selection_infos: List[SelectionInfo],
+    landmarks: List[Landmark],
+    domain: str,
+    problem: str,
+    plans: List[Plan],
+    selection_priority: Optional[str],
+    plan_disambiguator_views: List[PlanDisambiguationView],
+    all_plans_graph: Optional[PlanGraph] = None,
+) -> PlanDisambiguatorViewsOutput:
+    """
+    returns plan disambiguation views derived from plans filtered by selection
+    infos and their plan graph, which are computed only once
+    """
+    filtered_output = get_plan_disambiguator_output_filtered_by_selection_infos(
+        selection_infos, landmarks, domain, problem, plans, all_plans_graph
+    )
+    networkx_graph = get_dict_from_graph(filtered_output.g)
+    views_output = PlanDisambiguatorViewsOutput()
+    if PlanDisambiguationView.SELECT in plan_disambiguator_views:
+        views_output.select = get_selection_flow_output_from_filtered_output(
+            filtered_output,
+            networkx_graph,
+            landmarks,
+            get_selection_priority(selection_priority),
+        )[0]
+    if PlanDisambiguationView.BUILD_FORWARD in plan_disambiguator_views:
+        views_output.build_forward = get_build_flow_output_from_filtered_output(
+            filtered_output, networkx_graph, True
+        )[0]
+    if PlanDisambiguationView.BUILD_BACKWARD in plan_disambiguator_views:
+        views_output.build_backward = (
+            get_build_flow_output_from_filtered_output(
+                filtered_output, networkx_graph, False
+            )[0]
+        )
+    return views_output
@@ -2,44 +2,95 @@ from collections import defaultdict
 import random
 import sys
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from networkx import Graph
 
-from server.planners.drivers.planner_driver_datatype import PlanningResult
+from server.helpers.planner_helper.plan_set_helper import (
+    ActionIndex,
+    PlanSet,
+    get_action_index,
+)
+from server.helpers.planner_helper.plan_store_helper import (
+    PlanStore,
+    get_plan_store,
+)
 from server.helpers.planner_helper.planner_helper_data_types import (
     ChoiceInfo,
-    PlanningTask,
     SelectionInfo,
     SelectionPriority,
 )
-from server.helpers.planner_helper.planner_helper import get_dot_graph_str
-from server.helpers.graph_helper.graph_helper import (
-    convert_dot_str_to_networkx_graph,
-    get_node_edge_name_plan_hash_list,
-    get_graph_with_number_of_plans_label,
-    get_node_distance_from_terminal_node,
-    get_edge_label,
+from server.helpers.common_helper.metrics_helper import observe_stage
+from server.helpers.graph_helper.distance_index_helper import DistanceIndex
+from server.helpers.graph_helper.graph_helper import get_edge_label
+from server.helpers.graph_helper.plan_graph_cache_helper import (
+    PlanGraph,
+    get_plan_graph,
 )
 from server.planners.drivers.planner_driver_datatype import Plan
 from server.planners.drivers.landmark_driver_datatype import Landmark
 
 
-def get_min_dist_between_nodes_from_terminal_node_by_node(
-    nodes: List[str],
-    node_dist_from_terminal_state: Dict[str, int],
-) -> int:
-    min_dist = sys.maxsize
-    for node in nodes:
-        if node in node_dist_from_terminal_state:
-            if node_dist_from_terminal_state[node] < min_dist:
-                min_dist = node_dist_from_terminal_state[node]
-    return min_dist
+class FilteredPlanDisambiguatorOutput:
+    """
+    plans filtered by selection infos with their landmark choices and plan
+    graph, shared by all plan disambiguation views; annotations of the plan
+    graph are read from the plan graph
+    """
+
+    __slots__ = ("selected_plans", "choice_infos", "plan_graph")
+
+    def __init__(
+        self,
+        selected_plans: List[Plan],
+        choice_infos: List[ChoiceInfo],
+        plan_graph: PlanGraph,
+    ) -> None:
+        self.selected_plans = selected_plans
+        self.choice_infos = choice_infos
+        self.plan_graph = plan_graph
+
+    @property
+    def g(self) -> Graph:
+        return self.plan_graph.graph
+
+    @property
+    def dot_str(self) -> str:
+        return self.plan_graph.dot_str
+
+    @property
+    def node_plan_hashes_dict(self) -> Dict[str, List[str]]:
+        return self.plan_graph.node_plan_hashes_dict
+
+    @property
+    def edge_plan_hash_dict(self) -> Dict[Tuple[Any, Any], List[str]]:
+        return self.plan_graph.edge_plan_hash_dict
+
+    @property
+    def edge_label_nodes_dict(self) -> Dict[str, List[str]]:
+        return self.plan_graph.edge_label_nodes_dict
+
+    @property
+    def node_dist_from_initial_state(self) -> Mapping[str, int]:
+        return self.plan_graph.node_dist_from_initial_state
+
+    @property
+    def node_dist_from_end_state(self) -> Mapping[str, int]:
+        return self.plan_graph.node_dist_from_end_state
 
 
 def get_min_dist_between_nodes_from_terminal_node(
     edge_labels: List[str],
     edge_label_nodes_dict: Dict[str, List[str]],
-    node_dist_from_terminal_state: Dict[str, int],
+    node_dist_from_terminal_state: Mapping[str, int],
 ) -> int:
     min_dist = sys.maxsize
     for edge_label in edge_labels:
@@ -82,39 +133,34 @@ def split_plans_with_actions(
     action_names: List[str],
     plans: List[Plan],
     previous_selected_actions: Set[str],
+    action_index: Optional[ActionIndex] = None,
 ) -> Tuple[Dict[str, List[int]], Dict[str, List[str]], int]:
     """
     returns a tuple of 1) a dictionary of first_achiever names and lists of plan
-    indices and 2) the maximum number of plans with a first achiever
+    indices and 2) the maximum number of plans with a first achiever, looked up
+    in an action index of the plans, which is built when it is not given
     """
-    plan_sets: List[Set[str]] = list(map(lambda plan: set(plan.actions), plans))
+    if action_index is None:
+        action_index = get_action_index(plans)
     action_name_list_plan_idx: Dict[str, List[int]] = dict()
     action_name_list_plan_hash: Dict[str, List[str]] = dict()
-    plan_hashes_for_action: Set[str] = set()
 
     for action_name in action_names:  # first achievers
-        for plan_set_idx, plan_set in enumerate(plan_sets):
-            if (
-                action_name in plan_set
-                and action_name not in previous_selected_actions
-            ):
-                if action_name not in action_name_list_plan_idx:
-                    action_name_list_plan_idx[action_name] = list()
-                    action_name_list_plan_hash[action_name] = list()
-
-                action_name_list_plan_idx[action_name].append(plan_set_idx)
-
-                if plans[plan_set_idx].plan_hash is not None:
-                    plan_hashes_for_action.add(
-                        plans[plan_set_idx].plan_hash  # type: ignore
-                    )
-                    action_name_list_plan_hash[action_name].append(
-                        plans[plan_set_idx].plan_hash  # type: ignore
-                    )
-
-        if action_name in action_name_list_plan_idx and len(
-            action_name_list_plan_idx[action_name]
-        ) == len(
+        if action_name in previous_selected_actions:
+            continue
+        plan_indices = action_index.get_plan_positions(action_name)
+        if len(plan_indices) == 0:
+            continue
+        action_name_list_plan_idx.setdefault(action_name, list()).extend(
+            plan_indices
+        )
+        action_name_list_plan_hash.setdefault(action_name, list()).extend(
+            plans[plan_idx].plan_hash  # type: ignore
+            for plan_idx in plan_indices
+            if plans[plan_idx].plan_hash is not None
+        )
+
+        if len(action_name_list_plan_idx[action_name]) == len(
             plans
         ):  # remove an action, which cannot disambiguate plans
             action_name_list_plan_idx.pop(action_name, None)
@@ -139,22 +185,25 @@ def split_plans_with_actions(
 
 
 def get_plans_filetered_by_selected_plan_hashes(
-    selection_info: SelectionInfo, plans: List[Plan]
+    selection_info: SelectionInfo, plans: Union[List[Plan], PlanStore]
 ) -> List[Plan]:
+    """
+    returns the given plans themselves, not copies, of selected plan hashes
+    """
+    plan_store = get_plan_store(plans)
     if (
         selection_info.selected_plan_hashes is None
         or len(selection_info.selected_plan_hashes) == 0
     ):
-        return list(map(lambda plan: plan.model_copy(deep=True), plans))
+        return list(plan_store.plans)
 
-    plan_hashes_to_select: Set[str] = set(selection_info.selected_plan_hashes)
-    return list(
-        filter(lambda plan: plan.plan_hash in plan_hashes_to_select, plans)
+    return plan_store.get_plans(
+        plan_store.get_plan_set(selection_info.selected_plan_hashes)
     )
 
 
 def get_plans_with_selection_info(
-    selection_info: SelectionInfo, plans: List[Plan]
+    selection_info: SelectionInfo, plans: Union[List[Plan], PlanStore]
 ) -> List[Plan]:
     """
     returns plans filtered by a selected landmark
@@ -162,37 +211,43 @@ def get_plans_with_selection_info(
     return get_plans_filetered_by_selected_plan_hashes(selection_info, plans)
 
 
-def get_plans_with_selection_infos(
-    selection_infos: List[SelectionInfo],
-    plans: List[Plan],
-) -> List[Plan]:
+def get_plan_set_with_selection_infos(
+    selection_infos: List[SelectionInfo], plan_store: PlanStore
+) -> PlanSet:
     """
-    returns plans filtered by selected landmarks
+    returns the plan set of plans filtered by selected landmarks
     """
-    if len(plans) == 0:
-        return []
-    plans_before_filtering = list(
-        map(lambda plan: plan.model_copy(deep=True), plans)
-    )
-
     if selection_infos is None or len(selection_infos) == 0:
-        return plans_before_filtering
+        return plan_store.get_all_plans()
 
-    filtered_plan_hashes: Set[str] = set(
+    filtered_plan_set = plan_store.get_plan_set(
         selection_infos[0].selected_plan_hashes
     )
     for i in range(len(selection_infos) - 1):
         if len(selection_infos[i + 1].selected_plan_hashes) > 0:
-            filtered_plan_hashes = filtered_plan_hashes.intersection(
-                set(selection_infos[i + 1].selected_plan_hashes)
+            filtered_plan_set &= plan_store.get_plan_set(
+                selection_infos[i + 1].selected_plan_hashes
             )
-    filtered_plans = list(
-        filter(
-            lambda plan: plan.plan_hash in filtered_plan_hashes,
-            plans_before_filtering,
-        )
-    )
-    return filtered_plans if len(filtered_plans) > 0 else plans_before_filtering
+    if len(filtered_plan_set) == 0:
+        return plan_store.get_all_plans()
+    return filtered_plan_set
+
+
+def get_plans_with_selection_infos(
+    selection_infos: List[SelectionInfo],
+    plans: Union[List[Plan], PlanStore],
+) -> List[Plan]:
+    """
+    returns plans filtered by selected landmarks
+    """
+    # selections are plan sets over the plans, which are never copied
+    plan_store = get_plan_store(plans)
+    if len(plan_store.plans) == 0:
+        return []
+    plan_set = get_plan_set_with_selection_infos(selection_infos, plan_store)
+    if plan_set == plan_store.get_all_plans():
+        return list(plan_store.plans)
+    return plan_store.get_plans(plan_set)
 
 
 def get_split_by_actions(
@@ -211,6 +266,8 @@ def get_split_by_actions(
         if item.selected_first_achiever
     )
 
+    # the plans taking each action are looked up for all landmarks
+    action_index = get_action_index(plans)
     choice_infos: List[ChoiceInfo] = list()
     for landmark in landmarks:
         (
@@ -218,7 +275,10 @@ def get_split_by_actions(
             action_name_plan_hash_list,
             num_plans_in_actions,
         ) = split_plans_with_actions(
-            landmark.first_achievers, plans, previous_selected_actions
+            landmark.first_achievers,
+            plans,
+            previous_selected_actions,
+            action_index,
         )
         if (
             len(action_name_plan_hash_list) > 0
@@ -268,46 +328,65 @@ def get_plan_disambiguator_output_filtered_by_selection_infos(
     domain: str,
     problem: str,
     plans: List[Plan],
-) -> Tuple[
-    List[Plan],
-    List[ChoiceInfo],
-    Graph,
-    str,
-    Dict[str, List[str]],
-    Dict[Tuple[str, str], List[str]],
-    Dict[str, List[str]],
-    Dict[str, int],
-    Dict[str, int],
-]:
+    all_plans_graph: Optional[PlanGraph] = None,
+) -> FilteredPlanDisambiguatorOutput:
     """
     returns 1) filtered plans, 2) filtered and sorted landmarks,
-    landmarks information, 3) a graph, 4) a graph in dot string
+    landmarks information, 3) a graph, 4) a graph in dot string; the plans are
+    selected from the given plans in their order, while the plan graph of all
+    plans, which is looked up in the plan graph cache unless it is given, only
+    annotates them, as it is shared by requests listing the same plans in
+    another order
     """
-    selected_plans = get_plans_with_selection_infos(selection_infos, plans)
-    dot_str = get_dot_graph_str(
-        planning_task=PlanningTask(domain=domain, problem=problem),
-        planning_results=PlanningResult(plans=selected_plans),
-    )
-    g = convert_dot_str_to_networkx_graph(dot_str)
-    node_dist_from_initial_state = get_node_distance_from_terminal_node(g, True)
-    node_dist_from_end_state = get_node_distance_from_terminal_node(g, False)
-    (
-        node_plan_hashes_dict,
-        edge_plan_hash_dict,
-        edge_label_nodes_dict,
-    ) = get_node_edge_name_plan_hash_list(g, selected_plans, True)
-    g = get_graph_with_number_of_plans_label(g, node_plan_hashes_dict)
-    choices = get_split_by_actions(landmarks, selected_plans, selection_infos)
-    return (
-        selected_plans,
-        choices,
-        g,
-        dot_str,
-        node_plan_hashes_dict,
-        edge_plan_hash_dict,
-        edge_label_nodes_dict,
-        node_dist_from_initial_state,
-        node_dist_from_end_state,
+    if all_plans_graph is None:
+        with observe_stage("plan_graph", num_plans=len(plans)) as span:
+            all_plans_graph = get_plan_graph(domain, problem, plans)
+            g = all_plans_graph.graph
+            span.set_attributes(
+                num_nodes=g.number_of_nodes(), num_edges=g.number_of_edges()
+            )
+    plan_store = get_plan_store(plans)
+    with observe_stage(
+        "filter_plans",
+        num_plans=len(plan_store.plans),
+        num_selection_infos=len(selection_infos),
+    ) as span:
+        selected_plan_set = get_plan_set_with_selection_infos(
+            selection_infos, plan_store
+        )
+        is_all_plans = selected_plan_set == plan_store.get_all_plans()
+        selected_plans = (
+            list(plan_store.plans)
+            if is_all_plans
+            else plan_store.get_plans(selected_plan_set)
+        )
+        span.set_attribute("num_selected_plans", len(selected_plans))
+    if is_all_plans:
+        plan_graph = all_plans_graph
+    else:
+        with observe_stage("plan_graph", num_plans=len(selected_plans)) as span:
+            # the plan graph of the selected plans is projected from the plan
+            # graph of all plans
+            plan_graph = get_plan_graph(
+                domain, problem, selected_plans, all_plans_graph=all_plans_graph
+            )
+            g = plan_graph.graph
+            span.set_attributes(
+                num_nodes=g.number_of_nodes(), num_edges=g.number_of_edges()
+            )
+    with observe_stage(
+        "split_by_actions",
+        num_landmarks=len(landmarks),
+        num_plans=len(selected_plans),
+    ) as span:
+        choices = get_split_by_actions(
+            landmarks, selected_plans, selection_infos
+        )
+        span.set_attribute("num_choice_infos", len(choices))
+    return FilteredPlanDisambiguatorOutput(
+        selected_plans=selected_plans,
+        choice_infos=choices,
+        plan_graph=plan_graph,
     )
 
 
@@ -367,39 +446,34 @@ def get_edge_label_plan_hashes_dict(
 def get_plan_hashes_with_edges(
     g: Graph,
     edges: List[Tuple[str, str]],
-    edge_plan_hash_dict: Dict[Tuple[Any, Any], List[str]],
-    plans: List[Plan],
-) -> Dict[str, List[Optional[str]]]:
-    action_name_plan_hashes_dict: Dict[str, List[Optional[str]]] = {}
-    plan_hashes_from_plans: Set[Optional[str]] = set(
-        map(lambda plan: plan.plan_hash, plans)
-    )
-    for edge in edges:
-        edge_label = get_edge_label(g, edge)
-        edge_set = set(edge_plan_hash_dict[edge])
-        action_name_plan_hashes_dict[edge_label] = list(
-            edge_set.intersection(plan_hashes_from_plans)
-        )
-    return action_name_plan_hashes_dict
+    edge_plan_sets: Dict[Tuple[Any, Any], PlanSet],
+    plan_set: PlanSet,
+) -> Dict[str, List[str]]:
+    """
+    returns a dictionary of edge labels (keys) and the hashes of the plans of
+    a plan set taking the edges
+    """
+    return {
+        get_edge_label(g, edge): (
+            edge_plan_sets[edge] & plan_set
+        ).get_plan_hashes()
+        for edge in edges
+    }
 
 
 def get_choice_info_multiple_edges_without_landmark(
     g: Graph,
     node_with_multiple_edges: str,
-    node_plan_hashes_dict: Dict[str, List[str]],
-    edge_plan_hash_dict: Dict[Tuple[Any, Any], List[str]],
+    node_plan_sets: Dict[str, PlanSet],
+    edge_plan_sets: Dict[Tuple[Any, Any], PlanSet],
     edges: List[Tuple[str, str]],
-    plans: List[Plan],
+    plan_set: PlanSet,
 ) -> ChoiceInfo:
-    plan_hashes_from_node = set(node_plan_hashes_dict[node_with_multiple_edges])
-    filtered_plans = list(
-        filter(lambda plan: plan.plan_hash in plan_hashes_from_node, plans)
-    )
     action_name_plan_hashes_dict = get_plan_hashes_with_edges(
         g,
         edges=edges,
-        edge_plan_hash_dict=edge_plan_hash_dict,
-        plans=filtered_plans,
+        edge_plan_sets=edge_plan_sets,
+        plan_set=node_plan_sets[node_with_multiple_edges] & plan_set,
     )
 
     return ChoiceInfo(
@@ -471,7 +545,8 @@ def get_total_num_plans(choice_info: ChoiceInfo) -> int:
 
 def sort_choice_info_by_distance_to_terminal_nodes(
     choice_infos_input: List[ChoiceInfo],
-    node_dist_from_terminal_node: Dict[str, int],
+    distance_index: DistanceIndex,
+    is_forward: bool,
 ) -> List[ChoiceInfo]:
     choice_infos = list(
         map(
@@ -479,10 +554,10 @@ def sort_choice_info_by_distance_to_terminal_nodes(
             choice_infos_input,
         )
     )
+    node_distances = distance_index.get_node_distances(is_forward)
     choice_infos.sort(
-        key=lambda cf: get_min_dist_between_nodes_from_terminal_node_by_node(
-            list(cf.nodes_with_multiple_out_edges),
-            node_dist_from_terminal_node,
+        key=lambda cf: node_distances.get_min_distance(
+            cf.nodes_with_multiple_out_edges
         )
     )
 
@@ -491,31 +566,38 @@ def sort_choice_info_by_distance_to_terminal_nodes(
 
 def set_distance_to_terminal_nodes(
     choice_info_input: ChoiceInfo,
-    node_dist_from_initial_state: Dict[str, int],
-    node_dist_from_end_state: Dict[str, int],
+    distance_index: DistanceIndex,
 ) -> ChoiceInfo:
     choice_info: ChoiceInfo = choice_info_input.model_copy(deep=True)
     choice_info.distance_to_init = (
-        get_min_dist_between_nodes_from_terminal_node_by_node(
-            choice_info.nodes_with_multiple_out_edges,
-            node_dist_from_initial_state,
+        distance_index.dist_from_initial_state.get_min_distance(
+            choice_info.nodes_with_multiple_out_edges
         )
     )
     choice_info.distance_to_end = (
-        get_min_dist_between_nodes_from_terminal_node_by_node(
-            choice_info.nodes_with_multiple_out_edges,
-            node_dist_from_end_state,
+        distance_index.dist_to_end_state.get_min_distance(
+            choice_info.nodes_with_multiple_out_edges
         )
     )
     return choice_info
 
 
+def get_selection_priority(
+    selection_priority: Optional[str],
+) -> Optional[SelectionPriority]:
+    """
+    returns the selection priority of a request, which gives its value
+    """
+    if selection_priority is None:
+        return None
+    return SelectionPriority(selection_priority)
+
+
 def process_selection_priority(
     choice_infos_input: List[ChoiceInfo],
-    selection_priority: SelectionPriority,
+    selection_priority: Optional[SelectionPriority],
     edge_label_nodes_dict: Dict[str, List[str]],
-    node_dist_from_initial_state: Dict[str, int],
-    node_dist_from_end_state: Dict[str, int],
+    distance_index: DistanceIndex,
 ) -> List[ChoiceInfo]:
     choice_infos = list(
         map(
@@ -526,29 +608,29 @@ def process_selection_priority(
 
     if (
         selection_priority is None
-        or selection_priority == SelectionPriority.MAX_PLANS.value
-        or selection_priority == SelectionPriority.MIN_PLANS.value
+        or selection_priority == SelectionPriority.MAX_PLANS
+        or selection_priority == SelectionPriority.MIN_PLANS
     ):
         choice_infos.sort(
             key=lambda choice_info: get_total_num_plans(choice_info),
-            reverse=(selection_priority == SelectionPriority.MIN_PLANS.value),
+            reverse=(selection_priority == SelectionPriority.MIN_PLANS),
         )
-    elif selection_priority == SelectionPriority.RANDOM.value:
+    elif selection_priority == SelectionPriority.RANDOM:
         random.shuffle(choice_infos)
-    elif selection_priority == SelectionPriority.INIT_FORWARD.value:
+    elif selection_priority == SelectionPriority.INIT_FORWARD:
         choice_infos.sort(
             key=lambda cf: get_min_dist_between_nodes_from_terminal_node(
                 list(cf.action_name_plan_hash_map.keys()),
                 edge_label_nodes_dict,
-                node_dist_from_initial_state,
+                distance_index.dist_from_initial_state,
             )
         )
-    elif selection_priority == SelectionPriority.GOAL_BACKWARD.value:
+    elif selection_priority == SelectionPriority.GOAL_BACKWARD:
         choice_infos.sort(
             key=lambda cf: get_min_dist_between_nodes_from_terminal_node(
                 list(cf.action_name_plan_hash_map.keys()),
                 edge_label_nodes_dict,
-                node_dist_from_end_state,
+                distance_index.dist_to_end_state,
             )
         )
 
@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from networkx import Graph
 from server.helpers.planner_helper.planner_helper_data_types import (
@@ -9,11 +9,14 @@ from server.helpers.planner_helper.planner_helper_data_types import (
     SelectionPriority,
 )
 from server.helpers.graph_helper.graph_helper import get_dict_from_graph
+from server.helpers.graph_helper.plan_graph_cache_helper import PlanGraph
 from server.helpers.common_helper.exception_handler import (
     planner_exception_handler,
 )
 from server.helpers.plan_disambiguator_helper.plan_disambiguator_helper import (
+    FilteredPlanDisambiguatorOutput,
     get_plan_disambiguator_output_filtered_by_selection_infos,
+    get_selection_priority,
     get_choice_info_multiple_edges_without_landmark,
     append_landmarks_not_available_for_choice,
     set_nodes_with_multiple_edges,
@@ -32,22 +35,35 @@ def get_selection_flow_output(
     domain: str,
     problem: str,
     plans: List[Plan],
-    selection_priority: SelectionPriority,
+    selection_priority: Optional[str],
+    all_plans_graph: Optional[PlanGraph] = None,
 ) -> Tuple[PlanDisambiguatorOutput, Dict[Tuple[str, str], List[str]], Graph]:
-    (
-        selected_plans,
-        choice_infos,
-        g,
-        _,
-        node_plan_hashes_dict,
-        edge_plan_hash_dict,
-        edge_label_nodes_dict,
-        node_dist_from_initial_state,
-        node_dist_from_end_state,
-    ) = get_plan_disambiguator_output_filtered_by_selection_infos(
-        selection_infos, landmarks, domain, problem, plans
+    filtered_output = get_plan_disambiguator_output_filtered_by_selection_infos(
+        selection_infos, landmarks, domain, problem, plans, all_plans_graph
     )
-    networkx_graph = get_dict_from_graph(g)
+    return get_selection_flow_output_from_filtered_output(
+        filtered_output,
+        get_dict_from_graph(filtered_output.g),
+        landmarks,
+        get_selection_priority(selection_priority),
+    )
+
+
+def get_selection_flow_output_from_filtered_output(
+    filtered_output: FilteredPlanDisambiguatorOutput,
+    networkx_graph: Any,
+    landmarks: List[Landmark],
+    selection_priority: Optional[SelectionPriority],
+) -> Tuple[PlanDisambiguatorOutput, Dict[Tuple[str, str], List[str]], Graph]:
+    """
+    returns the select view of plans already filtered by selection infos
+    """
+    selected_plans = filtered_output.selected_plans
+    choice_infos = filtered_output.choice_infos
+    plan_graph = filtered_output.plan_graph
+    g = plan_graph.graph
+    node_plan_hashes_dict = plan_graph.node_plan_hashes_dict
+    edge_plan_hash_dict = plan_graph.edge_plan_hash_dict
 
     if (
         len(selected_plans) > 1
@@ -64,7 +80,9 @@ def get_selection_flow_output(
         (
             nodes_with_multiple_edges,
             nodes_traversed,
-        ) = get_first_node_with_multiple_out_edges(g, True)
+        ) = get_first_node_with_multiple_out_edges(
+            plan_graph.compact_graph, True
+        )
         choice_infos = append_landmarks_not_available_for_choice(
             landmarks,
             list(
@@ -72,10 +90,10 @@ def get_selection_flow_output(
                     lambda payload: get_choice_info_multiple_edges_without_landmark(
                         g=g,
                         node_with_multiple_edges=payload[0],
-                        node_plan_hashes_dict=node_plan_hashes_dict,
-                        edge_plan_hash_dict=edge_plan_hash_dict,
+                        node_plan_sets=plan_graph.node_plan_sets,
+                        edge_plan_sets=plan_graph.edge_plan_sets,
                         edges=payload[1],
-                        plans=selected_plans,
+                        plan_set=plan_graph.plan_set,
                     ),
                     nodes_with_multiple_edges,
                 )
@@ -84,9 +102,7 @@ def get_selection_flow_output(
         choice_infos = list(
             map(
                 lambda choice_info: set_distance_to_terminal_nodes(
-                    choice_info,
-                    node_dist_from_initial_state,
-                    node_dist_from_end_state,
+                    choice_info, plan_graph.distance_index
                 ),
                 choice_infos,
             )
@@ -109,19 +125,16 @@ def get_selection_flow_output(
     choice_infos = process_selection_priority(
         set_nodes_with_multiple_edges(
             append_landmarks_not_available_for_choice(landmarks, choice_infos),
-            edge_label_nodes_dict,
+            plan_graph.edge_label_nodes_dict,
         ),
         selection_priority,
-        edge_label_nodes_dict,
-        node_dist_from_initial_state,
-        node_dist_from_end_state,
+        plan_graph.edge_label_nodes_dict,
+        plan_graph.distance_index,
     )
     choice_infos = list(
         map(
             lambda choice_info: set_distance_to_terminal_nodes(
-                choice_info,
-                node_dist_from_initial_state,
-                node_dist_from_end_state,
+                choice_info, plan_graph.distance_index
             ),
             choice_infos,
         )
@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import List, Optional
+
+from server.helpers.common_helper.cache_helper import CacheStats, LRUCache
+from server.helpers.common_helper.config_helper import get_env_int, get_env_str
+from server.helpers.common_helper.file_helper import (
+    create_file_from_base_model,
+    create_folders_if_not_exist,
+    get_model_from_file,
+)
+from server.helpers.common_helper.hash_helper import get_task_fingerprint
+from server.planners.drivers.landmark_driver import get_landmarks
+from server.planners.drivers.landmark_driver_datatype import (
+    Landmark,
+    LandmarksResponseModel,
+)
+
+LANDMARK_CACHE_MAX_NUM = get_env_int("LEMMING_LANDMARK_CACHE_MAX_NUM", 128)
+LANDMARK_CACHE_MEMORY_BUDGET = get_env_int(
+    "LEMMING_LANDMARK_CACHE_MEMORY_BUDGET", 64 * 1024 * 1024
+)
+# landmarks are also written to and read from this folder when it is set
+LANDMARK_CACHE_DIR = get_env_str("LEMMING_LANDMARK_CACHE_DIR")
+
+
+def get_landmarks_size(landmarks: List[Landmark]) -> int:
+    return sum(
+        sum(len(fact) for fact in landmark.facts)
+        + sum(len(action) for action in landmark.first_achievers)
+        for landmark in landmarks
+    )
+
+
+class LandmarkCache:
+    """
+    memoizes landmarks by a canonical fingerprint of a planning task and a
+    landmark category, optionally persisting them on disk
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = LANDMARK_CACHE_MAX_NUM,
+        memory_budget: Optional[int] = LANDMARK_CACHE_MEMORY_BUDGET,
+        cache_dir: Optional[str] = LANDMARK_CACHE_DIR,
+    ) -> None:
+        self._landmarks: LRUCache[str, List[Landmark]] = LRUCache(
+            name="landmark",
+            max_entries=max_entries,
+            max_size=memory_budget,
+            get_size=get_landmarks_size,
+        )
+        self.cache_dir = cache_dir
+        if self.cache_dir is not None:
+            create_folders_if_not_exist(self.cache_dir)
+
+    def get_landmarks(
+        self, category: str, domain: str, problem: str
+    ) -> List[Landmark]:
+        key = f"{get_task_fingerprint(domain, problem)}_{category}"
+        landmarks = self._landmarks.get(key)
+        if landmarks is None:
+            landmarks = self._read_landmarks(key)
+            if landmarks is None:
+                landmarks = get_landmarks(category, domain, problem)
+                self._write_landmarks(key, landmarks)
+            self._landmarks.put(key, landmarks)
+        # landmarks are shared between requests, but not the list
+        return list(landmarks)
+
+    def clear(self) -> None:
+        self._landmarks.clear()
+
+    def get_stats(self) -> CacheStats:
+        return self._landmarks.get_stats()
+
+    def _get_file_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return Path(self.cache_dir) / f"{key}.json"
+
+    def _read_landmarks(self, key: str) -> Optional[List[Landmark]]:
+        file_path = self._get_file_path(key)
+        if file_path is None or not file_path.is_file():
+            return None
+        try:
+            landmarks_response_model = get_model_from_file(
+                file_path, LandmarksResponseModel  # type: ignore
+            )
+            return landmarks_response_model.landmarks  # type: ignore
+        except Exception as e:
+            print(e)
+            return None
+
+    def _write_landmarks(self, key: str, landmarks: List[Landmark]) -> None:
+        file_path = self._get_file_path(key)
+        if file_path is None:
+            return
+        try:
+            create_file_from_base_model(
+                file_path, LandmarksResponseModel(landmarks=landmarks)
+            )
+        except Exception as e:
+            print(e)
+
+
+landmark_cache = LandmarkCache()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from server.planners.drivers.planner_driver_datatype import Plan
+
+
+class PlanIndex(NamedTuple):
+    """
+    the plan hashes of a set of plans, numbered in the order of the plans
+    """
+
+    plan_hashes: List[str]
+    plan_ids: Dict[str, int]
+
+
+def get_plan_index(plan_hashes: Iterable[Optional[str]]) -> PlanIndex:
+    plan_index = PlanIndex(plan_hashes=list(), plan_ids=dict())
+    for plan_hash in plan_hashes:
+        if plan_hash is not None and plan_hash not in plan_index.plan_ids:
+            plan_index.plan_ids[plan_hash] = len(plan_index.plan_hashes)
+            plan_index.plan_hashes.append(plan_hash)
+    return plan_index
+
+
+class PlanSet:
+    """
+    an immutable set of plans of a plan index as a bitmask, where bit i stands
+    for the plan with id i; intersections, unions, counts and membership are
+    word operations, and plan hashes are listed only at the API boundary
+    """
+
+    __slots__ = ("plan_index", "bits")
+
+    def __init__(self, plan_index: PlanIndex, bits: int = 0) -> None:
+        self.plan_index = plan_index
+        self.bits = bits
+
+    @classmethod
+    def from_plan_hashes(
+        cls, plan_index: PlanIndex, plan_hashes: Iterable[Optional[str]]
+    ) -> PlanSet:
+        """
+        returns the set of the plans with plan hashes, ignoring plan hashes
+        not in the plan index
+        """
+        bits = 0
+        for plan_hash in plan_hashes:
+            plan_id = plan_index.plan_ids.get(plan_hash)  # type: ignore
+            if plan_id is not None:
+                bits |= 1 << plan_id
+        return cls(plan_index, bits)
+
+    @classmethod
+    def all_plans(cls, plan_index: PlanIndex) -> PlanSet:
+        return cls(plan_index, (1 << len(plan_index.plan_hashes)) - 1)
+
+    def check_plan_index(self, other: PlanSet) -> None:
+        if self.plan_index is not other.plan_index:
+            raise ValueError("plan sets of different plan indices")
+
+    def __and__(self, other: PlanSet) -> PlanSet:
+        self.check_plan_index(other)
+        return PlanSet(self.plan_index, self.bits & other.bits)
+
+    def __or__(self, other: PlanSet) -> PlanSet:
+        self.check_plan_index(other)
+        return PlanSet(self.plan_index, self.bits | other.bits)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, PlanSet)
+            and self.plan_index is other.plan_index
+            and self.bits == other.bits
+        )
+
+    __hash__ = None  # type: ignore
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __contains__(self, plan_hash: object) -> bool:
+        plan_id = self.plan_index.plan_ids.get(plan_hash)  # type: ignore
+        return plan_id is not None and (self.bits >> plan_id) & 1 == 1
+
+    def __iter__(self) -> Iterator[str]:
+        for plan_id in self.get_plan_ids():
+            yield self.plan_index.plan_hashes[plan_id]
+
+    def get_plan_ids(self) -> Iterator[int]:
+        bits = self.bits
+        while bits:
+            lowest_bit = bits & -bits
+            yield lowest_bit.bit_length() - 1
+            bits ^= lowest_bit
+
+    def __repr__(self) -> str:
+        return f"PlanSet({list(self)})"
+
+    def get_plan_hashes(self) -> List[str]:
+        """
+        returns the plan hashes of the plans in the order of the plan index
+        """
+        return list(self)
+
+
+def get_plan_set_size(plan_set: PlanSet) -> int:
+    """
+    returns an estimate of the number of bytes held by a plan set besides its
+    plan index
+    """
+    # the object with two slots and the int object of the bitmask
+    return 56 + 28 + plan_set.bits.bit_length() // 8
+
+
+class ActionIndex(NamedTuple):
+    """
+    the positions of the plans of a list of plans taking each action, in
+    ascending order
+    """
+
+    plan_positions_by_action: Dict[str, List[int]]
+    num_plans: int
+
+    def get_plan_positions(self, action_name: str) -> List[int]:
+        return self.plan_positions_by_action.get(action_name, [])
+
+
+def get_action_index(plans: List[Plan]) -> ActionIndex:
+    plan_positions_by_action: Dict[str, List[int]] = dict()
+    for plan_position, plan in enumerate(plans):
+        for action_name in dict.fromkeys(plan.actions):
+            plan_positions_by_action.setdefault(action_name, list()).append(
+                plan_position
+            )
+    return ActionIndex(
+        plan_positions_by_action=plan_positions_by_action,
+        num_plans=len(plans),
+    )
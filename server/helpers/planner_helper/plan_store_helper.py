@@ -0,0 +1,117 @@
+from typing import (
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from server.helpers.common_helper.hash_helper import get_list_hash
+from server.helpers.planner_helper.plan_set_helper import (
+    PlanIndex,
+    PlanSet,
+    get_plan_index,
+)
+from server.planners.drivers.planner_driver_datatype import Plan
+
+PLAN_HASH_SIZE = 32
+
+
+def get_plan_hash(plan: Plan) -> str:
+    return plan.plan_hash or get_list_hash(plan.actions)
+
+
+def get_hashed_plans(plans: Iterable[Plan]) -> List[Plan]:
+    """
+    returns plans with their plan hashes set, as PlanningResult does, without
+    validating the plans again; plans missing a plan hash are copied, so that
+    the given plans are left as they are
+    """
+    return [
+        (
+            plan
+            if plan.plan_hash
+            else plan.model_copy(
+                update=dict(plan_hash=get_list_hash(plan.actions))
+            )
+        )
+        for plan in plans
+    ]
+
+
+class PlanStore(NamedTuple):
+    """
+    the plans of a plan set with their plan hashes set once, kept with its
+    cached plan graph; a selection of plans is a plan set over its plan index,
+    listing the stored plans themselves instead of copies of them
+    """
+
+    plans: Tuple[Plan, ...]
+    plan_index: PlanIndex
+    # the positions of the plans of each plan id, which differ only for plans
+    # given more than once
+    plan_positions: Tuple[Tuple[int, ...], ...]
+
+    def get_plan_set(self, plan_hashes: Iterable[Optional[str]]) -> PlanSet:
+        return PlanSet.from_plan_hashes(self.plan_index, plan_hashes)
+
+    def get_all_plans(self) -> PlanSet:
+        return PlanSet.all_plans(self.plan_index)
+
+    def get_plans(self, plan_set: PlanSet) -> List[Plan]:
+        """
+        returns the stored plans of a plan set in the order of the plans,
+        looking up the plans of the plan set only
+        """
+        if plan_set.plan_index is not self.plan_index:
+            raise ValueError("plan set of a different plan index")
+        return [
+            self.plans[plan_position]
+            for plan_position in sorted(
+                plan_position
+                for plan_id in plan_set.get_plan_ids()
+                for plan_position in self.plan_positions[plan_id]
+            )
+        ]
+
+
+def get_plan_store(plans: Union[Sequence[Plan], PlanStore]) -> PlanStore:
+    """
+    returns the plan store of plans, or the plan store itself when given one
+    """
+    if isinstance(plans, PlanStore):
+        return plans
+    hashed_plans = get_hashed_plans(plans)
+    plan_index = get_plan_index(plan.plan_hash for plan in hashed_plans)
+    plan_positions: List[List[int]] = [list() for _ in plan_index.plan_hashes]
+    for plan_position, plan in enumerate(hashed_plans):
+        plan_id = plan_index.plan_ids[plan.plan_hash]  # type: ignore
+        plan_positions[plan_id].append(plan_position)
+    return PlanStore(
+        plans=tuple(hashed_plans),
+        plan_index=plan_index,
+        plan_positions=tuple(tuple(positions) for positions in plan_positions),
+    )
+
+
+def get_plans_size(plans: Sequence[Plan]) -> int:
+    """
+    returns an estimate of the number of bytes held by plans
+    """
+    return sum(
+        sum(len(action) for action in plan.actions) + PLAN_HASH_SIZE
+        for plan in plans
+    )
+
+
+def get_plan_store_size(plan_store: PlanStore) -> int:
+    """
+    returns an estimate of the number of bytes held by the plans of a plan
+    store and its plan index
+    """
+    return (
+        get_plans_size(plan_store.plans)
+        + len(plan_store.plans) * PLAN_HASH_SIZE
+    )
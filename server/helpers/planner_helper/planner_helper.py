@@ -1,23 +1,46 @@
+import logging
 from typing import List, Optional
 
+from server.helpers.common_helper.config_helper import get_env_str
 from server.helpers.common_helper.exception_handler import (
     planner_exception_handler,
 )
+from server.helpers.common_helper.metrics_helper import observe_stage
 from server.helpers.common_helper.str_helper import format_plans
+from server.helpers.graph_helper.native_plan_graph_helper import (
+    NativePlanGraph,
+    build_native_plan_graph,
+    get_dot_str,
+)
 from server.helpers.planner_helper.planner_helper_data_types import (
     Landmark,
+    PlanGraphBackend,
     PlanningTask,
 )
 from server.planners.drivers.forbid_iterative_planner_driver import (
     execute_forbid_iterative_planner,
     get_plans_dot,
 )
-from server.planners.drivers.landmark_driver import get_landmarks
+from server.helpers.planner_helper.landmark_cache_helper import landmark_cache
+from server.helpers.planner_helper.planning_result_cache_helper import (
+    planning_result_cache,
+)
+from server.helpers.planner_helper.sas_task_helper import get_sas_task
 from server.planners.drivers.planner_driver_datatype import PlanningResult
 
+logger = logging.getLogger(__name__)
 
-@planner_exception_handler
-def get_plan_topk(planning_task: PlanningTask) -> Optional[PlanningResult]:
+# plan graphs are built by replaying plans in the grounded task with the
+# native backend, falling back to forbiditerative for unsupported tasks
+PLAN_GRAPH_BACKEND = get_env_str(
+    "LEMMING_PLAN_GRAPH_BACKEND", PlanGraphBackend.FORBIDITERATIVE.value
+)
+
+
+def compute_plan_topk(planning_task: PlanningTask) -> PlanningResult:
+    """
+    returns plans from the planner, without looking up the planning result cache
+    """
     return format_plans(
         execute_forbid_iterative_planner(
             planner_name="topk",
@@ -25,25 +48,76 @@ def get_plan_topk(planning_task: PlanningTask) -> Optional[PlanningResult]:
             problem=planning_task.problem,
             num_plans=planning_task.num_plans,
             quality_bound=planning_task.quality_bound,
+            timeout=planning_task.timeout,
         )
     )
 
 
+@planner_exception_handler
+def get_plan_topk(planning_task: PlanningTask) -> Optional[PlanningResult]:
+    planning_result = planning_result_cache.get_planning_result(
+        "topk", planning_task
+    )
+    if planning_result is not None:
+        return planning_result
+
+    planning_result = compute_plan_topk(planning_task)
+    planning_result_cache.add_planning_result(
+        "topk", planning_task, planning_result
+    )
+    return planning_result
+
+
 @planner_exception_handler  # type: ignore
 def get_landmarks_by_landmark_category(
     planning_task: PlanningTask, landmark_category: str
 ) -> List[Landmark]:
-    return get_landmarks(
+    return landmark_cache.get_landmarks(
         landmark_category,
         planning_task.domain,
         planning_task.problem,
     )
 
 
+def get_native_plan_graph(
+    planning_task: PlanningTask, planning_results: PlanningResult
+) -> Optional[NativePlanGraph]:
+    """
+    returns the plan graph built without forbiditerative, or None when the
+    grounded task is not supported or the plans cannot be replayed in it
+    """
+    try:
+        with observe_stage(
+            "native_plan_graph", num_plans=len(planning_results.plans)
+        ) as span:
+            native_plan_graph = build_native_plan_graph(
+                get_sas_task(planning_task.domain, planning_task.problem),
+                planning_results.plans,
+            )
+            span.set_attributes(
+                num_nodes=native_plan_graph.graph.number_of_nodes(),
+                num_edges=native_plan_graph.graph.number_of_edges(),
+            )
+        return native_plan_graph
+    except ValueError as e:
+        logger.warning(
+            "building the plan graph with forbiditerative instead: %s", e
+        )
+        return None
+
+
 @planner_exception_handler  # type: ignore
 def get_dot_graph_str(
-    planning_task: PlanningTask, planning_results: PlanningResult
+    planning_task: PlanningTask,
+    planning_results: PlanningResult,
+    backend: Optional[str] = None,
 ) -> str:
+    if (backend or PLAN_GRAPH_BACKEND) == PlanGraphBackend.NATIVE.value:
+        native_plan_graph = get_native_plan_graph(
+            planning_task, planning_results
+        )
+        if native_plan_graph is not None:
+            return get_dot_str(native_plan_graph.graph)
     dot_graph_str: str = get_plans_dot(
         planning_task.domain,
         planning_task.problem,
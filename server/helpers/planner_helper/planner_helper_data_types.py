@@ -69,6 +69,11 @@ class LandmarkCategory(Enum):
     ZG = "zg"
 
 
+class PlanGraphBackend(Enum):
+    FORBIDITERATIVE = "forbiditerative"
+    NATIVE = "native"
+
+
 class ChoiceInfo(BaseModel):
     landmark: Optional[Landmark] = None  # landmark
     # the maximum number of plans included in a first achiever
@@ -156,6 +161,50 @@ class PlanDisambiguatorOutput(BaseModel):
         return list(map(lambda plan: plan.cost, self.plans))
 
 
+class CompactChoiceInfo(BaseModel):
+    landmark: Optional[Landmark] = None
+    max_num_plans: int = 0
+    # plan masks of first-achievers (or edges) available for the next choice
+    action_name_plan_mask: Dict[str, str] = dict()
+    nodes_with_multiple_out_edges: List[str] = []
+    is_available_for_choice: bool = True
+    distance_to_init: int = sys.maxsize
+    distance_to_end: int = sys.maxsize
+
+
+class CompactPlanDisambiguatorOutput(BaseModel):
+    """
+    PlanDisambiguatorOutput where sets of plans are plan masks, i.e., hex
+    strings whose i-th bit is set if plans[i] is in the set; nodes and links
+    of networkx_graph carry the plan masks instead of the node and edge maps
+    """
+
+    plans: List[Plan] = []
+    choice_infos: List[CompactChoiceInfo] = []
+    networkx_graph: Dict[str, Any] = {}
+    first_achiever_edge_dict: Dict[str, Any] = {}
+
+
+class PlanDisambiguatorViewsInput(PlanDisambiguatorInput):
+    views: List[PlanDisambiguationView] = [
+        PlanDisambiguationView.SELECT,
+        PlanDisambiguationView.BUILD_FORWARD,
+        PlanDisambiguationView.BUILD_BACKWARD,
+    ]
+
+
+class PlanDisambiguatorViewsOutput(BaseModel):
+    select: Optional[PlanDisambiguatorOutput] = None
+    build_forward: Optional[PlanDisambiguatorOutput] = None
+    build_backward: Optional[PlanDisambiguatorOutput] = None
+
+
+class CompactPlanDisambiguatorViewsOutput(BaseModel):
+    select: Optional[CompactPlanDisambiguatorOutput] = None
+    build_forward: Optional[CompactPlanDisambiguatorOutput] = None
+    build_backward: Optional[CompactPlanDisambiguatorOutput] = None
+
+
 class LemmingTask(BaseModel):
     planning_task: PlanningTask
     plans: List[Plan] = []
@@ -0,0 +1,175 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+from server.helpers.common_helper.cache_helper import CacheStats, LRUCache
+from server.helpers.common_helper.config_helper import get_env_int
+from server.helpers.common_helper.hash_helper import get_task_fingerprint
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanningTask,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+PLANNING_RESULT_CACHE_MAX_NUM = get_env_int(
+    "LEMMING_PLANNING_RESULT_CACHE_MAX_NUM", 64
+)
+PLANNING_RESULT_CACHE_MEMORY_BUDGET = get_env_int(
+    "LEMMING_PLANNING_RESULT_CACHE_MEMORY_BUDGET", 64 * 1024 * 1024
+)
+QUALITY_BOUND_TOLERANCE = 1e-9
+
+
+class PlanningResultCacheEntry(NamedTuple):
+    num_plans: int
+    quality_bound: float
+    plans: List[Plan]  # sorted by cost
+    # True if the planner found fewer plans than requested, i.e. all plans
+    # within the quality bound
+    is_exhaustive: bool
+
+
+def get_planning_result_cache_entries_size(
+    entries: List[PlanningResultCacheEntry],
+) -> int:
+    return sum(
+        sum(len(action) for action in plan.actions) + 32
+        for entry in entries
+        for plan in entry.plans
+    )
+
+
+def get_plans_within_quality_bound(
+    plans: List[Plan], quality_bound: float
+) -> List[Plan]:
+    """
+    returns plans sorted by cost whose costs are within a bound relative to
+    the cost of the cheapest plan
+    """
+    if len(plans) == 0:
+        return []
+    cost_bound = min(plan.cost for plan in plans) * quality_bound
+    return [
+        plan
+        for plan in plans
+        if plan.cost <= cost_bound + QUALITY_BOUND_TOLERANCE
+    ]
+
+
+def get_plans_from_cache_entry(
+    entry: PlanningResultCacheEntry, num_plans: int, quality_bound: float
+) -> Optional[List[Plan]]:
+    """
+    returns the plans of a top-k/top-q request answered by an earlier run, or
+    None if the earlier run does not cover the request
+    """
+    if quality_bound > entry.quality_bound + QUALITY_BOUND_TOLERANCE:
+        return None
+    plans = get_plans_within_quality_bound(entry.plans, quality_bound)
+    if not entry.is_exhaustive and len(plans) < num_plans:
+        return None
+    return plans[:num_plans]
+
+
+def is_cache_entry_covered(
+    entry: PlanningResultCacheEntry, new_entry: PlanningResultCacheEntry
+) -> bool:
+    if entry.quality_bound > new_entry.quality_bound + QUALITY_BOUND_TOLERANCE:
+        return False
+    return new_entry.is_exhaustive or (
+        entry.quality_bound >= new_entry.quality_bound - QUALITY_BOUND_TOLERANCE
+        and entry.num_plans <= new_entry.num_plans
+    )
+
+
+class PlanningResultCache:
+    """
+    keeps top-k/top-q planning results by planner and planning task, and
+    answers requests for fewer plans or a tighter quality bound without
+    calling a planner
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = PLANNING_RESULT_CACHE_MAX_NUM,
+        memory_budget: Optional[int] = PLANNING_RESULT_CACHE_MEMORY_BUDGET,
+    ) -> None:
+        self._entries: LRUCache[
+            Tuple[str, str], List[PlanningResultCacheEntry]
+        ] = LRUCache(
+            name="planning_result",
+            max_entries=max_entries,
+            max_size=memory_budget,
+            get_size=get_planning_result_cache_entries_size,
+        )
+        # requests answered from the cache, unlike lookups of the entries
+        self.hits = 0
+        self.misses = 0
+
+    def get_planning_result(
+        self, planner_name: str, planning_task: PlanningTask
+    ) -> Optional[PlanningResult]:
+        entries = self._entries.get(self._get_key(planner_name, planning_task))
+        for entry in entries or []:
+            plans = get_plans_from_cache_entry(
+                entry, planning_task.num_plans, planning_task.quality_bound
+            )
+            if plans is not None:
+                self.hits += 1
+                return PlanningResult(
+                    plans=[plan.model_copy() for plan in plans],
+                    planner_name=planner_name,
+                )
+        self.misses += 1
+        return None
+
+    def add_planning_result(
+        self,
+        planner_name: str,
+        planning_task: PlanningTask,
+        planning_result: PlanningResult,
+    ) -> None:
+        if len(planning_result.plans) == 0:
+            return  # the planner may have failed, which is not worth keeping
+        new_entry = PlanningResultCacheEntry(
+            num_plans=planning_task.num_plans,
+            quality_bound=planning_task.quality_bound,
+            plans=sorted(
+                [plan.model_copy() for plan in planning_result.plans],
+                key=lambda plan: plan.cost,
+            ),
+            # a run stopped by a time limit may have missed plans
+            is_exhaustive=(
+                planning_task.timeout is None
+                and len(planning_result.plans) < planning_task.num_plans
+            ),
+        )
+        key = self._get_key(planner_name, planning_task)
+        entries = self._entries.get(key) or []
+        self._entries.put(
+            key,
+            [
+                entry
+                for entry in entries
+                if not is_cache_entry_covered(entry, new_entry)
+            ]
+            + [new_entry],
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> CacheStats:
+        stats = self._entries.get_stats()
+        stats.hits = self.hits
+        stats.misses = self.misses
+        return stats
+
+    @staticmethod
+    def _get_key(
+        planner_name: str, planning_task: PlanningTask
+    ) -> Tuple[str, str]:
+        return (
+            planner_name,
+            get_task_fingerprint(planning_task.domain, planning_task.problem),
+        )
+
+
+planning_result_cache = PlanningResultCache()
@@ -0,0 +1,176 @@
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from server.helpers.common_helper.cache_helper import CacheStats, LRUCache
+from server.helpers.common_helper.config_helper import get_env_int
+from server.helpers.common_helper.hash_helper import get_task_fingerprint
+from server.planners.drivers.translator_driver import get_sas_task_str
+
+SAS_TASK_CACHE_MAX_NUM = get_env_int("LEMMING_SAS_TASK_CACHE_MAX_NUM", 64)
+SAS_TASK_CACHE_MEMORY_BUDGET = get_env_int(
+    "LEMMING_SAS_TASK_CACHE_MEMORY_BUDGET", 64 * 1024 * 1024
+)
+SAS_VERSION = "3"
+
+Fact = Tuple[int, int]  # a variable and one of its values
+
+
+class SASEffect(NamedTuple):
+    conditions: Tuple[Fact, ...]
+    var: int
+    value: int
+
+
+class SASOperator(NamedTuple):
+    name: str
+    preconditions: Tuple[Fact, ...]
+    effects: Tuple[SASEffect, ...]
+
+
+class SASTask(NamedTuple):
+    """
+    a grounded planning task, which is shared between requests and must not be
+    modified
+    """
+
+    value_names: List[List[str]]
+    initial_state: Tuple[int, ...]
+    goal: Tuple[Fact, ...]
+    operators: Dict[str, SASOperator]  # by normalized operator name
+    num_axioms: int
+    size: int
+
+
+def get_normalized_operator_name(name: str) -> str:
+    """
+    returns an operator or plan action name without parentheses, letter case
+    and layout, e.g., "pick ball1 rooma left" for "(PICK ball1  rooma left)"
+    """
+    return " ".join(name.strip().strip("()").lower().split())
+
+
+class SASReader:
+    def __init__(self, sas_task_str: str) -> None:
+        self._lines: Iterator[str] = iter(sas_task_str.splitlines())
+
+    def read_line(self) -> str:
+        try:
+            return next(self._lines)
+        except StopIteration:
+            raise ValueError("unexpected end of SAS task")
+
+    def read_int(self) -> int:
+        return int(self.read_line())
+
+    def read_fact(self) -> Fact:
+        var, value = self.read_line().split()
+        return int(var), int(value)
+
+    def read_facts(self) -> Tuple[Fact, ...]:
+        return tuple(self.read_fact() for _ in range(self.read_int()))
+
+    def expect(self, line: str) -> None:
+        read_line = self.read_line()
+        if read_line != line:
+            raise ValueError(f"expected {line} in SAS task, got {read_line}")
+
+
+def parse_sas_operator(reader: SASReader) -> SASOperator:
+    reader.expect("begin_operator")
+    name = reader.read_line()
+    preconditions = list(reader.read_facts())
+    effects: List[SASEffect] = list()
+    for _ in range(reader.read_int()):
+        numbers = [int(number) for number in reader.read_line().split()]
+        num_conditions = numbers[0]
+        conditions = tuple(
+            (numbers[1 + 2 * i], numbers[2 + 2 * i])
+            for i in range(num_conditions)
+        )
+        var, pre, post = numbers[1 + 2 * num_conditions :]
+        if pre != -1:
+            preconditions.append((var, pre))
+        effects.append(SASEffect(conditions=conditions, var=var, value=post))
+    reader.read_line()  # cost
+    reader.expect("end_operator")
+    return SASOperator(
+        name=name, preconditions=tuple(preconditions), effects=tuple(effects)
+    )
+
+
+def parse_sas_task_str(sas_task_str: str) -> SASTask:
+    """
+    returns the grounded task of a SAS file written by the translator; raises
+    ValueError on other files
+    """
+    reader = SASReader(sas_task_str)
+    reader.expect("begin_version")
+    version = reader.read_line()
+    if version != SAS_VERSION:
+        raise ValueError(f"unsupported SAS version {version}")
+    reader.expect("end_version")
+    reader.expect("begin_metric")
+    reader.read_line()
+    reader.expect("end_metric")
+
+    value_names: List[List[str]] = list()
+    for _ in range(reader.read_int()):
+        reader.expect("begin_variable")
+        reader.read_line()  # name
+        reader.read_line()  # axiom layer
+        value_names.append(
+            [reader.read_line() for _ in range(reader.read_int())]
+        )
+        reader.expect("end_variable")
+
+    for _ in range(reader.read_int()):
+        reader.expect("begin_mutex_group")
+        reader.read_facts()
+        reader.expect("end_mutex_group")
+
+    reader.expect("begin_state")
+    initial_state = tuple(reader.read_int() for _ in value_names)
+    reader.expect("end_state")
+    reader.expect("begin_goal")
+    goal = reader.read_facts()
+    reader.expect("end_goal")
+
+    operators: Dict[str, SASOperator] = dict()
+    for _ in range(reader.read_int()):
+        operator = parse_sas_operator(reader)
+        operators.setdefault(
+            get_normalized_operator_name(operator.name), operator
+        )
+
+    return SASTask(
+        value_names=value_names,
+        initial_state=initial_state,
+        goal=goal,
+        operators=operators,
+        num_axioms=reader.read_int(),
+        size=len(sas_task_str),
+    )
+
+
+sas_task_cache: LRUCache[str, SASTask] = LRUCache(
+    name="sas_task",
+    max_entries=SAS_TASK_CACHE_MAX_NUM,
+    max_size=SAS_TASK_CACHE_MEMORY_BUDGET,
+    get_size=lambda sas_task: 2 * sas_task.size,
+)
+
+
+def get_sas_task(domain: str, problem: str) -> SASTask:
+    """
+    returns the grounded task of a domain and problem, translated only once
+    for the same task
+    """
+    key = get_task_fingerprint(domain, problem)
+    sas_task = sas_task_cache.get(key)
+    if sas_task is None:
+        sas_task = parse_sas_task_str(get_sas_task_str(domain, problem))
+        sas_task_cache.put(key, sas_task)
+    return sas_task
+
+
+def get_sas_task_cache_stats() -> CacheStats:
+    return sas_task_cache.get_stats()
@@ -0,0 +1,272 @@
+import cProfile
+import functools
+import hmac
+import inspect
+import io
+import marshal
+import pstats
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from server.helpers.common_helper.config_helper import get_env_int, get_env_str
+from server.helpers.profile_helper.profile_helper_data_types import ProfileInfo
+
+# profiling is disabled unless a token is set; clients send it in the header
+# or the query parameter below
+PROFILING_TOKEN = get_env_str("LEMMING_PROFILING_TOKEN")
+PROFILE_MAX_NUM = get_env_int("LEMMING_PROFILE_MAX_NUM", 16)
+PROFILE_HEADER = "X-Lemming-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Lemming-Profile-Id"
+# collapsed stacks are cut at this depth and calls below this time dropped
+COLLAPSED_STACK_MAX_DEPTH = 64
+COLLAPSED_STACK_MIN_TIME = 1e-6
+
+# (filename, line number, function name) as in pstats
+Function = Tuple[str, int, str]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def is_profiling_authorized(
+    token: Optional[str], profiling_token: Optional[str] = PROFILING_TOKEN
+) -> bool:
+    if token is None or profiling_token is None:
+        return False
+    return hmac.compare_digest(token.encode(), profiling_token.encode())
+
+
+def get_function_label(function: Function) -> str:
+    filename, line_number, function_name = function
+    if filename == "~":  # built-in functions
+        label = function_name
+    else:
+        label = f"{Path(filename).name}:{function_name}:{line_number}"
+    return label.replace(";", ",").replace(" ", "_")
+
+
+def get_collapsed_stacks(stats: Dict[Function, Any]) -> Dict[str, int]:
+    """
+    returns the self time in microseconds of call stacks in the collapsed
+    stack format of flame graphs; cProfile only records callers, so the time
+    of a function is split among its callers by the time spent in each call
+    """
+    callees: Dict[Function, Dict[Function, float]] = dict()
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative_time) in callers.items():
+            callees.setdefault(caller, dict())[function] = cumulative_time
+    collapsed_stacks: Dict[str, int] = dict()
+
+    def add_stacks(
+        function: Function, fraction: float, stack: List[str]
+    ) -> None:
+        stack = stack + [get_function_label(function)]
+        self_time = int(stats[function][2] * fraction * 1e6)
+        if self_time > 0:
+            collapsed_stack = ";".join(stack)
+            collapsed_stacks[collapsed_stack] = (
+                collapsed_stacks.get(collapsed_stack, 0) + self_time
+            )
+        if len(stack) >= COLLAPSED_STACK_MAX_DEPTH:
+            return
+        for callee, cumulative_time in callees.get(function, dict()).items():
+            total_time = stats[callee][3]
+            if (
+                callee == function
+                or get_function_label(callee) in stack
+                or total_time <= 0
+                or cumulative_time * fraction < COLLAPSED_STACK_MIN_TIME
+            ):
+                continue  # recursive calls are counted in their first frame
+            add_stacks(callee, fraction * cumulative_time / total_time, stack)
+
+    for function, (_, _, _, _, callers) in stats.items():
+        if len(callers) == 0:
+            add_stacks(function, 1.0, [])
+    return collapsed_stacks
+
+
+class Profile:
+    def __init__(
+        self,
+        endpoint: str,
+        stats: Dict[Function, Any],
+        duration: float,
+    ) -> None:
+        self.profile_id = str(uuid.uuid4())
+        self.endpoint = endpoint
+        self.stats = stats
+        self.duration = duration
+        self.created_at = time.time()
+
+    def get_profile_info(self) -> ProfileInfo:
+        return ProfileInfo(
+            profile_id=self.profile_id,
+            endpoint=self.endpoint,
+            created_at=self.created_at,
+            duration=self.duration,
+            num_calls=sum(item[1] for item in self.stats.values()),
+        )
+
+    def get_pstats(self) -> bytes:
+        """
+        returns the profile in the format of cProfile.Profile.dump_stats,
+        which pstats.Stats, snakeviz and similar tools read
+        """
+        return marshal.dumps(self.stats)
+
+    def get_collapsed_stacks(self) -> str:
+        return "".join(
+            f"{collapsed_stack} {self_time}\n"
+            for collapsed_stack, self_time in sorted(
+                get_collapsed_stacks(self.stats).items()
+            )
+        )
+
+    def get_text(self, num_lines: int = 50) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(_StatsSource(dict(self.stats)), stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(num_lines)
+        return stream.getvalue()
+
+
+class _StatsSource(cProfile.Profile):
+    """
+    passes recorded stats to pstats.Stats, which loads them from a profiler
+    with create_stats and stats
+    """
+
+    def __init__(self, stats: Dict[Function, Any]) -> None:
+        super().__init__()
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class ProfileStore:
+    """
+    keeps the latest profiles, dropping the oldest one when full
+    """
+
+    def __init__(self, max_profiles: int = PROFILE_MAX_NUM) -> None:
+        self._profiles: Deque[Profile] = deque(maxlen=max(1, max_profiles))
+        self._lock = threading.Lock()
+
+    def add_profile(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get_profile(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile.profile_id == profile_id:
+                    return profile
+        return None
+
+    def get_profile_infos(self) -> List[ProfileInfo]:
+        with self._lock:
+            profiles = list(self._profiles)
+        return [profile.get_profile_info() for profile in reversed(profiles)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+profile_store = ProfileStore()
+
+
+class ProfileRequest:
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.profile_id: Optional[str] = None
+
+
+_profile_request: ContextVar[Optional[ProfileRequest]] = ContextVar(
+    "profile_request", default=None
+)
+# cProfile cannot profile two calls at the same time in recent Python versions,
+# so a request that arrives while another is profiled runs without profiling
+_profiler_lock = threading.Lock()
+
+
+@contextmanager
+def requested_profile(endpoint: str) -> Iterator[ProfileRequest]:
+    """
+    marks the current request to be profiled by the endpoints decorated with
+    profiled
+    """
+    profile_request = ProfileRequest(endpoint)
+    token = _profile_request.set(profile_request)
+    try:
+        yield profile_request
+    finally:
+        _profile_request.reset(token)
+
+
+def is_profiling() -> bool:
+    return _profile_request.get() is not None
+
+
+@contextmanager
+def run_profiler(profile_request: Optional[ProfileRequest]) -> Iterator[None]:
+    if profile_request is None or not _profiler_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    start_time = time.perf_counter()
+    try:
+        profiler.enable()
+        yield
+    finally:
+        profiler.disable()
+        _profiler_lock.release()
+        # requests that fail are profiled as well
+        profiler.create_stats()
+        profile = Profile(
+            profile_request.endpoint,
+            profiler.stats,
+            time.perf_counter() - start_time,
+        )
+        profile_store.add_profile(profile)
+        profile_request.profile_id = profile.profile_id
+
+
+def profiled(function: F) -> F:
+    """
+    runs an endpoint under cProfile when its request asks for a profile; the
+    profile of a coroutine also includes other requests served meanwhile
+    """
+    if inspect.iscoroutinefunction(function):
+
+        @functools.wraps(function)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with run_profiler(_profile_request.get()):
+                return await function(*args, **kwargs)
+
+        return cast(F, async_wrapper)
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with run_profiler(_profile_request.get()):
+            return function(*args, **kwargs)
+
+    return cast(F, wrapper)
@@ -0,0 +1,16 @@
+from enum import Enum
+from pydantic import BaseModel
+
+
+class ProfileFormat(Enum):
+    PSTATS = "pstats"
+    COLLAPSED = "collapsed"
+    TEXT = "text"
+
+
+class ProfileInfo(BaseModel):
+    profile_id: str
+    endpoint: str
+    created_at: float
+    duration: float
+    num_calls: int
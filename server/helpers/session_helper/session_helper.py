@@ -0,0 +1,286 @@
+import functools
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from server.helpers.common_helper.cache_helper import CacheStats, LRUCache
+from server.helpers.common_helper.config_helper import (
+    get_env_float,
+    get_env_int,
+)
+from server.helpers.common_helper.exception_handler import (
+    planner_exception_handler,
+)
+from server.helpers.graph_helper.plan_graph_cache_helper import (
+    PlanGraph,
+    get_plan_graph,
+    get_plan_graph_size,
+)
+from server.helpers.plan_disambiguator_helper.build_flow_helper import (
+    get_build_flow_output,
+)
+from server.helpers.plan_disambiguator_helper.selection_flow_helper import (
+    get_selection_flow_output,
+)
+from server.helpers.planner_helper.landmark_cache_helper import (
+    get_landmarks_size,
+)
+from server.helpers.planner_helper.plan_store_helper import (
+    PLAN_HASH_SIZE,
+    get_plans_size,
+)
+from server.helpers.planner_helper.planner_helper_data_types import (
+    Landmark,
+    PlanDisambiguationView,
+    PlanDisambiguatorInput,
+    PlanDisambiguatorOutput,
+    SelectionInfo,
+)
+from server.helpers.session_helper.session_helper_data_types import SessionInfo
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+SESSION_TTL = get_env_float("LEMMING_SESSION_TTL", 1800.0)
+SESSION_MAX_NUM = get_env_int("LEMMING_SESSION_MAX_NUM", 256)
+SESSION_MEMORY_BUDGET = get_env_int(
+    "LEMMING_SESSION_MEMORY_BUDGET", 256 * 1024 * 1024
+)
+
+
+def get_plan_disambiguator_output_size(
+    plan_disambiguator_output: PlanDisambiguatorOutput,
+) -> int:
+    """
+    returns an estimate of the number of bytes held by an output, which is
+    dominated by the plan hashes repeated in nodes, edges and choices
+    """
+    num_plan_hashes = sum(
+        len(plan_hashes)
+        for plan_hashes in plan_disambiguator_output.node_plan_hashes_dict.values()
+    ) + sum(
+        len(plan_hashes)
+        for plan_hashes in plan_disambiguator_output.edge_plan_hashes_dict.values()
+    )
+    for choice_info in plan_disambiguator_output.choice_infos:
+        num_plan_hashes += sum(
+            len(plan_hashes)
+            for plan_hashes in choice_info.action_name_plan_hash_map.values()
+        )
+    num_plan_hashes *= 2  # node attributes of networkx_graph
+    return num_plan_hashes * PLAN_HASH_SIZE + get_plans_size(
+        plan_disambiguator_output.plans
+    )
+
+
+def get_plan_disambiguator_output_by_view(
+    selection_infos: List[SelectionInfo],
+    landmarks: List[Landmark],
+    domain: str,
+    problem: str,
+    plans: List[Plan],
+    selection_priority: Optional[str],
+    plan_disambiguator_view: PlanDisambiguationView,
+    all_plans_graph: Optional[PlanGraph] = None,
+) -> Optional[PlanDisambiguatorOutput]:
+    if plan_disambiguator_view == PlanDisambiguationView.SELECT:
+        result = get_selection_flow_output(
+            selection_infos,
+            landmarks,
+            domain,
+            problem,
+            plans,
+            selection_priority,
+            all_plans_graph,
+        )
+    else:
+        result = get_build_flow_output(
+            selection_infos,
+            landmarks,
+            domain,
+            problem,
+            plans,
+            plan_disambiguator_view == PlanDisambiguationView.BUILD_FORWARD,
+            all_plans_graph,
+        )
+    return None if result is None else result[0]
+
+
+@planner_exception_handler  # type: ignore
+def get_all_plans_graph(
+    domain: str, problem: str, plans: List[Plan]
+) -> Optional[PlanGraph]:
+    return get_plan_graph(domain, problem, plans)
+
+
+class PlanDisambiguationSession:
+    """
+    server-side state of a plan disambiguation, so that a client only sends
+    its latest selection instead of the whole PlanDisambiguatorInput
+    """
+
+    def __init__(
+        self, session_id: str, plan_disambiguator_input: PlanDisambiguatorInput
+    ) -> None:
+        self.session_id = session_id
+        self.domain = plan_disambiguator_input.domain
+        self.problem = plan_disambiguator_input.problem
+        # hashes are set once here instead of on every request
+        self.plans = PlanningResult(plans=plan_disambiguator_input.plans).plans
+        self.landmarks = plan_disambiguator_input.landmarks
+        self.selection_priority = plan_disambiguator_input.selection_priority
+        self.selection_infos: List[SelectionInfo] = list(
+            plan_disambiguator_input.selection_infos
+        )
+        # the plan graph of all plans with their plan store and indexes, kept
+        # for the lifetime of the session once the first output is computed
+        self.plan_graph: Optional[PlanGraph] = None
+        # called whenever the size of the session changes
+        self.on_resize: Optional[Callable[[], None]] = None
+        self.lock = threading.Lock()
+        # outputs already computed, by the number of selections and a view
+        self._outputs: Dict[
+            Tuple[int, PlanDisambiguationView], PlanDisambiguatorOutput
+        ] = dict()
+        self._base_size = (
+            len(self.domain)
+            + len(self.problem)
+            + get_landmarks_size(self.landmarks)
+        )
+        # the size of the plans and of their plan graph once it is built
+        self._plans_size = get_plans_size(self.plans)
+        self._outputs_size = 0
+
+    def get_size(self) -> int:
+        return (
+            self._base_size
+            + self._plans_size
+            + self._outputs_size
+            + sum(
+                len(selection_info.selected_plan_hashes) * PLAN_HASH_SIZE
+                for selection_info in self.selection_infos
+            )
+        )
+
+    def get_session_info(self) -> SessionInfo:
+        return SessionInfo(
+            session_id=self.session_id,
+            num_plans=len(self.plans),
+            num_landmarks=len(self.landmarks),
+            num_selections=len(self.selection_infos),
+            selection_priority=self.selection_priority,
+        )
+
+    def get_plan_graph(self) -> Optional[PlanGraph]:
+        """
+        returns the plan graph of all plans of the session, which is built or
+        looked up in the plan graph cache only once
+        """
+        if self.plan_graph is None:
+            self.plan_graph = get_all_plans_graph(
+                self.domain, self.problem, self.plans
+            )
+            if self.plan_graph is not None:
+                self._plans_size += get_plan_graph_size(self.plan_graph)
+        return self.plan_graph
+
+    def get_output(
+        self, plan_disambiguator_view: PlanDisambiguationView
+    ) -> Optional[PlanDisambiguatorOutput]:
+        key = (len(self.selection_infos), plan_disambiguator_view)
+        if key in self._outputs:
+            return self._outputs[key]
+
+        plan_disambiguator_output = get_plan_disambiguator_output_by_view(
+            self.selection_infos,
+            self.landmarks,
+            self.domain,
+            self.problem,
+            self.plans,
+            self.selection_priority,
+            plan_disambiguator_view,
+            self.get_plan_graph(),
+        )
+        if plan_disambiguator_output is not None:
+            self._outputs[key] = plan_disambiguator_output
+            self._outputs_size += get_plan_disambiguator_output_size(
+                plan_disambiguator_output
+            )
+        # the plan graph may have been built as well
+        self._resize()
+        return plan_disambiguator_output
+
+    def add_selection_info(self, selection_info: SelectionInfo) -> None:
+        # outputs of selections that were undone are stale from now on
+        self._remove_outputs_after(len(self.selection_infos))
+        self.selection_infos.append(selection_info)
+        self._resize()
+
+    def undo_selection_info(self) -> None:
+        if len(self.selection_infos) > 0:
+            self.selection_infos.pop()
+            self._resize()
+
+    def reset_selection_infos(self) -> None:
+        self.selection_infos = []
+        self._resize()
+
+    def _resize(self) -> None:
+        if self.on_resize is not None:
+            self.on_resize()
+
+    def _remove_outputs_after(self, num_selections: int) -> None:
+        for key in list(self._outputs.keys()):
+            if key[0] > num_selections:
+                self._outputs_size -= get_plan_disambiguator_output_size(
+                    self._outputs.pop(key)
+                )
+
+
+class SessionStore:
+    """
+    a table of plan disambiguation sessions evicted by least recent use, idle
+    time and the total memory they hold
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = SESSION_MAX_NUM,
+        memory_budget: Optional[int] = SESSION_MEMORY_BUDGET,
+        ttl: Optional[float] = SESSION_TTL,
+    ) -> None:
+        self._sessions: LRUCache[str, PlanDisambiguationSession] = LRUCache(
+            name="session",
+            max_entries=max_sessions,
+            max_size=memory_budget,
+            ttl=ttl,
+            get_size=lambda session: session.get_size(),
+        )
+
+    def create_session(
+        self, plan_disambiguator_input: PlanDisambiguatorInput
+    ) -> PlanDisambiguationSession:
+        session = PlanDisambiguationSession(
+            uuid.uuid4().hex, plan_disambiguator_input
+        )
+        # the session is charged to the memory budget as it grows
+        session.on_resize = functools.partial(
+            self._sessions.resize, session.session_id
+        )
+        if not self._sessions.put(session.session_id, session):
+            raise HTTPException(status_code=413, detail="Payload Too Large")
+        return session
+
+    def get_session(
+        self, session_id: str
+    ) -> Optional[PlanDisambiguationSession]:
+        return self._sessions.get(session_id)
+
+    def delete_session(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id) is not None
+
+    def get_stats(self) -> CacheStats:
+        return self._sessions.get_stats()
+
+
+session_store = SessionStore()
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SessionInfo(BaseModel):
+    session_id: str
+    num_plans: int = 0
+    num_landmarks: int = 0
+    num_selections: int = 0
+    selection_priority: Optional[str] = None
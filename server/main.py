@@ -1,14 +1,69 @@
 import json
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Dict, Optional, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Union,
+    cast,
+)
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import (
+    FastAPI,
+    File,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
 
+from server.helpers.catalog_helper.catalog_helper import (
+    CATALOG_WARM_UP,
+    domain_catalog,
+    get_domain_file_paths,
+)
+from server.helpers.catalog_helper.catalog_helper_data_types import (
+    DomainCatalogInfo,
+)
+from server.helpers.common_helper.executor_helper import planner_executor
 from server.helpers.common_helper.file_helper import (
     read_str_from_upload_file,
 )
+from server.helpers.common_helper.metrics_helper import (
+    get_route_name,
+    metrics_registry,
+    request_latency,
+    response_size,
+)
+from server.helpers.common_helper.response_cache_helper import (
+    get_request_fingerprint,
+    response_cache,
+)
 from server.helpers.common_helper.static_data_helper import app_description
+from server.helpers.common_helper.trace_helper import tracer
+from server.helpers.common_helper.str_helper import get_server_sent_event
+from server.helpers.job_helper.job_helper import (
+    PlanningJob,
+    planning_job_manager,
+)
+from server.helpers.job_helper.job_helper_data_types import (
+    PlanningJobInfo,
+    PlanningJobPlanner,
+)
 from server.helpers.nl2plan_helper.ltl2plan_helper import (
     compile_instance,
     get_goal_formula,
@@ -26,9 +81,19 @@ from server.helpers.nl2plan_helper.utils import (
     temporary_directory,
     requires_optional,
 )
+from server.helpers.graph_helper.plan_graph_cache_helper import (
+    get_plan_graph_cache_stats,
+)
 from server.helpers.plan_disambiguator_helper.build_flow_helper import (
     get_build_flow_output,
 )
+from server.helpers.plan_disambiguator_helper.compact_output_helper import (
+    get_compact_plan_disambiguator_output,
+    get_compact_plan_disambiguator_views_output,
+)
+from server.helpers.plan_disambiguator_helper.multi_view_helper import (
+    get_plan_disambiguator_views_output,
+)
 from server.helpers.plan_disambiguator_helper.selection_flow_helper import (
     get_selection_flow_output,
 )
@@ -36,19 +101,54 @@ from server.helpers.planner_helper.planner_helper import (
     get_landmarks_by_landmark_category,
     get_plan_topk,
 )
+from server.helpers.planner_helper.landmark_cache_helper import (
+    landmark_cache,
+)
 from server.helpers.planner_helper.planner_helper_data_types import (
+    CompactPlanDisambiguatorOutput,
+    CompactPlanDisambiguatorViewsOutput,
     LemmingTask,
+    PlanDisambiguationView,
     PlanDisambiguatorInput,
     PlanDisambiguatorOutput,
+    PlanDisambiguatorViewsInput,
+    PlanDisambiguatorViewsOutput,
     PlanningTask,
+    SelectionInfo,
+    SelectionPriority,
     ToolCompiler,
     Plan,
     LTL2PDDLRequest,
 )
+from server.helpers.planner_helper.planning_result_cache_helper import (
+    planning_result_cache,
+)
+from server.helpers.planner_helper.sas_task_helper import (
+    get_sas_task_cache_stats,
+)
+from server.helpers.profile_helper.profile_helper import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    PROFILE_QUERY_PARAM,
+    is_profiling_authorized,
+    profile_store,
+    profiled,
+    requested_profile,
+)
+from server.helpers.profile_helper.profile_helper_data_types import (
+    ProfileFormat,
+    ProfileInfo,
+)
+from server.helpers.session_helper.session_helper import (
+    PlanDisambiguationSession,
+    session_store,
+)
+from server.helpers.session_helper.session_helper_data_types import SessionInfo
 from server.planners.drivers.landmark_driver_datatype import (
     LandmarksResponseModel,
 )
 from server.planners.drivers.planner_driver_datatype import PlanningResult
+from server.planners.symk import SymKPlanner
 
 try:
     from nl2ltl.declare.base import Template
@@ -57,7 +157,6 @@ try:
     from pddl.parser.domain import DomainParser
     from pddl.parser.problem import ProblemParser
     from pddl.formatter import domain_to_string, problem_to_string
-    from planners.symk import SymKPlanner
 
     is_nl2ltl_installed = True
 except ImportError:
@@ -66,7 +165,27 @@ except ImportError:
 
 FILEPATH = Path(__file__).parent.resolve()
 
+metrics_registry.register_cache("plan_graph", get_plan_graph_cache_stats)
+metrics_registry.register_cache("landmark", landmark_cache.get_stats)
+metrics_registry.register_cache(
+    "planning_result", planning_result_cache.get_stats
+)
+metrics_registry.register_cache("sas_task", get_sas_task_cache_stats)
+metrics_registry.register_cache("response", response_cache.get_stats)
+metrics_registry.register_cache("session", session_store.get_stats)
+metrics_registry.register_cache("planning_job", planning_job_manager.get_stats)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    domain_catalog.scan()
+    if CATALOG_WARM_UP:
+        domain_catalog.start_warm_up()
+    yield
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Lemming",
     description=app_description,
     version="0.0.1",
@@ -86,6 +205,50 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def observe_request(
+    request: "Request[Any]",
+    call_next: Callable[["Request[Any]"], Awaitable[Response]],
+) -> Response:
+    start_time = time.perf_counter()
+    with tracer.span("http_request", method=request.method) as span:
+        response = await call_next(request)
+        # route templates keep the number of label values bounded
+        route = request.scope.get("route")
+        endpoint = get_route_name(getattr(route, "path", None))
+        span.set_attributes(endpoint=endpoint, status=response.status_code)
+        request_latency.observe(
+            time.perf_counter() - start_time,
+            method=request.method,
+            endpoint=endpoint,
+            status=str(response.status_code),
+        )
+        content_length = response.headers.get("content-length")
+        if content_length is not None:
+            span.set_attribute("size", int(content_length))
+            response_size.observe(float(content_length), endpoint=endpoint)
+    return response
+
+
+@app.middleware("http")
+async def profile_request(
+    request: "Request[Any]",
+    call_next: Callable[["Request[Any]"], Awaitable[Response]],
+) -> Response:
+    token = request.headers.get(PROFILE_HEADER) or request.query_params.get(
+        PROFILE_QUERY_PARAM
+    )
+    if token is None:
+        return await call_next(request)
+    if not is_profiling_authorized(token):
+        return JSONResponse({"detail": "Forbidden"}, status_code=403)
+    with requested_profile(request.url.path) as requested:
+        response = await call_next(request)
+    if requested.profile_id is not None:
+        response.headers[PROFILE_ID_HEADER] = requested.profile_id
+    return response
+
+
 @app.get("/")
 async def hello_lemming() -> str:
     return "Hello Lemming!"
@@ -97,47 +260,106 @@ async def file_upload(file: UploadFile = File(...)) -> Optional[str]:
     return file_contents
 
 
-@app.post("/import_domain/{domain_name}")
-async def import_domain(domain_name: str) -> LemmingTask:
-    path_to_domain_file = Path.joinpath(
-        FILEPATH, f"data/{domain_name}/domain.pddl"
-    ).resolve()
-    path_to_problem_file = Path.joinpath(
-        FILEPATH, f"data/{domain_name}/problem.pddl"
-    ).resolve()
-    planning_task = PlanningTask(
-        domain=open(path_to_domain_file).read(),
-        problem=open(path_to_problem_file).read(),
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics_registry.get_text(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
     )
 
-    try:
-        path_to_plan_file = Path.joinpath(
-            FILEPATH, f"data/{domain_name}/plans.json"
-        ).resolve()
-
-        plans = json.load(open(path_to_plan_file))
-        plans = [Plan.model_validate(item) for item in plans]
-
-    except Exception as e:
-        print(e)
-        plans = []
-
-    try:
-        path_to_prompt_file = Path.joinpath(
-            FILEPATH, f"data/{domain_name}/prompt.json"
-        ).resolve()
-
-        prompt = json.load(open(path_to_prompt_file))
-        nl_prompts = [CachedPrompt.model_validate(item) for item in prompt]
 
-    except Exception as e:
-        print(e)
-        nl_prompts = []
-
-    new_lemming_task = LemmingTask(
-        planning_task=planning_task, plans=plans, nl_prompts=nl_prompts
+@app.get("/debug/profiles")
+def get_profile_infos(
+    x_lemming_profile: Optional[str] = Header(None),
+    profile: Optional[str] = None,
+) -> List[ProfileInfo]:
+    check_profiling_authorized(x_lemming_profile or profile)
+    return profile_store.get_profile_infos()
+
+
+@app.get("/debug/profiles/{profile_id}", response_class=Response)
+def get_profile(
+    profile_id: str,
+    format: ProfileFormat = ProfileFormat.PSTATS,
+    x_lemming_profile: Optional[str] = Header(None),
+    profile: Optional[str] = None,
+) -> Response:
+    check_profiling_authorized(x_lemming_profile or profile)
+    stored_profile = profile_store.get_profile(profile_id)
+    if stored_profile is None:
+        raise HTTPException(status_code=404, detail="Profile Not Found")
+    if format == ProfileFormat.PSTATS:
+        return Response(
+            content=stored_profile.get_pstats(),
+            media_type="application/octet-stream",
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="{profile_id}.pstats"'
+                )
+            },
+        )
+    if format == ProfileFormat.COLLAPSED:
+        return PlainTextResponse(stored_profile.get_collapsed_stacks())
+    return PlainTextResponse(stored_profile.get_text())
+
+
+def check_profiling_authorized(token: Optional[str]) -> None:
+    if not is_profiling_authorized(token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@app.get("/catalog")
+def get_catalog() -> DomainCatalogInfo:
+    return domain_catalog.get_catalog_info()
+
+
+@app.post("/import_domain/{domain_name}", response_model=LemmingTask)
+async def import_domain(domain_name: str) -> Response:
+    (
+        path_to_domain_file,
+        path_to_problem_file,
+        path_to_plan_file,
+        path_to_prompt_file,
+    ) = get_domain_file_paths(domain_catalog.data_dir, domain_name)
+
+    def get_lemming_task() -> LemmingTask:
+        lemming_task = domain_catalog.get_lemming_task(domain_name)
+        if lemming_task is not None:
+            return lemming_task
+
+        planning_task = PlanningTask(
+            domain=open(path_to_domain_file).read(),
+            problem=open(path_to_problem_file).read(),
+        )
+
+        try:
+            plans = json.load(open(path_to_plan_file))
+            plans = [Plan.model_validate(item) for item in plans]
+
+        except Exception as e:
+            print(e)
+            plans = []
+
+        try:
+            prompt = json.load(open(path_to_prompt_file))
+            nl_prompts = [CachedPrompt.model_validate(item) for item in prompt]
+
+        except Exception as e:
+            print(e)
+            nl_prompts = []
+
+        return LemmingTask(
+            planning_task=planning_task, plans=plans, nl_prompts=nl_prompts
+        )
+
+    return response_cache.get_response(
+        get_request_fingerprint(
+            "import_domain",
+            domain_name,
+            domain_catalog.get_fingerprint(domain_name),
+        ),
+        get_lemming_task,
     )
-    return new_lemming_task
 
 
 @app.post("/get_landmarks/{landmark_category}")
@@ -145,8 +367,8 @@ async def get_landmarks(
     landmark_category: str,
     planning_task: PlanningTask,
 ) -> LandmarksResponseModel:
-    landmarks = get_landmarks_by_landmark_category(
-        planning_task, landmark_category
+    landmarks = await planner_executor.run(
+        get_landmarks_by_landmark_category, planning_task, landmark_category
     )
 
     if landmarks is None:
@@ -157,7 +379,7 @@ async def get_landmarks(
 
 @app.post("/get_plans")
 async def get_plans(planning_task: PlanningTask) -> PlanningResult:
-    planning_result = get_plan_topk(planning_task)
+    planning_result = await planner_executor.run(get_plan_topk, planning_task)
 
     if planning_result is None:
         raise HTTPException(status_code=422, detail="Unprocessable Entity")
@@ -165,57 +387,302 @@ async def get_plans(planning_task: PlanningTask) -> PlanningResult:
     return planning_result
 
 
-@app.post("/generate_select_view")
+def get_plan_events(plans: Iterator[Plan]) -> Iterator[str]:
+    num_plans = 0
+    for plan in plans:
+        num_plans += 1
+        yield get_server_sent_event("plan", plan.model_dump_json())
+    yield get_server_sent_event("end", json.dumps({"num_plans": num_plans}))
+
+
+@app.post("/stream_plans")
+async def stream_plans(planning_task: PlanningTask) -> StreamingResponse:
+    symk_planner = SymKPlanner()
+    # the planner holds a slot of the planner executor while it streams
+    plans = planner_executor.iterate(symk_planner.stream_plans(planning_task))
+
+    return StreamingResponse(
+        get_plan_events(plans),
+        media_type="text/event-stream",
+    )
+
+
+def get_planning_job(job_id: str) -> PlanningJob:
+    job = planning_job_manager.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Planning Job Not Found")
+    return job
+
+
+@app.post("/planning_jobs", status_code=202)
+def submit_planning_job(
+    planning_task: PlanningTask,
+    planner: PlanningJobPlanner = PlanningJobPlanner.TOPK,
+) -> PlanningJobInfo:
+    job = planning_job_manager.submit_job(planning_task, planner)
+    return job.get_job_info()
+
+
+@app.get("/planning_jobs/{job_id}")
+def get_planning_job_info(job_id: str) -> PlanningJobInfo:
+    return get_planning_job(job_id).get_job_info()
+
+
+@app.delete("/planning_jobs/{job_id}")
+def cancel_planning_job(job_id: str) -> PlanningJobInfo:
+    job = get_planning_job(job_id)
+    planning_job_manager.cancel_job(job_id)
+    return job.get_job_info()
+
+
+def get_encoded_output(
+    plan_disambiguator_output: PlanDisambiguatorOutput, compact: bool
+) -> Union[PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput]:
+    if compact:
+        return get_compact_plan_disambiguator_output(plan_disambiguator_output)
+    return plan_disambiguator_output
+
+
+def get_selection_fingerprint(
+    endpoint: str,
+    plan_disambiguator_input: PlanDisambiguatorInput,
+    compact: bool,
+) -> Optional[str]:
+    """
+    returns the fingerprint of a selection request, or None for random
+    selections, whose responses are not reproducible
+    """
+    if (
+        plan_disambiguator_input.selection_priority
+        == SelectionPriority.RANDOM.value
+    ):
+        return None
+    return get_request_fingerprint(endpoint, plan_disambiguator_input, compact)
+
+
+@app.post(
+    "/generate_select_view",
+    response_model=Union[
+        PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput
+    ],
+)
+@profiled
 def generate_select_view(
     plan_disambiguator_input: PlanDisambiguatorInput,
-) -> PlanDisambiguatorOutput:
-    plan_disambiguator_output, _, _ = get_selection_flow_output(
-        plan_disambiguator_input.selection_infos,
-        plan_disambiguator_input.landmarks,
-        plan_disambiguator_input.domain,
-        plan_disambiguator_input.problem,
-        plan_disambiguator_input.plans,
-        plan_disambiguator_input.selection_priority,
+    compact: bool = False,
+) -> Response:
+    def get_output() -> (
+        Union[PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput]
+    ):
+        plan_disambiguator_output, _, _ = get_selection_flow_output(
+            plan_disambiguator_input.selection_infos,
+            plan_disambiguator_input.landmarks,
+            plan_disambiguator_input.domain,
+            plan_disambiguator_input.problem,
+            plan_disambiguator_input.plans,
+            plan_disambiguator_input.selection_priority,
+        )
+        return get_encoded_output(plan_disambiguator_output, compact)
+
+    return response_cache.get_response(
+        get_selection_fingerprint(
+            "generate_select_view", plan_disambiguator_input, compact
+        ),
+        get_output,
     )
-    return plan_disambiguator_output
 
 
-@app.post("/generate_build_forward")
-def generate_build_forward(
+def get_build_flow_response(
     plan_disambiguator_input: PlanDisambiguatorInput,
-) -> PlanDisambiguatorOutput:
-    plan_disambiguator_output, _, _ = get_build_flow_output(
-        plan_disambiguator_input.selection_infos,
-        plan_disambiguator_input.landmarks,
-        plan_disambiguator_input.domain,
-        plan_disambiguator_input.problem,
-        plan_disambiguator_input.plans,
-        True,
+    is_forward: bool,
+    compact: bool,
+) -> Response:
+    def get_output() -> (
+        Union[PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput]
+    ):
+        plan_disambiguator_output, _, _ = get_build_flow_output(
+            plan_disambiguator_input.selection_infos,
+            plan_disambiguator_input.landmarks,
+            plan_disambiguator_input.domain,
+            plan_disambiguator_input.problem,
+            plan_disambiguator_input.plans,
+            is_forward,
+        )
+        return get_encoded_output(plan_disambiguator_output, compact)
+
+    return response_cache.get_response(
+        get_request_fingerprint(
+            "generate_build_flow", plan_disambiguator_input, is_forward, compact
+        ),
+        get_output,
     )
-    return plan_disambiguator_output
 
 
-@app.post("/generate_build_backward")
+@app.post(
+    "/generate_build_forward",
+    response_model=Union[
+        PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput
+    ],
+)
+@profiled
+def generate_build_forward(
+    plan_disambiguator_input: PlanDisambiguatorInput,
+    compact: bool = False,
+) -> Response:
+    return get_build_flow_response(plan_disambiguator_input, True, compact)
+
+
+@app.post(
+    "/generate_build_backward",
+    response_model=Union[
+        PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput
+    ],
+)
+@profiled
 def generate_build_backward(
     plan_disambiguator_input: PlanDisambiguatorInput,
-) -> PlanDisambiguatorOutput:
-    plan_disambiguator_output, _, _ = get_build_flow_output(
-        plan_disambiguator_input.selection_infos,
-        plan_disambiguator_input.landmarks,
-        plan_disambiguator_input.domain,
-        plan_disambiguator_input.problem,
-        plan_disambiguator_input.plans,
-        False,
+    compact: bool = False,
+) -> Response:
+    return get_build_flow_response(plan_disambiguator_input, False, compact)
+
+
+@app.post(
+    "/generate_views",
+    response_model=Union[
+        PlanDisambiguatorViewsOutput, CompactPlanDisambiguatorViewsOutput
+    ],
+)
+@profiled
+def generate_views(
+    plan_disambiguator_views_input: PlanDisambiguatorViewsInput,
+    compact: bool = False,
+) -> Response:
+    def get_views_output() -> (
+        Union[PlanDisambiguatorViewsOutput, CompactPlanDisambiguatorViewsOutput]
+    ):
+        views_output: Optional[PlanDisambiguatorViewsOutput] = (
+            get_plan_disambiguator_views_output(
+                plan_disambiguator_views_input.selection_infos,
+                plan_disambiguator_views_input.landmarks,
+                plan_disambiguator_views_input.domain,
+                plan_disambiguator_views_input.problem,
+                plan_disambiguator_views_input.plans,
+                plan_disambiguator_views_input.selection_priority,
+                plan_disambiguator_views_input.views,
+            )
+        )
+        if views_output is None:
+            raise HTTPException(status_code=422, detail="Unprocessable Entity")
+        if compact:
+            return get_compact_plan_disambiguator_views_output(views_output)
+        return views_output
+
+    return response_cache.get_response(
+        get_selection_fingerprint(
+            "generate_views", plan_disambiguator_views_input, compact
+        ),
+        get_views_output,
     )
+
+
+def get_session(session_id: str) -> PlanDisambiguationSession:
+    session = session_store.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session Not Found")
+    return session
+
+
+def get_session_output(
+    session: PlanDisambiguationSession,
+    plan_disambiguator_view: PlanDisambiguationView,
+) -> PlanDisambiguatorOutput:
+    plan_disambiguator_output = session.get_output(plan_disambiguator_view)
+    if plan_disambiguator_output is None:
+        raise HTTPException(status_code=422, detail="Unprocessable Entity")
     return plan_disambiguator_output
 
 
-@app.post("/generate_nl2ltl_integration")
+@app.post("/sessions")
+def create_session(
+    plan_disambiguator_input: PlanDisambiguatorInput,
+) -> SessionInfo:
+    session = session_store.create_session(plan_disambiguator_input)
+    return session.get_session_info()
+
+
+@app.get("/sessions/{session_id}")
+@profiled
+def get_session_view(
+    session_id: str,
+    view: PlanDisambiguationView = PlanDisambiguationView.SELECT,
+    compact: bool = False,
+) -> Union[PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput]:
+    session = get_session(session_id)
+    with session.lock:
+        return get_encoded_output(get_session_output(session, view), compact)
+
+
+@app.post("/sessions/{session_id}/select")
+@profiled
+def select_in_session(
+    session_id: str,
+    selection_info: SelectionInfo,
+    view: PlanDisambiguationView = PlanDisambiguationView.SELECT,
+    compact: bool = False,
+) -> Union[PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput]:
+    session = get_session(session_id)
+    with session.lock:
+        session.add_selection_info(selection_info)
+        try:
+            return get_encoded_output(
+                get_session_output(session, view), compact
+            )
+        except HTTPException:
+            session.undo_selection_info()
+            raise
+
+
+@app.post("/sessions/{session_id}/undo")
+@profiled
+def undo_in_session(
+    session_id: str,
+    view: PlanDisambiguationView = PlanDisambiguationView.SELECT,
+    compact: bool = False,
+) -> Union[PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput]:
+    session = get_session(session_id)
+    with session.lock:
+        session.undo_selection_info()
+        return get_encoded_output(get_session_output(session, view), compact)
+
+
+@app.post("/sessions/{session_id}/reset")
+@profiled
+def reset_session(
+    session_id: str,
+    view: PlanDisambiguationView = PlanDisambiguationView.SELECT,
+    compact: bool = False,
+) -> Union[PlanDisambiguatorOutput, CompactPlanDisambiguatorOutput]:
+    session = get_session(session_id)
+    with session.lock:
+        session.reset_selection_infos()
+        return get_encoded_output(get_session_output(session, view), compact)
+
+
+@app.delete("/sessions/{session_id}")
+def delete_session(session_id: str) -> SessionInfo:
+    session = get_session(session_id)
+    session_store.delete_session(session_id)
+    return session.get_session_info()
+
+
+@app.post(
+    "/generate_nl2ltl_integration", response_model=PlanDisambiguatorOutput
+)
 @requires_optional
 def generate_nl2ltl_integration(
     plan_disambiguator_input: PlanDisambiguatorInput,
-) -> PlanDisambiguatorOutput:
-    return generate_select_view(plan_disambiguator_input)
+) -> Response:
+    return generate_select_view(plan_disambiguator_input, compact=False)
 
 
 @app.post("/nl2ltl", response_model=None)
@@ -250,9 +717,8 @@ async def nl2ltl(request: NL2LTLRequest) -> List[LTLFormula]:
     return ltl_formulas
 
 
-@app.post("/ltl_compile/{tool}")
-@requires_optional
-async def ltl_compile(
+@profiled
+def get_ltl_compiled_lemming_task(
     request: LTL2PDDLRequest, tool: ToolCompiler
 ) -> LemmingTask:
     domain_parser = DomainParser()
@@ -280,3 +746,15 @@ async def ltl_compile(
     lemming_task = LemmingTask(planning_task=planning_task, plans=plans)
 
     return lemming_task
+
+
+@app.post("/ltl_compile/{tool}")
+@requires_optional
+async def ltl_compile(
+    request: LTL2PDDLRequest, tool: ToolCompiler
+) -> LemmingTask:
+    # parsing and compiling the task block as long as planning does, and are
+    # profiled in the thread they run in
+    return await planner_executor.run(
+        get_ltl_compiled_lemming_task, request, tool
+    )
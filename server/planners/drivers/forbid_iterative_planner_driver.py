@@ -1,10 +1,36 @@
 from typing import List, Optional
 from pathlib import Path
 from forbiditerative import planners
+import json
+import subprocess
+import sys
 import tempfile
 
+from server.helpers.common_helper.metrics_helper import (
+    observe_planner_call,
+    observe_stage,
+)
 from server.planners.drivers.planner_driver_datatype import PlanningResult, Plan
 
+# forbiditerative keeps the plans it finds in ./found_plans, so concurrent
+# calls in the same working directory overwrite each other's plans; each call
+# runs in a worker process with a working directory of its own
+FORBID_ITERATIVE_WORKER = """
+import json
+import sys
+from pathlib import Path
+
+from forbiditerative import planners
+
+options = json.loads(sys.argv[1])
+result = planners.plan_unordered_topq(
+    domain_file=Path("domain.pddl"),
+    problem_file=Path("problem.pddl"),
+    **options,
+)
+Path("planning_result.json").write_text(json.dumps(result))
+"""
+
 
 def execute_forbid_iterative_planner(
     planner_name: str,
@@ -12,22 +38,40 @@ def execute_forbid_iterative_planner(
     problem: str,
     num_plans: int,
     quality_bound: Optional[float] = None,
+    timeout: Optional[int] = None,
 ) -> PlanningResult:
-    with (
-        tempfile.NamedTemporaryFile() as domain_temp,
-        tempfile.NamedTemporaryFile() as problem_temp,
-    ):
-        domain_file = Path(tempfile.gettempdir()) / domain_temp.name
-        problem_file = Path(tempfile.gettempdir()) / problem_temp.name
-        domain_file.write_text(domain)
-        problem_file.write_text(problem)
-
-        result = planners.plan_unordered_topq(
-            domain_file=domain_file,
-            problem_file=problem_file,
-            quality_bound=quality_bound,
-            number_of_plans_bound=num_plans,
+    with tempfile.TemporaryDirectory() as run_dir:
+        with observe_stage("write_temp_files", size=len(domain) + len(problem)):
+            (Path(run_dir) / "domain.pddl").write_text(domain)
+            (Path(run_dir) / "problem.pddl").write_text(problem)
+
+        # the time limit is only passed when set, as older forbiditerative
+        # releases do not accept it
+        options = dict(
+            quality_bound=quality_bound, number_of_plans_bound=num_plans
         )
+        if timeout is not None:
+            options["timeout"] = timeout
+        with observe_planner_call("topq", num_plans=num_plans) as span:
+            process = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    FORBID_ITERATIVE_WORKER,
+                    json.dumps(options),
+                ],
+                cwd=run_dir,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            result_file = Path(run_dir) / "planning_result.json"
+            if process.returncode != 0 or not result_file.is_file():
+                raise RuntimeError(
+                    f"forbiditerative exited with {process.returncode}: "
+                    f"{process.stderr.decode()}"
+                )
+            result = json.loads(result_file.read_text())
+            span.set_attribute("num_plans_found", len(result.get("plans", [])))
         planning_result: PlanningResult = PlanningResult(**result)
         planning_result.planner_name = f"{planner_name}"
 
@@ -41,12 +85,15 @@ def get_plans_dot(domain: str, problem: str, plans: List[Plan]) -> str:
     ):
         domain_file = Path(tempfile.gettempdir()) / domain_temp.name
         problem_file = Path(tempfile.gettempdir()) / problem_temp.name
-        domain_file.write_text(domain)
-        problem_file.write_text(problem)
+        with observe_stage("write_temp_files", size=len(domain) + len(problem)):
+            domain_file.write_text(domain)
+            problem_file.write_text(problem)
 
-        dot_txt: str = planners.get_dot(
-            domain_file=domain_file,
-            problem_file=problem_file,
-            plans=[plan.actions for plan in plans],
-        )
+        with observe_planner_call("get_dot", num_plans=len(plans)) as span:
+            dot_txt: str = planners.get_dot(
+                domain_file=domain_file,
+                problem_file=problem_file,
+                plans=[plan.actions for plan in plans],
+            )
+            span.set_attribute("dot_size", len(dot_txt))
         return dot_txt
@@ -3,6 +3,7 @@ from typing import List
 import tempfile
 
 from forbiditerative import planners
+from server.helpers.common_helper.metrics_helper import observe_planner_call
 from server.planners.drivers.landmark_driver_datatype import Landmark
 from server.helpers.planner_helper.planner_helper_data_types import (
     LandmarkCategory,
@@ -26,9 +27,10 @@ def get_landmarks(
         domain_file.write_text(domain)
         problem_file.write_text(problem)
 
-        result = planners.get_landmarks(
-            domain_file=domain_file, problem_file=problem_file
-        )
+        with observe_planner_call("landmarks"):
+            result = planners.get_landmarks(
+                domain_file=domain_file, problem_file=problem_file
+            )
         return [
             Landmark(
                 facts=landmark["facts"],
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from forbiditerative import planners
+
+from server.helpers.common_helper.metrics_helper import (
+    observe_planner_call,
+    observe_stage,
+)
+
+TRANSLATOR_PATH = planners.build_dir / "translate" / "translate.py"
+
+
+def get_sas_task_str(domain: str, problem: str) -> str:
+    """
+    returns the grounded task of a domain and problem in the SAS format written
+    by the translator of forbiditerative
+    """
+    with tempfile.TemporaryDirectory() as run_dir:
+        domain_file = Path(run_dir) / "domain.pddl"
+        problem_file = Path(run_dir) / "problem.pddl"
+        sas_file = Path(run_dir) / "output.sas"
+        with observe_stage("write_temp_files", size=len(domain) + len(problem)):
+            domain_file.write_text(domain)
+            problem_file.write_text(problem)
+
+        with observe_planner_call("translate") as span:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-B",
+                    str(TRANSLATOR_PATH),
+                    str(domain_file),
+                    str(problem_file),
+                    "--sas-file",
+                    str(sas_file),
+                ],
+                cwd=run_dir,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            if result.returncode != 0 or not sas_file.is_file():
+                raise RuntimeError(
+                    "translator failed: "
+                    + result.stderr.decode(errors="replace").strip()
+                )
+            sas_task_str = sas_file.read_text(encoding="UTF-8")
+            span.set_attribute("sas_size", len(sas_task_str))
+        return sas_task_str
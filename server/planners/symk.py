@@ -1,17 +1,32 @@
 """Wrapper to the SymK planner."""
+
 import glob
 import json
+import logging
+import os
 import re
+import signal
 import subprocess
 import tempfile
-from typing import Dict, Optional, Any
+import time
+from typing import Dict, Generator, List, Optional, Any, Set, Tuple
 import inspect
 from pathlib import Path
-from server.helpers.common_helper.str_helper import format_plans
+from server.helpers.common_helper.hash_helper import get_list_hash
+from server.helpers.common_helper.metrics_helper import observe_planner_call
+from server.helpers.common_helper.str_helper import format_plan, format_plans
 from server.helpers.planner_helper.planner_helper_data_types import PlanningTask
-from server.planners.drivers.planner_driver_datatype import PlanningResult
+from server.helpers.planner_helper.planning_result_cache_helper import (
+    planning_result_cache,
+)
+from server.planners.drivers.planner_driver_datatype import (
+    Plan,
+    PlanningResult,
+)
 from server.planners.base import Planner
 
+logger = logging.getLogger(__name__)
+
 current_frame = inspect.currentframe()
 if inspect.isframe(current_frame):
     PLANNERS_ROOT = Path(inspect.getframeinfo(current_frame).filename).parent
@@ -29,6 +44,7 @@ DEFAULT_HEURISTIC = (
     f"dump_plans=false),quality={str(DEFAULT_Q)})"
 )
 DEFAULT_SEARCH = f"symq-bd({DEFAULT_HEURISTIC})"
+PLAN_STREAM_POLL_INTERVAL = 0.2
 
 
 def create_plan_from_file(plan_file: Path) -> Dict[Any, Any]:
@@ -44,6 +60,34 @@ def create_plan_from_file(plan_file: Path) -> Dict[Any, Any]:
     return ret
 
 
+def read_plan_file(plan_file: Path) -> Optional[Plan]:
+    """Read a plan, or return None if the plan file is not complete."""
+    plan = create_plan_from_file(plan_file)
+    if "cost" not in plan or len(plan["actions"]) == 0:
+        return None
+    actions = format_plan(plan["actions"])
+    return Plan(
+        actions=actions,
+        cost=int(plan["cost"]),
+        plan_hash=get_list_hash(actions),
+    )
+
+
+def get_plan_files(plan_file_prefix_name: str) -> List[str]:
+    """Return plan files in the order the planner wrote them."""
+    plan_files = glob.glob(f"{plan_file_prefix_name}*")
+    return sorted(plan_files, key=lambda fplan: (len(fplan), fplan))
+
+
+def stop_process_group(process: "subprocess.Popen[bytes]") -> None:
+    """Kill a process and the processes in its process group."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        process.kill()
+    process.wait()
+
+
 def _parse_planning_result(plan_file_prefix_name: str) -> str:
     """Parse plans and create a json."""
     plan_file_name = f"{plan_file_prefix_name}*"
@@ -91,6 +135,12 @@ class SymKPlanner(Planner):
         :param options: options for the planner.
         :return: the plan.
         """
+        planning_result = planning_result_cache.get_planning_result(
+            "symk", planning_task
+        )
+        if planning_result is not None:
+            return planning_result
+
         with (
             tempfile.NamedTemporaryFile(delete=False) as plan_temp,
             tempfile.NamedTemporaryFile() as domain_temp,
@@ -109,13 +159,101 @@ class SymKPlanner(Planner):
                 plan_file,
                 planning_task.num_plans,
                 planning_task.quality_bound,
+                planning_task.timeout,
             )
             json_plans = _parse_planning_result(str(plan_file))
             result = json.loads(str(json_plans))
 
             for plan in result["plans"]:
                 plan["cost"] = int(plan["cost"])
-            return format_plans(PlanningResult(**result))
+            planning_result = format_plans(PlanningResult(**result))
+            planning_result_cache.add_planning_result(
+                "symk", planning_task, planning_result
+            )
+            return planning_result
+
+    def stream_plans(
+        self, planning_task: PlanningTask
+    ) -> Generator[Plan, None, None]:
+        """
+        Compute a set of plans, yielding each plan as soon as the planner
+        writes it.
+
+        The planner is killed when the iterator is closed before the planner
+        finishes.
+
+        :param planning_task: the planning task.
+        :return: an iterator over deduplicated, hashed plans.
+        """
+        planning_result = planning_result_cache.get_planning_result(
+            "symk", planning_task
+        )
+        if planning_result is not None:
+            yield from planning_result.plans
+            return
+
+        with tempfile.TemporaryDirectory() as plan_dir:
+            domain_file = Path(plan_dir) / "domain.pddl"
+            problem_file = Path(plan_dir) / "problem.pddl"
+            plan_file = Path(plan_dir) / "sas_plan"
+            domain_file.write_text(planning_task.domain)
+            problem_file.write_text(planning_task.problem)
+            cmd = self._get_planner_cmd(
+                domain_file,
+                problem_file,
+                plan_file,
+                planning_task.num_plans,
+                planning_task.quality_bound,
+                planning_task.timeout,
+            )
+            # the planner leads its own process group, so that the search
+            # started by the driver script is killed along with it
+            process = subprocess.Popen(
+                cmd,
+                cwd=plan_dir,
+                stdout=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            plans: List[Plan] = []
+            read_plan_files: Set[str] = set()
+            unique_plans: Set[Tuple[str, ...]] = set()
+            with observe_planner_call("symk_stream"):
+                try:
+                    while True:
+                        is_planner_finished = process.poll() is not None
+                        for fplan in get_plan_files(str(plan_file)):
+                            if fplan in read_plan_files:
+                                continue
+                            plan = read_plan_file(Path(fplan))
+                            if plan is None and not is_planner_finished:
+                                continue  # the planner is still writing it
+                            read_plan_files.add(fplan)
+                            if (
+                                plan is None
+                                or tuple(plan.actions) in unique_plans
+                            ):
+                                continue
+                            unique_plans.add(tuple(plan.actions))
+                            plans.append(plan)
+                            yield plan
+                        if is_planner_finished:
+                            break
+                        time.sleep(PLAN_STREAM_POLL_INTERVAL)
+                finally:
+                    if process.poll() is None:
+                        stop_process_group(process)
+
+            # the plans of a crashed or killed planner may be incomplete
+            if process.returncode != 0:
+                logger.warning(
+                    "SymK exited with %s after %d plans",
+                    process.returncode,
+                    len(plans),
+                )
+                return
+            planning_result_cache.add_planning_result(
+                "symk", planning_task, PlanningResult(plans=plans)
+            )
 
     def _call_planner(
         self,
@@ -124,10 +262,31 @@ class SymKPlanner(Planner):
         plans_path: Path,
         num_plans: int = DEFAULT_K,
         quality: float = DEFAULT_Q,
+        timeout: Optional[int] = None,
     ) -> None:
         """Call the planner."""
-        cmd = [
-            self.bin_path,
+        cmd = self._get_planner_cmd(
+            domain_path, problem_path, plans_path, num_plans, quality, timeout
+        )
+        with observe_planner_call("symk"):
+            subprocess.check_call(cmd)
+
+    def _get_planner_cmd(
+        self,
+        domain_path: Path,
+        problem_path: Path,
+        plans_path: Path,
+        num_plans: int = DEFAULT_K,
+        quality: float = DEFAULT_Q,
+        timeout: Optional[int] = None,
+    ) -> List[str]:
+        """Return the planner command line."""
+        time_limit = (
+            [] if timeout is None else ["--overall-time-limit", f"{timeout}s"]
+        )
+        return [
+            str(self.bin_path),
+            *time_limit,
             "--plan-file",
             str(plans_path.absolute()),
             str(domain_path.absolute()),
@@ -138,4 +297,3 @@ class SymKPlanner(Planner):
                 f"dump_plans=false),quality={str(quality)})"
             ),
         ]
-        subprocess.check_call(cmd)  # type: ignore
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Dict
+
+from server.helpers.catalog_helper.catalog_helper import DomainCatalog
+from server.helpers.catalog_helper.catalog_helper_data_types import (
+    DomainCatalogEntry,
+    DomainWarmUpStatus,
+)
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}"
+
+
+class TestCatalogHelper(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name)
+        for domain_name in ["gripper", "toy"]:
+            shutil.copytree(
+                os.path.join(my_dir, rel_pddl_path.format(domain_name)),
+                self.data_dir / domain_name,
+            )
+        # a domain without a problem
+        (self.data_dir / "broken").mkdir()
+        (self.data_dir / "broken" / "domain.pddl").write_text(
+            (self.data_dir / "toy" / "domain.pddl").read_text()
+        )
+        self.domain_catalog = DomainCatalog(
+            str(self.data_dir), num_plans=3, quality_bound=1.5
+        )
+        self.domain_catalog.scan()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def get_entries(self) -> Dict[str, DomainCatalogEntry]:
+        return {
+            entry.domain_name: entry
+            for entry in self.domain_catalog.get_catalog_info().domains
+        }
+
+    def test_scan(self) -> None:
+        entries = self.get_entries()
+        self.assertEqual(set(entries), {"gripper", "toy", "broken"})
+        self.assertTrue(entries["gripper"].is_valid)
+        self.assertEqual(entries["gripper"].num_plans, 7)
+        self.assertTrue(entries["toy"].is_valid)
+        self.assertFalse(entries["toy"].has_plans_file)
+        self.assertFalse(entries["broken"].is_valid)
+        self.assertIsNotNone(entries["broken"].error)
+        self.assertIsNone(self.domain_catalog.get_lemming_task("broken"))
+        self.assertIsNone(self.domain_catalog.get_lemming_task("unknown"))
+
+    def test_warm_up(self) -> None:
+        fingerprint = self.domain_catalog.get_fingerprint("toy")
+        gripper_task = self.domain_catalog.get_lemming_task("gripper")
+        assert gripper_task is not None
+        self.domain_catalog.warm_up()
+        entries = self.get_entries()
+        for domain_name in ["gripper", "toy"]:
+            entry = entries[domain_name]
+            self.assertEqual(entry.warm_up_status, DomainWarmUpStatus.READY)
+            assert entry.num_landmarks is not None
+            assert entry.num_nodes is not None
+            self.assertGreater(entry.num_landmarks, 0)
+            self.assertGreater(entry.num_nodes, 0)
+        self.assertEqual(
+            entries["broken"].warm_up_status, DomainWarmUpStatus.SKIPPED
+        )
+        # plans are computed for a domain without plans.json
+        lemming_task = self.domain_catalog.get_lemming_task("toy")
+        assert lemming_task is not None
+        self.assertGreater(len(lemming_task.plans), 0)
+        self.assertEqual(entries["toy"].num_plans, len(lemming_task.plans))
+        self.assertNotEqual(
+            self.domain_catalog.get_fingerprint("toy"), fingerprint
+        )
+        # plan graphs are built from copies of the plans of the catalog
+        self.assertTrue(
+            all(plan.plan_hash is None for plan in gripper_task.plans)
+        )
+
+    def test_reload_changed_domain(self) -> None:
+        lemming_task = self.domain_catalog.get_lemming_task("gripper")
+        self.assertIs(
+            self.domain_catalog.get_lemming_task("gripper"), lemming_task
+        )
+        (self.data_dir / "gripper" / "plans.json").write_text("[]")
+        lemming_task = self.domain_catalog.get_lemming_task("gripper")
+        assert lemming_task is not None
+        self.assertEqual(len(lemming_task.plans), 0)
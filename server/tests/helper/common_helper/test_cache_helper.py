@@ -0,0 +1,57 @@
+import time
+import unittest
+from typing import List
+
+from server.helpers.common_helper.cache_helper import LRUCache
+
+
+class TestCacheHelper(unittest.TestCase):
+    def test_lru_cache_evicts_least_recently_used(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache.get_stats()
+        self.assertEqual(stats.hits, 3)
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.evictions, 1)
+
+    def test_lru_cache_evicts_by_size(self) -> None:
+        cache: LRUCache[str, str] = LRUCache(
+            max_entries=None, max_size=10, get_size=len
+        )
+        cache.put("a", "12345")
+        cache.put("b", "12345")
+        self.assertEqual(cache.size, 10)
+        cache.put("c", "123")
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.size, 8)
+        cache.put("d", "12345678901")  # larger than the budget
+        self.assertNotIn("d", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_cache_resize(self) -> None:
+        cache: LRUCache[str, List[int]] = LRUCache(
+            max_entries=None, max_size=4, get_size=len
+        )
+        cache.put("a", [1, 2])
+        cache.put("b", [1])
+        value = cache.get("b")
+        assert value is not None
+        value.extend([2, 3])
+        cache.resize("b")
+        self.assertNotIn("a", cache)
+        self.assertIn("b", cache)
+        self.assertEqual(cache.size, 3)
+
+    def test_lru_cache_ttl(self) -> None:
+        cache: LRUCache[str, int] = LRUCache(ttl=0.05)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats().evictions, 1)
@@ -0,0 +1,31 @@
+import os
+import unittest
+from unittest import mock
+
+from server.helpers.common_helper.config_helper import (
+    get_env_bool,
+    get_env_float,
+    get_env_int,
+)
+
+
+class TestConfigHelper(unittest.TestCase):
+    def test_get_env_values(self) -> None:
+        with mock.patch.dict(
+            os.environ,
+            {"LEMMING_TEST_INT": " 3 ", "LEMMING_TEST_FLOAT": "1.5"},
+        ):
+            self.assertEqual(get_env_int("LEMMING_TEST_INT", 1), 3)
+            self.assertEqual(get_env_float("LEMMING_TEST_FLOAT", 1.0), 1.5)
+            self.assertEqual(get_env_int("LEMMING_TEST_MISSING", 1), 1)
+            self.assertTrue(get_env_bool("LEMMING_TEST_MISSING", True))
+
+    def test_get_env_values_invalid(self) -> None:
+        with mock.patch.dict(
+            os.environ,
+            {"LEMMING_TEST_INT": "1.5", "LEMMING_TEST_FLOAT": "many"},
+        ):
+            with self.assertRaisesRegex(ValueError, "LEMMING_TEST_INT"):
+                get_env_int("LEMMING_TEST_INT", 1)
+            with self.assertRaisesRegex(ValueError, "LEMMING_TEST_FLOAT"):
+                get_env_float("LEMMING_TEST_FLOAT", 1.0)
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+import unittest
+from typing import Any, List
+
+from fastapi import HTTPException
+
+from server.helpers.common_helper.executor_helper import PlannerExecutor
+
+
+class TestExecutorHelper(unittest.TestCase):
+    def test_planner_executor_runs_off_event_loop(self) -> None:
+        planner_executor = PlannerExecutor(max_workers=1, max_queue_size=0)
+
+        async def run() -> str:
+            return await planner_executor.run(
+                lambda: threading.current_thread().name
+            )
+
+        self.assertTrue(asyncio.run(run()).startswith("planner"))
+        self.assertEqual(planner_executor.num_calls, 0)
+
+    def test_planner_executor_rejects_calls_over_queue_size(self) -> None:
+        planner_executor = PlannerExecutor(max_workers=1, max_queue_size=1)
+        release = threading.Event()
+
+        async def run() -> List[Any]:
+            return await asyncio.gather(
+                *[planner_executor.run(release.wait, 5) for _ in range(3)],
+                release_after_rejection(),
+                return_exceptions=True,
+            )
+
+        async def release_after_rejection() -> None:
+            await asyncio.sleep(0.1)
+            release.set()
+
+        results = asyncio.run(run())
+        rejections = [
+            result for result in results if isinstance(result, HTTPException)
+        ]
+        self.assertEqual(len(rejections), 1)
+        self.assertEqual(rejections[0].status_code, 503)
+        self.assertEqual(results[:3].count(True), 2)
+        self.assertEqual(planner_executor.num_calls, 0)
+
+    def test_planner_executor_keeps_slots_of_cancelled_calls(self) -> None:
+        planner_executor = PlannerExecutor(max_workers=1, max_queue_size=0)
+        started = threading.Event()
+        release = threading.Event()
+
+        def wait() -> None:
+            started.set()
+            release.wait(5)
+
+        async def run() -> None:
+            task = asyncio.ensure_future(planner_executor.run(wait))
+            await asyncio.get_running_loop().run_in_executor(
+                None, started.wait, 5
+            )
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(run())
+        # the call still runs in its thread after its request is cancelled
+        self.assertEqual(planner_executor.num_calls, 1)
+        with self.assertRaises(HTTPException):
+            planner_executor.acquire()
+        release.set()
+        deadline = time.monotonic() + 5
+        while planner_executor.num_calls > 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(planner_executor.num_calls, 0)
+
+    def test_planner_executor_iterate_holds_slot(self) -> None:
+        planner_executor = PlannerExecutor(max_workers=1, max_queue_size=0)
+        plans = planner_executor.iterate(iter(["p0", "p1"]))
+        self.assertEqual(planner_executor.num_calls, 1)
+        with self.assertRaises(HTTPException) as context:
+            planner_executor.iterate(iter([]))
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertEqual(list(plans), ["p0", "p1"])
+        self.assertEqual(planner_executor.num_calls, 0)
+
+        plans = planner_executor.iterate(iter(["p0", "p1"]))
+        self.assertEqual(next(plans), "p0")
+        plans.close()
+        self.assertEqual(planner_executor.num_calls, 0)
+
+        # an iterator that never starts releases its slot when dropped
+        plans = planner_executor.iterate(iter(["p0"]))
+        del plans
+        self.assertEqual(planner_executor.num_calls, 0)
@@ -1,6 +1,10 @@
 import unittest
 
-from server.helpers.common_helper.hash_helper import get_list_hash
+from server.helpers.common_helper.hash_helper import (
+    get_list_hash,
+    get_plan_set_fingerprint,
+    get_task_fingerprint,
+)
 
 
 class TestHashHelper(unittest.TestCase):
@@ -8,3 +12,27 @@ class TestHashHelper(unittest.TestCase):
         hash_0 = get_list_hash(["cat", "mouse"])
         hash_1 = get_list_hash(["cat", "mouse", "dog"])
         self.assertNotEqual(hash_0, hash_1)
+
+    def test_get_task_fingerprint(self) -> None:
+        fingerprint_0 = get_task_fingerprint(
+            "(define (domain d)\n  (:action a))", "(define (problem p))"
+        )
+        fingerprint_1 = get_task_fingerprint(
+            "; comment\n(define (DOMAIN d) (:action a)) ; comment",
+            "(define  (problem p))",
+        )
+        fingerprint_2 = get_task_fingerprint(
+            "(define (domain d) (:action b))", "(define (problem p))"
+        )
+        self.assertEqual(fingerprint_0, fingerprint_1)
+        self.assertNotEqual(fingerprint_0, fingerprint_2)
+
+    def test_get_plan_set_fingerprint(self) -> None:
+        self.assertEqual(
+            get_plan_set_fingerprint("d", "p", ["a", "b"]),
+            get_plan_set_fingerprint("d", "p", ["b", "a"]),
+        )
+        self.assertNotEqual(
+            get_plan_set_fingerprint("d", "p", ["a", "b"]),
+            get_plan_set_fingerprint("d", "p", ["a"]),
+        )
@@ -0,0 +1,91 @@
+import unittest
+
+from server.helpers.common_helper.cache_helper import LRUCache
+from server.helpers.common_helper.metrics_helper import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    observe_planner_call,
+    observe_stage,
+    planner_calls,
+    planner_calls_running,
+    stage_latency,
+)
+
+
+class TestMetricsHelper(unittest.TestCase):
+    def test_counter(self) -> None:
+        counter = Counter("test_total", "Test counter.")
+        counter.inc(planner="topq")
+        counter.inc(2, planner="topq")
+        counter.inc(planner='say "hi"')
+        self.assertEqual(counter.get_value(planner="topq"), 3)
+        self.assertEqual(
+            counter.get_lines(),
+            [
+                "# HELP test_total Test counter.",
+                "# TYPE test_total counter",
+                'test_total{planner="say \\"hi\\""} 1',
+                'test_total{planner="topq"} 3',
+            ],
+        )
+
+    def test_histogram(self) -> None:
+        histogram = Histogram("test_seconds", "Test histogram.", (0.1, 1.0))
+        histogram.observe(0.05, stage="a")
+        histogram.observe(0.5, stage="a")
+        histogram.observe(5.0, stage="a")
+        self.assertEqual(histogram.get_count(stage="a"), 3)
+        self.assertEqual(
+            histogram.get_sample_lines(),
+            [
+                'test_seconds_bucket{stage="a",le="0.1"} 1',
+                'test_seconds_bucket{stage="a",le="1"} 2',
+                'test_seconds_bucket{stage="a",le="+Inf"} 3',
+                'test_seconds_sum{stage="a"} 5.55',
+                'test_seconds_count{stage="a"} 3',
+            ],
+        )
+
+    def test_registry_text(self) -> None:
+        registry = MetricsRegistry()
+        registry.counter("test_total", "Test counter.").inc()
+        # the same metric is returned when it is registered again
+        registry.counter("test_total", "Test counter.").inc()
+        cache: LRUCache[str, int] = LRUCache(name="test")
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        registry.register_cache("test", cache.get_stats)
+        text = registry.get_text()
+        self.assertTrue(text.endswith("\n"))
+        self.assertIn("test_total 2\n", text)
+        self.assertIn('lemming_cache_hits{cache="test"} 1\n', text)
+        self.assertIn('lemming_cache_misses{cache="test"} 1\n', text)
+        self.assertIn('lemming_cache_hit_ratio{cache="test"} 0.5\n', text)
+        self.assertIn('lemming_cache_entries{cache="test"} 1\n', text)
+
+    def test_observe_stage(self) -> None:
+        num_observations = stage_latency.get_count(stage="test_stage")
+        with self.assertRaises(ValueError):
+            with observe_stage("test_stage"):
+                raise ValueError()
+        self.assertEqual(
+            stage_latency.get_count(stage="test_stage"), num_observations + 1
+        )
+
+    def test_observe_planner_call(self) -> None:
+        num_calls = planner_calls.get_value(planner="test_planner")
+        with observe_planner_call("test_planner"):
+            self.assertEqual(
+                planner_calls_running.get_value(planner="test_planner"), 1
+            )
+        self.assertEqual(
+            planner_calls.get_value(planner="test_planner"), num_calls + 1
+        )
+        self.assertEqual(
+            planner_calls_running.get_value(planner="test_planner"), 0
+        )
+        self.assertEqual(
+            stage_latency.get_count(stage="planner_test_planner"), 1
+        )
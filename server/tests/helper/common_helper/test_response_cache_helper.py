@@ -0,0 +1,64 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from server.helpers.common_helper.response_cache_helper import (
+    ResponseCache,
+    get_etag,
+    get_files_fingerprint,
+    get_request_fingerprint,
+)
+from server.planners.drivers.planner_driver_datatype import Plan
+
+
+class TestResponseCacheHelper(unittest.TestCase):
+    def test_request_fingerprint(self) -> None:
+        plan = Plan(actions=["a"], cost=1)
+        self.assertEqual(
+            get_request_fingerprint("view", plan, True),
+            get_request_fingerprint("view", Plan(actions=["a"], cost=1), True),
+        )
+        self.assertNotEqual(
+            get_request_fingerprint("view", plan, True),
+            get_request_fingerprint("view", plan, False),
+        )
+        self.assertNotEqual(
+            get_request_fingerprint("view", plan),
+            get_request_fingerprint("other_view", plan),
+        )
+
+    def test_files_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "plans.json"
+            missing_fingerprint = get_files_fingerprint(path)
+            path.write_text("[]")
+            fingerprint = get_files_fingerprint(path)
+            self.assertNotEqual(fingerprint, missing_fingerprint)
+            self.assertEqual(get_files_fingerprint(path), fingerprint)
+            path.write_text("[{}]")
+            self.assertNotEqual(get_files_fingerprint(path), fingerprint)
+
+    def test_get_response(self) -> None:
+        response_cache = ResponseCache()
+        num_calls = []
+
+        def get_content() -> Plan:
+            num_calls.append(1)
+            return Plan(actions=["a"], cost=1)
+
+        response = response_cache.get_response("abc", get_content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], get_etag("abc"))
+        self.assertEqual(
+            Plan.model_validate_json(response.body), Plan(actions=["a"], cost=1)
+        )
+        # the response is cached by the fingerprint
+        response = response_cache.get_response("abc", get_content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(num_calls), 1)
+        # responses without a fingerprint are neither cached nor tagged
+        for _ in range(2):
+            response = response_cache.get_response(None, get_content)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("ETag", response.headers)
+        self.assertEqual(len(num_calls), 3)
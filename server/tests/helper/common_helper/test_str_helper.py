@@ -1,7 +1,10 @@
 import unittest
 from typing import List
 
-from server.helpers.common_helper.str_helper import format_plan
+from server.helpers.common_helper.str_helper import (
+    format_plan,
+    get_server_sent_event,
+)
 
 
 class TestStrHelper(unittest.TestCase):
@@ -11,3 +14,13 @@ class TestStrHelper(unittest.TestCase):
         plan.append("b c d ")
         res = format_plan(plan)
         self.assertEqual(res, ["a", "b c d"])
+
+    def test_get_server_sent_event(self) -> None:
+        self.assertEqual(
+            get_server_sent_event("plan", '{"cost": 1}'),
+            'event: plan\ndata: {"cost": 1}\n\n',
+        )
+        self.assertEqual(
+            get_server_sent_event("end", "a\nb"),
+            "event: end\ndata: a\ndata: b\n\n",
+        )
@@ -0,0 +1,134 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List
+
+from server.helpers.common_helper.metrics_helper import observe_stage
+from server.helpers.common_helper.trace_helper import (
+    NOOP_SPAN,
+    JsonFileTraceExporter,
+    Span,
+    TraceExporter,
+    Tracer,
+    get_otlp_trace,
+    tracer,
+)
+
+
+class ListTraceExporter(TraceExporter):
+    def __init__(self) -> None:
+        self.traces: List[List[Span]] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.traces.append(spans)
+
+
+class TestTraceHelper(unittest.TestCase):
+    def test_disabled(self) -> None:
+        with Tracer().span("request") as span:
+            span.set_attribute("num_plans", 1)
+            self.assertIs(span, NOOP_SPAN)
+
+    def test_nested_spans(self) -> None:
+        exporter = ListTraceExporter()
+        test_tracer = Tracer([exporter])
+        with test_tracer.span("request", method="POST") as root_span:
+            with test_tracer.span("plan_graph", num_plans=3) as child_span:
+                with test_tracer.span("parse_dot") as grandchild_span:
+                    grandchild_span.set_attributes(num_nodes=5, num_edges=4)
+            with test_tracer.span("split_by_actions"):
+                pass
+            # nothing is exported before the root span finishes
+            self.assertEqual(len(exporter.traces), 0)
+
+        self.assertEqual(len(exporter.traces), 1)
+        spans = exporter.traces[0]
+        self.assertEqual(
+            [span.name for span in spans],
+            ["parse_dot", "plan_graph", "split_by_actions", "request"],
+        )
+        self.assertEqual(
+            {span.trace_id for span in spans}, {root_span.trace_id}
+        )
+        self.assertIsNone(root_span.parent_span_id)
+        self.assertEqual(child_span.parent_span_id, root_span.span_id)
+        self.assertEqual(grandchild_span.parent_span_id, child_span.span_id)
+        self.assertEqual(
+            grandchild_span.attributes, {"num_nodes": 5, "num_edges": 4}
+        )
+        self.assertTrue(all(span.end_time_ns is not None for span in spans))
+
+        # a new request starts a new trace
+        with test_tracer.span("request") as next_root_span:
+            pass
+        self.assertNotEqual(next_root_span.trace_id, root_span.trace_id)
+
+    def test_error(self) -> None:
+        exporter = ListTraceExporter()
+        test_tracer = Tracer([exporter])
+        with self.assertRaises(ValueError):
+            with test_tracer.span("request"):
+                raise ValueError("no plans")
+        self.assertEqual(exporter.traces[0][0].error, "ValueError: no plans")
+
+    def test_observe_stage(self) -> None:
+        exporter = ListTraceExporter()
+        tracer.exporters.append(exporter)
+        try:
+            with tracer.span("request"):
+                with observe_stage("filter_plans", num_plans=2) as span:
+                    span.set_attribute("num_selected_plans", 1)
+        finally:
+            tracer.exporters.remove(exporter)
+        self.assertEqual(
+            exporter.traces[0][0].attributes,
+            {"num_plans": 2, "num_selected_plans": 1},
+        )
+
+    def test_json_file_exporter(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "traces.jsonl"
+            test_tracer = Tracer([JsonFileTraceExporter(path)])
+            for _ in range(2):
+                with test_tracer.span("request"):
+                    with test_tracer.span("serialize", size=10):
+                        pass
+            traces = [
+                json.loads(line) for line in path.read_text().splitlines()
+            ]
+        self.assertEqual(len(traces), 2)
+        self.assertEqual(
+            [span["name"] for span in traces[0]["spans"]],
+            ["serialize", "request"],
+        )
+        self.assertEqual(traces[0]["spans"][0]["attributes"], {"size": 10})
+        self.assertGreaterEqual(traces[0]["spans"][1]["duration"], 0)
+
+    def test_otlp_trace(self) -> None:
+        exporter = ListTraceExporter()
+        test_tracer = Tracer([exporter])
+        with test_tracer.span("request", method="POST", is_cached=False):
+            with test_tracer.span("parse_dot", num_nodes=5, dot_size=1.5):
+                pass
+        otlp_trace = get_otlp_trace(exporter.traces[0])
+        otlp_spans = otlp_trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(otlp_spans[0]["name"], "parse_dot")
+        self.assertEqual(otlp_spans[0]["parentSpanId"], otlp_spans[1]["spanId"])
+        self.assertNotIn("parentSpanId", otlp_spans[1])
+        self.assertEqual(
+            otlp_spans[0]["attributes"],
+            [
+                {"key": "num_nodes", "value": {"intValue": "5"}},
+                {"key": "dot_size", "value": {"doubleValue": 1.5}},
+            ],
+        )
+        self.assertEqual(
+            otlp_spans[1]["attributes"],
+            [
+                {"key": "method", "value": {"stringValue": "POST"}},
+                {"key": "is_cached", "value": {"boolValue": False}},
+            ],
+        )
+        self.assertEqual(len(otlp_spans[0]["traceId"]), 32)
+        self.assertEqual(len(otlp_spans[0]["spanId"]), 16)
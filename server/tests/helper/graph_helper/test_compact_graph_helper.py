@@ -0,0 +1,131 @@
+import os
+import unittest
+
+import networkx as nx
+from networkx import MultiDiGraph
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.graph_helper.compact_graph_helper import (
+    get_compact_graph,
+)
+from server.helpers.graph_helper.graph_helper import (
+    convert_dot_str_to_networkx_graph,
+    get_all_nodes_coming_from_node,
+    get_edge_label,
+    get_first_node_with_multiple_out_edges,
+    get_node_distance_from_terminal_node,
+    get_root_node_in_digraph,
+)
+
+my_dir = os.path.dirname(__file__)
+rel_dot_path = "../../data/graph/{}.dot"
+
+
+def get_graph(name: str) -> MultiDiGraph:
+    return convert_dot_str_to_networkx_graph(
+        read_str_from_file(os.path.join(my_dir, rel_dot_path.format(name)))
+    )
+
+
+class TestCompactGraphHelper(unittest.TestCase):
+    def test_get_compact_graph(self) -> None:
+        for name in ["sample", "example"]:
+            g = get_graph(name)
+            cg = get_compact_graph(g)
+            self.assertIs(get_compact_graph(cg), cg)
+            self.assertEqual(list(cg.node_names), list(g.nodes))
+            self.assertEqual(cg.number_of_edges(), g.number_of_edges())
+            for is_forward in [True, False]:
+                offsets, adjacent_node_ids, label_ids = cg.get_adjacency(
+                    is_forward
+                )
+                for node_id, node in enumerate(cg.node_names):
+                    edges = (
+                        list(g.out_edges(node))
+                        if is_forward
+                        else list(g.in_edges(node))
+                    )
+                    edge_ids = range(offsets[node_id], offsets[node_id + 1])
+                    self.assertEqual(
+                        [
+                            cg.node_names[adjacent_node_ids[edge_id]]
+                            for edge_id in edge_ids
+                        ],
+                        [edge[1 if is_forward else 0] for edge in edges],
+                    )
+                    self.assertEqual(
+                        [cg.labels[label_ids[edge_id]] for edge_id in edge_ids],
+                        [get_edge_label(g, edge) for edge in edges],
+                    )
+
+    def test_get_compact_graph_once(self) -> None:
+        g = get_graph("sample")
+        cg = get_compact_graph(g)
+        self.assertIs(get_compact_graph(g), cg)
+        g.add_edge("node1", "node_new", label="new")
+        new_cg = get_compact_graph(g)
+        self.assertIsNot(new_cg, cg)
+        self.assertEqual(new_cg.number_of_edges(), cg.number_of_edges() + 1)
+        self.assertIs(get_compact_graph(g), new_cg)
+
+    def test_get_compact_graph_parallel_edges(self) -> None:
+        g = MultiDiGraph()
+        g.add_edge("node0", "node1", label="a")
+        g.add_edge("node0", "node1", label='"B"')
+        g.add_edge("node1", "node2")
+        cg = get_compact_graph(g)
+        self.assertEqual(list(cg.out_targets), [1, 1, 2])
+        self.assertEqual(list(cg.in_sources), [0, 0, 1])
+        self.assertEqual(
+            [cg.labels[label_id] for label_id in cg.out_labels], ["a", "a", ""]
+        )
+        self.assertEqual(
+            get_first_node_with_multiple_out_edges(cg, True),
+            (
+                [("node0", [("node0", "node1"), ("node0", "node1")], [])],
+                {"node0"},
+            ),
+        )
+
+    def test_graph_passes_on_compact_graph(self) -> None:
+        g = get_graph("sample")
+        cg = get_compact_graph(g)
+        for is_forward in [True, False]:
+            self.assertEqual(
+                get_root_node_in_digraph(cg, is_forward),
+                get_root_node_in_digraph(g, is_forward),
+            )
+            self.assertEqual(
+                get_first_node_with_multiple_out_edges(cg, is_forward),
+                get_first_node_with_multiple_out_edges(g, is_forward),
+            )
+            self.assertEqual(
+                get_all_nodes_coming_from_node(
+                    cg, "node1", {"node19"}, is_forward
+                ),
+                get_all_nodes_coming_from_node(
+                    g, "node1", {"node19"}, is_forward
+                ),
+            )
+        self.assertEqual(get_all_nodes_coming_from_node(cg, "unknown"), set())
+
+    def test_graph_passes_on_cyclic_graph(self) -> None:
+        g = get_graph("example")
+        self.assertFalse(nx.is_directed_acyclic_graph(g))
+        cg = get_compact_graph(g)
+        for is_forward in [True, False]:
+            graph = g if is_forward else g.reverse()
+            roots = get_root_node_in_digraph(cg, is_forward)
+            self.assertEqual(
+                get_node_distance_from_terminal_node(cg, is_forward),
+                nx.multi_source_dijkstra_path_length(graph, set(roots)),
+            )
+            nodes, nodes_traversed = get_first_node_with_multiple_out_edges(
+                cg, is_forward
+            )
+            self.assertGreater(len(nodes), 0)
+            # roots are not reached again
+            self.assertEqual(
+                get_all_nodes_coming_from_node(cg, roots[0], set(), is_forward),
+                nx.descendants(graph, roots[0]),
+            )
@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+
+import networkx as nx
+from networkx import MultiDiGraph
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.graph_helper.compact_graph_helper import (
+    get_compact_graph,
+)
+from server.helpers.graph_helper.distance_index_helper import (
+    get_distance_index,
+)
+from server.helpers.graph_helper.graph_helper import (
+    convert_dot_str_to_networkx_graph,
+    get_root_node_in_digraph,
+)
+
+my_dir = os.path.dirname(__file__)
+rel_dot_path = "../../data/graph/{}.dot"
+
+
+def get_graph(name: str) -> MultiDiGraph:
+    return convert_dot_str_to_networkx_graph(
+        read_str_from_file(os.path.join(my_dir, rel_dot_path.format(name)))
+    )
+
+
+class TestDistanceIndexHelper(unittest.TestCase):
+    def test_get_distance_index(self) -> None:
+        for name in ["sample", "example"]:
+            g = get_graph(name)
+            distance_index = get_distance_index(get_compact_graph(g))
+            self.assertEqual(
+                distance_index.get_node_distances(True),
+                nx.multi_source_dijkstra_path_length(
+                    g, set(get_root_node_in_digraph(g, True))
+                ),
+            )
+            self.assertEqual(
+                distance_index.get_node_distances(False),
+                nx.multi_source_dijkstra_path_length(
+                    g.reverse(), set(get_root_node_in_digraph(g, False))
+                ),
+            )
+
+    def test_get_distance_index_cyclic_graph(self) -> None:
+        g = MultiDiGraph(
+            [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d"), ("a", "e")]
+        )
+        distance_index = get_distance_index(get_compact_graph(g))
+        self.assertEqual(distance_index.dist_from_initial_state["d"], 3)
+        self.assertEqual(
+            dict(distance_index.dist_to_end_state),
+            {"d": 0, "e": 0, "c": 1, "a": 1, "b": 2},
+        )
+
+    def test_get_min_distance(self) -> None:
+        g = MultiDiGraph([("a", "b"), ("b", "c"), ("x", "y")])
+        node_distances = get_distance_index(
+            get_compact_graph(g)
+        ).get_node_distances(False)
+        self.assertEqual(list(node_distances), ["c", "y", "b", "x", "a"])
+        self.assertEqual(node_distances.get_min_distance(["a", "b"]), 1)
+        self.assertEqual(
+            node_distances.get_min_distance(["unknown"]), sys.maxsize
+        )
+        self.assertNotIn("unknown", node_distances)
+        with self.assertRaises(KeyError):
+            node_distances["unknown"]
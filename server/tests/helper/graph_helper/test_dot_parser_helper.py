@@ -0,0 +1,89 @@
+import os
+import unittest
+
+from networkx import Graph
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.graph_helper.dot_parser_helper import (
+    get_normalized_edge_label,
+    parse_plan_graph_dot_str,
+)
+from server.helpers.graph_helper.graph_helper import (
+    convert_dot_str_to_networkx_graph,
+    convert_dot_str_to_networkx_graph_with_pydot,
+)
+
+my_dir = os.path.dirname(__file__)
+rel_dot_path = "../../data/graph/{}.dot"
+
+
+def assert_same_graph(test_case: unittest.TestCase, g: Graph, h: Graph) -> None:
+    test_case.assertEqual(type(g), type(h))
+    test_case.assertEqual(g.graph, h.graph)
+    test_case.assertEqual(list(g.nodes(data=True)), list(h.nodes(data=True)))
+    test_case.assertEqual(
+        list(g.edges(keys=True, data=True)), list(h.edges(keys=True, data=True))
+    )
+
+
+class TestDotParserHelper(unittest.TestCase):
+    def test_bundled_dot_files(self) -> None:
+        for dot_name in ["sample", "example"]:
+            dot_str = read_str_from_file(
+                os.path.join(my_dir, rel_dot_path.format(dot_name))
+            )
+            assert_same_graph(
+                self,
+                parse_plan_graph_dot_str(dot_str),
+                convert_dot_str_to_networkx_graph_with_pydot(dot_str),
+            )
+
+    def test_parallel_edges_and_quoted_ids(self) -> None:
+        dot_str = """digraph plans {
+node0 [ shape="rectangle", label="node0\\nAtom at(ball1, rooma)
+\\n" ];
+"node 1" [ label="say \\"hi\\"" ]
+node0  ->  "node 1" [ label="move(rooma roomb) " ]
+node0  ->  "node 1" [ label="fly(rooma roomb) " ]
+node0 -> node2 [ label=pick, weight=2 ]
+}
+"""
+        g = parse_plan_graph_dot_str(dot_str)
+        assert_same_graph(
+            self, g, convert_dot_str_to_networkx_graph_with_pydot(dot_str)
+        )
+        self.assertEqual(g.graph, {"name": "plans"})
+        self.assertEqual(list(g.nodes), ["node0", "node 1", "node2"])
+        self.assertEqual(g.edges["node0", "node 1", 0]["label"], "move")
+        self.assertEqual(
+            g.edges["node0", "node 1", 1]["label"], '"fly(rooma roomb) "'
+        )
+        self.assertEqual(g.edges["node0", "node2", 0]["weight"], "2")
+
+    def test_unsupported_dot_str(self) -> None:
+        for dot_str in [
+            "graph { a -- b; }",
+            "strict digraph { a -> b }",
+            "digraph { node [shape=box]; a -> b }",
+            "digraph { rankdir=LR; a -> b }",
+            "digraph { a -> b -> c }",
+            "digraph { subgraph s { a } }",
+            "digraph { // comment\n a -> b }",
+            "digraph { a -> b",
+        ]:
+            with self.assertRaises(ValueError):
+                parse_plan_graph_dot_str(dot_str)
+
+    def test_pydot_fallback(self) -> None:
+        g = convert_dot_str_to_networkx_graph("graph { a -- b; b -- c; }")
+        self.assertEqual(g.number_of_edges(), 2)
+        g = convert_dot_str_to_networkx_graph(
+            'digraph { a -> b -> c [label="x(y) "] }'
+        )
+        self.assertEqual(g.edges["a", "b", 0]["label"], "x")
+
+    def test_get_normalized_edge_label(self) -> None:
+        self.assertEqual(
+            get_normalized_edge_label('"pick(ball1 rooma left) "'), "pick"
+        )
+        self.assertEqual(get_normalized_edge_label('"b_main "'), "b_main")
@@ -13,8 +13,10 @@ from server.helpers.graph_helper.graph_helper import (
     get_all_nodes_coming_from_node,
     get_nodes_to_exclude,
     get_graph_with_number_of_plans_label,
+    get_depth_action_plan_hashes_dict,
+    get_node_edge_name_plan_hash_list,
 )
-from server.planners.drivers.planner_driver_datatype import PlanningResult
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
 from server.helpers.planner_helper.planner_helper_data_types import (
     Landmark,
     LandmarkCategory,
@@ -65,22 +67,14 @@ class TestGraphHelper(unittest.TestCase):
                 quality_bound=1.0,
             )
         )
-        (
-            _,
-            _,
-            TestGraphHelper.test_graph,
-            _,
-            _,
-            _,
-            edge_label_nodes_dict,
-            node_dist_from_initial_state,
-            node_dist_from_end_state,
-        ) = get_plan_disambiguator_output_filtered_by_selection_infos(
-            [],
-            TestGraphHelper.gripper_landmarks,
-            TestGraphHelper.gripper_domain,
-            TestGraphHelper.gripper_problem,
-            TestGraphHelper.planner_response_model.plans,
+        TestGraphHelper.test_graph = (
+            get_plan_disambiguator_output_filtered_by_selection_infos(
+                [],
+                TestGraphHelper.gripper_landmarks,
+                TestGraphHelper.gripper_domain,
+                TestGraphHelper.gripper_problem,
+                TestGraphHelper.planner_response_model.plans,
+            ).g
         )
 
     def test_convert_dot_str_to_networkx_graph(self) -> None:
@@ -232,6 +226,41 @@ class TestGraphHelper(unittest.TestCase):
         res, nodes_traversed = get_first_node_with_multiple_out_edges(g, False)
         self.assertGreater(len(res), 1)
 
+    def test_get_first_node_with_multiple_out_edges_long_path(self) -> None:
+        g = nx.MultiDiGraph()
+        num_edges = 5000
+        for idx in range(num_edges):
+            g.add_edge(f"node{idx}", f"node{idx + 1}", label=f"a{idx}")
+        # the last node is reached on two paths, of which the first is kept
+        g.add_edge(f"node{num_edges}", "node_left", label="left")
+        g.add_edge(f"node{num_edges}", "node_right", label="right")
+        g.add_edge("node_left", "node_goal", label="goal")
+        g.add_edge("node_right", "node_goal", label="goal")
+        res, nodes_traversed = get_first_node_with_multiple_out_edges(g, True)
+        self.assertEqual(len(res), 1)
+        self.assertEqual(res[0][0], f"node{num_edges}")
+        self.assertEqual(res[0][2], [f"a{idx}" for idx in range(num_edges)])
+        self.assertEqual(len(nodes_traversed), num_edges + 1)
+
+        res, nodes_traversed = get_first_node_with_multiple_out_edges(g, False)
+        self.assertEqual(
+            res,
+            [
+                (
+                    f"node{num_edges}",
+                    [
+                        (f"node{num_edges}", "node_left"),
+                        (f"node{num_edges}", "node_right"),
+                    ],
+                    ["goal", "left"],
+                )
+            ],
+        )
+        self.assertEqual(
+            nodes_traversed,
+            {"node_goal", "node_left", "node_right", f"node{num_edges}"},
+        )
+
     def test_get_all_nodes_coming_from_node(self) -> None:
         dot_str = ""
         abs_path_to_dot_file = os.path.join(
@@ -266,3 +295,80 @@ class TestGraphHelper(unittest.TestCase):
         )
         num_plans = g.nodes[node]["num_plans"]
         self.assertEqual(num_plans, 1)
+
+    def test_get_depth_action_plan_hashes_dict(self) -> None:
+        plans = [
+            Plan(actions=["pick ball1 rooma left", "move rooma roomb"]),
+            Plan(actions=["PICK ball1  rooma left", "pick ball2 rooma right"]),
+            Plan(actions=["pick ball1 rooma left"], plan_hash="p3"),
+        ]
+        plans[0].plan_hash = "p1"
+        plans[1].plan_hash = "p2"
+        self.assertEqual(
+            get_depth_action_plan_hashes_dict(plans),
+            {
+                (0, "pick ball1 rooma left"): ["p1", "p2", "p3"],
+                (1, "move rooma roomb"): ["p1"],
+                (1, "pick ball2 rooma right"): ["p2"],
+            },
+        )
+
+    def test_get_node_edge_name_plan_hash_list_exact_match(self) -> None:
+        g = nx.MultiDiGraph()
+        g.add_edge("node0", "node1", label="pick ball1 rooma left")
+        g.add_edge("node0", "node2", label="pick ball1 rooma")
+        plan = Plan(actions=["pick ball1 rooma left"], plan_hash="p1")
+        (
+            node_plan_hashes_dict,
+            edge_plan_hash_dict,
+            edge_label_nodes_dict,
+        ) = get_node_edge_name_plan_hash_list(g, [plan], True)
+        # the label of the second edge is only a substring of the action
+        self.assertEqual(edge_plan_hash_dict, {("node0", "node1"): ["p1"]})
+        self.assertEqual(node_plan_hashes_dict["node0"], ["p1"])
+        self.assertEqual(
+            edge_label_nodes_dict,
+            {"pick ball1 rooma left": ["node0"], "pick ball1 rooma": ["node0"]},
+        )
+
+    def test_get_node_edge_name_plan_hash_list_cyclic_graph(self) -> None:
+        g = nx.MultiDiGraph()
+        for source, target, label in [
+            ("node0", "node1", "s"),
+            ("node1", "node2", "a"),
+            ("node2", "node1", "b"),
+            ("node2", "node3", "c"),
+        ]:
+            g.add_edge(source, target, label=label)
+        plans = PlanningResult(
+            plans=[
+                Plan(actions=["s", "a", "c"]),
+                Plan(actions=["s", "a", "b", "a", "c"]),
+            ]
+        ).plans
+        hash_0, hash_1 = [plan.plan_hash for plan in plans]
+        # nodes are not expanded beyond the longest plan
+        (
+            node_plan_hashes_dict,
+            edge_plan_hash_dict,
+            edge_label_nodes_dict,
+        ) = get_node_edge_name_plan_hash_list(g, plans, True)
+        self.assertCountEqual(
+            node_plan_hashes_dict, ["node0", "node1", "node2", "node3"]
+        )
+        self.assertEqual(
+            edge_plan_hash_dict,
+            {
+                ("node0", "node1"): [hash_0, hash_1],
+                ("node1", "node2"): [hash_0, hash_1, hash_1],
+                ("node2", "node1"): [hash_1],
+                ("node2", "node3"): [hash_0, hash_1],
+            },
+        )
+        self.assertEqual(
+            {
+                edge_label: set(nodes)
+                for edge_label, nodes in edge_label_nodes_dict.items()
+            },
+            {"s": {"node0"}, "a": {"node1"}, "b": {"node2"}, "c": {"node2"}},
+        )
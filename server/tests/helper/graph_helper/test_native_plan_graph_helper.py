@@ -0,0 +1,246 @@
+import json
+import os
+import unittest
+from typing import Any, Dict, List
+from unittest import mock
+
+from networkx import Graph
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.graph_helper import plan_graph_cache_helper
+from server.helpers.graph_helper.dot_parser_helper import (
+    parse_plan_graph_dot_str,
+)
+from server.helpers.graph_helper.native_plan_graph_helper import (
+    build_native_plan_graph,
+    get_dot_str,
+)
+from server.helpers.planner_helper.planner_helper import (
+    get_dot_graph_str,
+    get_native_plan_graph,
+)
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanGraphBackend,
+    PlanningTask,
+)
+from server.helpers.planner_helper.sas_task_helper import get_sas_task
+from server.planners.drivers.forbid_iterative_planner_driver import (
+    get_plans_dot,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}"
+
+
+def get_sorted_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: sorted(value) if isinstance(value, list) else value
+        for key, value in attributes.items()
+    }
+
+
+def assert_same_plan_graph(
+    test_case: unittest.TestCase, g: Graph, h: Graph
+) -> None:
+    # plan hashes are annotated in no particular order
+    test_case.assertEqual(
+        {
+            node: get_sorted_attributes(data)
+            for node, data in g.nodes(data=True)
+        },
+        {
+            node: get_sorted_attributes(data)
+            for node, data in h.nodes(data=True)
+        },
+    )
+    test_case.assertEqual(
+        sorted(g.edges(keys=True, data="label")),
+        sorted(h.edges(keys=True, data="label")),
+    )
+
+
+class TestNativePlanGraphHelper(unittest.TestCase):
+    gripper_domain: str
+    gripper_problem: str
+    gripper_plans: List[Plan]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestNativePlanGraphHelper.gripper_domain = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/domain.pddl"))
+        )
+        TestNativePlanGraphHelper.gripper_problem = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/problem.pddl"))
+        )
+        TestNativePlanGraphHelper.gripper_plans = PlanningResult(
+            plans=[
+                Plan.model_validate(item)
+                for item in json.loads(
+                    read_str_from_file(
+                        os.path.join(
+                            my_dir, rel_pddl_path.format("gripper/plans.json")
+                        )
+                    )
+                )
+            ]
+        ).plans
+
+    def test_same_graph_as_forbiditerative(self) -> None:
+        domain = TestNativePlanGraphHelper.gripper_domain
+        problem = TestNativePlanGraphHelper.gripper_problem
+        plans = TestNativePlanGraphHelper.gripper_plans
+        native_plan_graph = build_native_plan_graph(
+            get_sas_task(domain, problem), plans
+        )
+        assert_same_plan_graph(
+            self,
+            native_plan_graph.graph,
+            parse_plan_graph_dot_str(get_plans_dot(domain, problem, plans)),
+        )
+        assert_same_plan_graph(
+            self,
+            native_plan_graph.graph,
+            parse_plan_graph_dot_str(get_dot_str(native_plan_graph.graph)),
+        )
+
+    def test_plan_hashes(self) -> None:
+        plans = TestNativePlanGraphHelper.gripper_plans[:2]
+        native_plan_graph = build_native_plan_graph(
+            get_sas_task(
+                TestNativePlanGraphHelper.gripper_domain,
+                TestNativePlanGraphHelper.gripper_problem,
+            ),
+            plans,
+        )
+        # every plan passes through the initial state and its own edges
+        self.assertEqual(
+            native_plan_graph.node_plan_hashes_dict["node0"],
+            [plan.plan_hash for plan in plans],
+        )
+        edge_plan_hash_dict = native_plan_graph.edge_plan_hash_dict
+        for plan in plans:
+            edges = [
+                edge
+                for edge, plan_hashes in edge_plan_hash_dict.items()
+                if plan.plan_hash in plan_hashes
+            ]
+            self.assertEqual(len(edges), len(plan.actions))
+
+    def test_same_annotations_as_forbiditerative(self) -> None:
+        domain = TestNativePlanGraphHelper.gripper_domain
+        problem = TestNativePlanGraphHelper.gripper_problem
+        plans = TestNativePlanGraphHelper.gripper_plans
+        with mock.patch.object(
+            plan_graph_cache_helper,
+            "PLAN_GRAPH_BACKEND",
+            PlanGraphBackend.FORBIDITERATIVE.value,
+        ):
+            plan_graph = plan_graph_cache_helper.build_plan_graph(
+                domain, problem, plans
+            )
+        with mock.patch.object(
+            plan_graph_cache_helper,
+            "PLAN_GRAPH_BACKEND",
+            PlanGraphBackend.NATIVE.value,
+        ):
+            native_plan_graph = plan_graph_cache_helper.build_plan_graph(
+                domain, problem, plans
+            )
+        self.assertIsNotNone(plan_graph.reachability_index.get())
+        # the plans of a node are listed in no particular order
+        self.assertEqual(
+            *[
+                {
+                    node: sorted(plan_hashes)
+                    for node, plan_hashes in graph.node_plan_hashes_dict.items()
+                }
+                for graph in [plan_graph, native_plan_graph]
+            ],
+        )
+        self.assertEqual(
+            plan_graph.edge_plan_hash_dict,
+            native_plan_graph.edge_plan_hash_dict,
+        )
+        # nodes are listed in the order the graphs have them
+        self.assertEqual(
+            *[
+                {
+                    edge_label: sorted(nodes)
+                    for edge_label, nodes in graph.edge_label_nodes_dict.items()
+                }
+                for graph in [plan_graph, native_plan_graph]
+            ],
+        )
+
+    def test_invalid_plans(self) -> None:
+        sas_task = get_sas_task(
+            TestNativePlanGraphHelper.gripper_domain,
+            TestNativePlanGraphHelper.gripper_problem,
+        )
+        plan = TestNativePlanGraphHelper.gripper_plans[0]
+        for actions in [["fly rooma roomb"], plan.actions[1:]]:
+            with self.assertRaises(ValueError):
+                build_native_plan_graph(sas_task, [Plan(actions=actions)])
+
+    def test_backend(self) -> None:
+        planning_task = PlanningTask(
+            domain=TestNativePlanGraphHelper.gripper_domain,
+            problem=TestNativePlanGraphHelper.gripper_problem,
+        )
+        planning_result = PlanningResult(
+            plans=TestNativePlanGraphHelper.gripper_plans
+        )
+        assert_same_plan_graph(
+            self,
+            parse_plan_graph_dot_str(
+                get_dot_graph_str(
+                    planning_task,
+                    planning_result,
+                    backend=PlanGraphBackend.NATIVE.value,
+                )
+            ),
+            parse_plan_graph_dot_str(
+                get_dot_graph_str(
+                    planning_task,
+                    planning_result,
+                    backend=PlanGraphBackend.FORBIDITERATIVE.value,
+                )
+            ),
+        )
+
+        plans = TestNativePlanGraphHelper.gripper_plans[:3]
+        plan_graphs = list()
+        for backend in PlanGraphBackend:
+            with mock.patch.object(
+                plan_graph_cache_helper, "PLAN_GRAPH_BACKEND", backend.value
+            ):
+                plan_graphs.append(
+                    plan_graph_cache_helper.build_plan_graph(
+                        planning_task.domain, planning_task.problem, plans
+                    )
+                )
+        assert_same_plan_graph(self, plan_graphs[0].graph, plan_graphs[1].graph)
+        self.assertEqual(
+            plan_graphs[0].node_dist_from_end_state,
+            plan_graphs[1].node_dist_from_end_state,
+        )
+        self.assertEqual(
+            plan_graphs[0].edge_plan_hash_dict,
+            plan_graphs[1].edge_plan_hash_dict,
+        )
+
+    def test_fallback(self) -> None:
+        planning_task = PlanningTask(
+            domain=TestNativePlanGraphHelper.gripper_domain,
+            problem=TestNativePlanGraphHelper.gripper_problem,
+        )
+        planning_result = PlanningResult(
+            plans=[Plan(actions=["fly rooma roomb"])]
+        )
+        with self.assertLogs(
+            "server.helpers.planner_helper.planner_helper", level="WARNING"
+        ):
+            self.assertIsNone(
+                get_native_plan_graph(planning_task, planning_result)
+            )
@@ -0,0 +1,232 @@
+import json
+import os
+import unittest
+from typing import List
+from unittest import mock
+
+from networkx import MultiDiGraph
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.graph_helper import plan_graph_cache_helper
+from server.helpers.graph_helper.native_plan_graph_helper import get_dot_str
+from server.helpers.plan_disambiguator_helper import plan_disambiguator_helper
+from server.helpers.graph_helper.plan_graph_cache_helper import (
+    get_annotated_plan_graph,
+    get_plan_graph,
+    get_plan_graph_cache_stats,
+    get_plan_graph_size,
+    plan_graph_cache,
+)
+from server.helpers.planner_helper.plan_store_helper import get_hashed_plans
+from server.helpers.planner_helper.planner_helper_data_types import (
+    SelectionInfo,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}"
+
+
+class TestPlanGraphCacheHelper(unittest.TestCase):
+    gripper_domain: str
+    gripper_problem: str
+    gripper_plans: List[Plan]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestPlanGraphCacheHelper.gripper_domain = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/domain.pddl"))
+        )
+        TestPlanGraphCacheHelper.gripper_problem = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/problem.pddl"))
+        )
+        TestPlanGraphCacheHelper.gripper_plans = [
+            Plan.model_validate(item)
+            for item in json.loads(
+                read_str_from_file(
+                    os.path.join(
+                        my_dir, rel_pddl_path.format("gripper/plans.json")
+                    )
+                )
+            )
+        ]
+
+    def test_get_plan_graph(self) -> None:
+        plans = TestPlanGraphCacheHelper.gripper_plans[:3]
+        stats_before = get_plan_graph_cache_stats()
+        plan_graph = get_plan_graph(
+            TestPlanGraphCacheHelper.gripper_domain,
+            TestPlanGraphCacheHelper.gripper_problem,
+            plans,
+        )
+        self.assertGreater(len(plan_graph.dot_str), 0)
+        self.assertGreater(len(plan_graph.graph.nodes), 0)
+        self.assertEqual(
+            len(plan_graph.node_plan_hashes_dict), len(plan_graph.graph.nodes)
+        )
+        # the plan graph keeps hashed copies of the plans of the request,
+        # which are left as they are
+        for plan, stored_plan in zip(plans, plan_graph.plan_store.plans):
+            self.assertIsNone(plan.plan_hash)
+            self.assertIsNot(stored_plan, plan)
+            self.assertEqual(stored_plan.actions, plan.actions)
+            self.assertIsNotNone(stored_plan.plan_hash)
+
+        # the same set of plans in a different order is a cache hit
+        plan_graph_reordered = get_plan_graph(
+            TestPlanGraphCacheHelper.gripper_domain,
+            TestPlanGraphCacheHelper.gripper_problem,
+            list(reversed(plans)),
+        )
+        self.assertIs(plan_graph_reordered, plan_graph)
+        stats_after = get_plan_graph_cache_stats()
+        self.assertEqual(stats_after.hits, stats_before.hits + 1)
+        self.assertEqual(stats_after.misses, stats_before.misses + 1)
+
+        plan_graph_subset = get_plan_graph(
+            TestPlanGraphCacheHelper.gripper_domain,
+            TestPlanGraphCacheHelper.gripper_problem,
+            plans[:2],
+        )
+        self.assertIsNot(plan_graph_subset, plan_graph)
+
+    def test_reachability_index_is_built_on_first_use(self) -> None:
+        plan_graph_cache.clear()
+        plan_graph = get_plan_graph(
+            TestPlanGraphCacheHelper.gripper_domain,
+            TestPlanGraphCacheHelper.gripper_problem,
+            TestPlanGraphCacheHelper.gripper_plans[:2],
+        )
+        self.assertFalse(plan_graph.reachability_index.is_built)
+        size = plan_graph_cache.size
+        self.assertIsNotNone(plan_graph.reachability_index.get())
+        self.assertTrue(plan_graph.reachability_index.is_built)
+        # the index is charged to the cache once it is built
+        self.assertGreater(plan_graph_cache.size, size)
+        self.assertEqual(plan_graph_cache.size, get_plan_graph_size(plan_graph))
+
+    def test_plan_graph_is_reused(self) -> None:
+        domain = TestPlanGraphCacheHelper.gripper_domain
+        problem = TestPlanGraphCacheHelper.gripper_problem
+        plans = get_hashed_plans(TestPlanGraphCacheHelper.gripper_plans[:4])
+        plan_graph = get_plan_graph(domain, problem, plans)
+        self.assertEqual(list(plan_graph.plan_store.plans), plans)
+        for plan, stored_plan in zip(plans, plan_graph.plan_store.plans):
+            self.assertIsNot(stored_plan, plan)
+            self.assertIsNot(stored_plan.actions, plan.actions)
+        self.assertIs(
+            plan_graph.plan_set.plan_index, plan_graph.plan_store.plan_index
+        )
+        with mock.patch.object(
+            plan_graph_cache_helper,
+            "build_plan_graph",
+            side_effect=AssertionError("the plan graph is built again"),
+        ):
+            filtered_output = plan_disambiguator_helper.get_plan_disambiguator_output_filtered_by_selection_infos(
+                [], [], domain, problem, plans
+            )
+            self.assertIs(filtered_output.plan_graph, plan_graph)
+            selected_plan_hashes = [
+                plan.plan_hash
+                for plan in [plans[1], plans[3]]
+                if plan.plan_hash is not None
+            ]
+            filtered_output = plan_disambiguator_helper.get_plan_disambiguator_output_filtered_by_selection_infos(
+                [SelectionInfo(selected_plan_hashes=selected_plan_hashes)],
+                [],
+                domain,
+                problem,
+                plans,
+                plan_graph,
+            )
+        self.assertEqual(len(filtered_output.selected_plans), 2)
+        self.assertIs(filtered_output.selected_plans[0], plans[1])
+        self.assertIs(filtered_output.selected_plans[1], plans[3])
+        self.assertEqual(
+            sorted(
+                filtered_output.plan_graph.plan_store.plan_index.plan_hashes
+            ),
+            sorted(selected_plan_hashes),
+        )
+
+    def test_plans_of_a_shuffled_request(self) -> None:
+        domain = TestPlanGraphCacheHelper.gripper_domain
+        problem = TestPlanGraphCacheHelper.gripper_problem
+        plans = get_hashed_plans(TestPlanGraphCacheHelper.gripper_plans[1:5])
+        plan_graph = get_plan_graph(domain, problem, plans)
+        shuffled_plans = [
+            plans[2].model_copy(),
+            plans[0].model_copy(),
+            plans[3].model_copy(),
+            plans[1].model_copy(),
+        ]
+        # the plan graph of the same plans in another order is shared, but
+        # the plans are selected from the plans of the request in their order
+        filtered_output = plan_disambiguator_helper.get_plan_disambiguator_output_filtered_by_selection_infos(
+            [], [], domain, problem, shuffled_plans
+        )
+        self.assertIs(filtered_output.plan_graph, plan_graph)
+        self.assertEqual(
+            len(filtered_output.selected_plans), len(shuffled_plans)
+        )
+        for selected_plan, plan in zip(
+            filtered_output.selected_plans, shuffled_plans
+        ):
+            self.assertIs(selected_plan, plan)
+        selected_plan_hashes = [
+            plan.plan_hash
+            for plan in [shuffled_plans[3], shuffled_plans[1]]
+            if plan.plan_hash is not None
+        ]
+        filtered_output = plan_disambiguator_helper.get_plan_disambiguator_output_filtered_by_selection_infos(
+            [SelectionInfo(selected_plan_hashes=selected_plan_hashes)],
+            [],
+            domain,
+            problem,
+            shuffled_plans,
+        )
+        self.assertEqual(len(filtered_output.selected_plans), 2)
+        self.assertIs(filtered_output.selected_plans[0], shuffled_plans[1])
+        self.assertIs(filtered_output.selected_plans[1], shuffled_plans[3])
+
+    def test_get_annotated_plan_graph_cyclic_graph(self) -> None:
+        g = MultiDiGraph(name="G")
+        for source, target, label in [
+            ("node0", "node1", "s"),
+            ("node1", "node2", "a"),
+            ("node2", "node1", "b"),
+            ("node2", "node3", "c"),
+        ]:
+            g.add_edge(source, target, label=label)
+        plans = PlanningResult(
+            plans=[
+                Plan(actions=["s", "a", "c"]),
+                Plan(actions=["s", "a", "b", "a", "c"]),
+            ]
+        ).plans
+        hash_0, hash_1 = [plan.plan_hash for plan in plans]
+        plan_graph = get_annotated_plan_graph(get_dot_str(g), g, plans)
+        # an edge at a depth is annotated with the plans taking its action at
+        # that depth, up to the longest plan
+        self.assertEqual(
+            plan_graph.edge_plan_hash_dict,
+            {
+                ("node0", "node1"): [hash_0, hash_1],
+                ("node1", "node2"): [hash_0, hash_1, hash_1],
+                ("node2", "node1"): [hash_1],
+                ("node2", "node3"): [hash_0, hash_1],
+            },
+        )
+        # the plans are followed through the cycle to project the plan graph
+        assert plan_graph.plan_edges_dict is not None and hash_1 is not None
+        self.assertEqual(
+            plan_graph.plan_edges_dict[hash_1],
+            [
+                ("node0", "node1", 0),
+                ("node1", "node2", 0),
+                ("node2", "node1", 0),
+                ("node1", "node2", 0),
+                ("node2", "node3", 0),
+            ],
+        )
+        self.assertIsNone(plan_graph.reachability_index.get())
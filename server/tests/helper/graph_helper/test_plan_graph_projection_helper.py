@@ -0,0 +1,135 @@
+import json
+import os
+import unittest
+from typing import List
+from unittest import mock
+
+from networkx import Graph
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.graph_helper import plan_graph_cache_helper
+from server.helpers.graph_helper.dot_parser_helper import (
+    parse_plan_graph_dot_str,
+)
+from server.helpers.graph_helper.plan_graph_projection_helper import (
+    get_plan_edges_dict,
+    get_projected_plan_graph,
+)
+from server.planners.drivers.forbid_iterative_planner_driver import (
+    get_plans_dot,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}"
+
+
+class TestPlanGraphProjectionHelper(unittest.TestCase):
+    gripper_domain: str
+    gripper_problem: str
+    gripper_plans: List[Plan]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestPlanGraphProjectionHelper.gripper_domain = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/domain.pddl"))
+        )
+        TestPlanGraphProjectionHelper.gripper_problem = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/problem.pddl"))
+        )
+        TestPlanGraphProjectionHelper.gripper_plans = PlanningResult(
+            plans=[
+                Plan.model_validate(item)
+                for item in json.loads(
+                    read_str_from_file(
+                        os.path.join(
+                            my_dir, rel_pddl_path.format("gripper/plans.json")
+                        )
+                    )
+                )
+            ]
+        ).plans
+
+    def get_plan_graph(self, plans: List[Plan]) -> Graph:
+        return parse_plan_graph_dot_str(
+            get_plans_dot(
+                TestPlanGraphProjectionHelper.gripper_domain,
+                TestPlanGraphProjectionHelper.gripper_problem,
+                plans,
+            )
+        )
+
+    def test_get_plan_edges_dict(self) -> None:
+        plans = TestPlanGraphProjectionHelper.gripper_plans
+        g = self.get_plan_graph(plans)
+        plan_edges_dict = get_plan_edges_dict(g, plans)
+        assert plan_edges_dict is not None
+        for plan in plans:
+            plan_edges = plan_edges_dict[plan.plan_hash]  # type: ignore
+            self.assertEqual(len(plan_edges), len(plan.actions))
+            self.assertEqual(plan_edges[0][0], "node0")
+            self.assertEqual(
+                [g.edges[edge]["label"] for edge in plan_edges], plan.actions
+            )
+
+        # a plan not in the graph cannot be followed
+        self.assertIsNone(
+            get_plan_edges_dict(g, [Plan(actions=["fly rooma roomb"])])
+        )
+
+    def test_get_projected_plan_graph(self) -> None:
+        plans = TestPlanGraphProjectionHelper.gripper_plans
+        g = self.get_plan_graph(plans)
+        plan_edges_dict = get_plan_edges_dict(g, plans)
+        assert plan_edges_dict is not None
+        for selected_plans in [plans[3:5], plans[:1], list(reversed(plans))]:
+            projected_graph = get_projected_plan_graph(
+                g, plan_edges_dict, selected_plans
+            )
+            assert projected_graph is not None
+            # the same graph as dumped for the selected plans
+            selected_plans_graph = self.get_plan_graph(selected_plans)
+            self.assertEqual(
+                dict(projected_graph.nodes(data=True)),
+                dict(selected_plans_graph.nodes(data=True)),
+            )
+            self.assertEqual(
+                sorted(projected_graph.edges(keys=True, data="label")),
+                sorted(selected_plans_graph.edges(keys=True, data="label")),
+            )
+
+        self.assertIsNone(
+            get_projected_plan_graph(
+                g, plan_edges_dict, [Plan(actions=[], plan_hash="unknown")]
+            )
+        )
+
+    def test_get_plan_graph_projected(self) -> None:
+        domain = TestPlanGraphProjectionHelper.gripper_domain
+        problem = TestPlanGraphProjectionHelper.gripper_problem
+        plans = TestPlanGraphProjectionHelper.gripper_plans
+        plan_graph_cache_helper.plan_graph_cache.clear()
+        plan_graph_cache_helper.get_plan_graph(domain, problem, plans)
+        with mock.patch.object(
+            plan_graph_cache_helper,
+            "get_dot_str_and_graph",
+            side_effect=AssertionError("the plan graph is not projected"),
+        ):
+            plan_graph = plan_graph_cache_helper.get_plan_graph(
+                domain, problem, plans[1:4], all_plans=plans
+            )
+        expected_plan_graph = plan_graph_cache_helper.build_plan_graph(
+            domain, problem, plans[1:4]
+        )
+        self.assertEqual(
+            dict(plan_graph.graph.nodes(data="label")),
+            dict(expected_plan_graph.graph.nodes(data="label")),
+        )
+        self.assertEqual(
+            plan_graph.node_dist_from_initial_state,
+            expected_plan_graph.node_dist_from_initial_state,
+        )
+        self.assertEqual(
+            plan_graph.edge_plan_hash_dict,
+            expected_plan_graph.edge_plan_hash_dict,
+        )
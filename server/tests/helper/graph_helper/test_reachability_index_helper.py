@@ -0,0 +1,120 @@
+import itertools
+import os
+import unittest
+
+import networkx as nx
+from networkx import MultiDiGraph
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.graph_helper.compact_graph_helper import (
+    get_compact_graph,
+)
+from server.helpers.graph_helper.graph_helper import (
+    convert_dot_str_to_networkx_graph,
+    get_dict_from_graph,
+    get_first_node_with_multiple_out_edges,
+    get_graph_upto_nodes,
+    get_nodes_to_exclude,
+)
+from server.helpers.graph_helper.reachability_index_helper import (
+    get_reachability_index,
+    get_reachable_nodes,
+)
+
+my_dir = os.path.dirname(__file__)
+rel_dot_path = "../../data/graph/{}.dot"
+
+
+def get_graph(name: str) -> MultiDiGraph:
+    return convert_dot_str_to_networkx_graph(
+        read_str_from_file(os.path.join(my_dir, rel_dot_path.format(name)))
+    )
+
+
+class TestReachabilityIndexHelper(unittest.TestCase):
+    def test_get_reachability_index(self) -> None:
+        g = get_graph("sample")
+        cg = get_compact_graph(g)
+        reachability_index = get_reachability_index(cg)
+        assert reachability_index is not None
+        for node in g:
+            self.assertEqual(
+                get_reachable_nodes(cg, reachability_index, {node}, [], True),
+                nx.descendants(g, node),
+            )
+            self.assertEqual(
+                get_reachable_nodes(cg, reachability_index, {node}, [], False),
+                nx.ancestors(g, node),
+            )
+        self.assertIsNone(
+            get_reachability_index(get_compact_graph(get_graph("example")))
+        )
+
+    def test_get_reachable_nodes_excluded_node_reachable(self) -> None:
+        g = MultiDiGraph([("a", "b"), ("b", "c"), ("c", "d")])
+        cg = get_compact_graph(g)
+        reachability_index = get_reachability_index(cg)
+        assert reachability_index is not None
+        self.assertIsNone(
+            get_reachable_nodes(cg, reachability_index, {"a"}, {"c"}, True)
+        )
+        # reaching another node to start is not passing through it
+        self.assertEqual(
+            get_reachable_nodes(
+                cg, reachability_index, {"a", "b"}, {"a", "b"}, True
+            ),
+            {"c", "d"},
+        )
+
+    def test_get_nodes_to_exclude(self) -> None:
+        g = get_graph("sample")
+        cg = get_compact_graph(g)
+        reachability_index = get_reachability_index(cg)
+        for is_forward in [True, False]:
+            (
+                node_search_results,
+                nodes_traversed,
+            ) = get_first_node_with_multiple_out_edges(cg, is_forward)
+            nodes_to_end = {
+                edge[1 if is_forward else 0]
+                for _, edges, _ in node_search_results
+                for edge in edges
+            }
+            for num_nodes in range(1, 3):
+                for nodes_to_start in itertools.combinations(
+                    sorted(g), num_nodes
+                ):
+                    for nodes in [nodes_traversed, set(), nodes_to_end]:
+                        self.assertEqual(
+                            get_nodes_to_exclude(
+                                cg,
+                                set(nodes_to_start),
+                                nodes,
+                                is_forward,
+                                reachability_index,
+                            ),
+                            get_nodes_to_exclude(
+                                g, set(nodes_to_start), nodes, is_forward
+                            ),
+                        )
+
+    def test_get_graph_upto_nodes(self) -> None:
+        g = get_graph("sample")
+        cg = get_compact_graph(g)
+        graph_upto_nodes = get_graph_upto_nodes(
+            g,
+            {"node2"},
+            {"node0", "node1"},
+            True,
+            cg,
+            get_reachability_index(cg),
+        )
+        self.assertTrue(nx.is_frozen(graph_upto_nodes))
+        expected_graph = g.copy()
+        expected_graph.remove_nodes_from(
+            get_nodes_to_exclude(g, {"node2"}, {"node0", "node1"}, True)
+        )
+        self.assertEqual(
+            get_dict_from_graph(graph_upto_nodes),
+            get_dict_from_graph(expected_graph),
+        )
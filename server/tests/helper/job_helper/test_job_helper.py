@@ -0,0 +1,184 @@
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from server.helpers.common_helper.executor_helper import PlannerExecutor
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.job_helper.job_helper import (
+    PlanningJob,
+    PlanningJobManager,
+)
+from server.helpers.job_helper.job_helper_data_types import (
+    PlanningJobPlanner,
+    PlanningJobStatus,
+)
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanningTask,
+)
+from server.helpers.planner_helper.planning_result_cache_helper import (
+    planning_result_cache,
+)
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}/{}.pddl"
+
+# writes plans like symk does, one plan file per plan, one plan per second
+FAKE_SYMK_PLANNER = """#!{python}
+import sys
+import time
+
+plan_file = sys.argv[sys.argv.index("--plan-file") + 1]
+for idx, actions in enumerate([["a"], ["b", "c"], ["d"]]):
+    with open(f"{{plan_file}}.{{idx + 1}}", "w") as f:
+        f.write("".join(f"({{action}})\\n" for action in actions))
+        f.write(f"; cost = {{len(actions)}} (unit cost)\\n")
+    time.sleep(1.0)
+"""
+
+
+def get_planning_task(
+    domain_name: str, num_plans: int, quality_bound: float
+) -> PlanningTask:
+    return PlanningTask(
+        domain=read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format(domain_name, "domain"))
+        ),
+        problem=read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format(domain_name, "problem"))
+        ),
+        num_plans=num_plans,
+        quality_bound=quality_bound,
+    )
+
+
+def wait_for_job(
+    job_manager: PlanningJobManager, job: PlanningJob, timeout: float = 120.0
+) -> None:
+    deadline = time.monotonic() + timeout
+    while not job.is_finished() and time.monotonic() < deadline:
+        job_manager.get_job(job.job_id)
+        time.sleep(0.1)
+
+
+class TestJobHelper(unittest.TestCase):
+    def setUp(self) -> None:
+        # planners write their files in the working directory
+        self.cwd = os.getcwd()
+        self.run_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.run_dir.name)
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.run_dir.cleanup()
+
+    def test_planning_job_succeeds(self) -> None:
+        planning_result_cache.clear()
+        job_manager = PlanningJobManager()
+        planning_task = get_planning_task("toy", 3, 1.5)
+        job = job_manager.submit_job(planning_task)
+        # the job runs once a worker of the planner executor picks it up
+        self.assertIn(
+            job.status, {PlanningJobStatus.PENDING, PlanningJobStatus.RUNNING}
+        )
+        wait_for_job(job_manager, job)
+        self.assertIs(job_manager.get_job(job.job_id), job)
+        job_info = job.get_job_info()
+        self.assertEqual(job_info.status, PlanningJobStatus.SUCCEEDED)
+        assert job_info.planning_result is not None
+        self.assertGreater(len(job_info.planning_result.plans), 0)
+        # the result is shared with the planning result cache
+        job = job_manager.submit_job(planning_task)
+        self.assertEqual(job.status, PlanningJobStatus.SUCCEEDED)
+
+    def test_cancel_planning_job(self) -> None:
+        job_manager = PlanningJobManager()
+        job = job_manager.submit_job(get_planning_task("gripper", 1000, 10.0))
+        time.sleep(1.0)
+        job_manager.cancel_job(job.job_id)
+        wait_for_job(job_manager, job, 10.0)
+        self.assertEqual(job.status, PlanningJobStatus.CANCELLED)
+        self.assertIsNone(job.get_job_info().planning_result)
+
+    def test_cancel_pending_planning_job(self) -> None:
+        job_manager = PlanningJobManager(
+            executor=PlannerExecutor(max_workers=1)
+        )
+        running_job = job_manager.submit_job(
+            get_planning_task("gripper", 1000, 10.0)
+        )
+        pending_job = job_manager.submit_job(
+            get_planning_task("gripper", 999, 10.0)
+        )
+        time.sleep(0.5)
+        self.assertEqual(pending_job.status, PlanningJobStatus.PENDING)
+        job_manager.cancel_job(pending_job.job_id)
+        self.assertEqual(pending_job.status, PlanningJobStatus.CANCELLED)
+        job_manager.cancel_job(running_job.job_id)
+        wait_for_job(job_manager, running_job, 10.0)
+        self.assertEqual(running_job.status, PlanningJobStatus.CANCELLED)
+
+    def test_planning_jobs_share_planner_executor(self) -> None:
+        executor = PlannerExecutor(max_workers=1, max_queue_size=0)
+        job_manager = PlanningJobManager(executor=executor)
+        job = job_manager.submit_job(get_planning_task("gripper", 1000, 10.0))
+        self.assertEqual(executor.num_calls, 1)
+        # neither planner calls nor further jobs get a slot while it runs
+        with self.assertRaises(HTTPException) as context:
+            executor.acquire()
+        self.assertEqual(context.exception.status_code, 503)
+        with self.assertRaises(HTTPException):
+            job_manager.submit_job(get_planning_task("gripper", 999, 10.0))
+        job_manager.cancel_job(job.job_id)
+        wait_for_job(job_manager, job, 10.0)
+        self.assertEqual(job.status, PlanningJobStatus.CANCELLED)
+        deadline = time.monotonic() + 10.0
+        while executor.num_calls > 0 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        self.assertEqual(executor.num_calls, 0)
+
+    def test_planning_job_shows_plans_found_so_far(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bin_path = Path(temp_dir) / "fake-downward.py"
+            bin_path.write_text(FAKE_SYMK_PLANNER.format(python=sys.executable))
+            bin_path.chmod(bin_path.stat().st_mode | stat.S_IEXEC)
+            job_manager = PlanningJobManager(symk_bin_path=bin_path)
+            planning_task = PlanningTask(
+                domain=f"(define (domain {os.path.basename(temp_dir)}))",
+                problem="(define (problem p))",
+                num_plans=3,
+                quality_bound=2.0,
+            )
+            job = job_manager.submit_job(planning_task, PlanningJobPlanner.SYMK)
+            deadline = time.monotonic() + 60.0
+            job_info = job.get_job_info()
+            while (
+                job_info.planning_result is None and time.monotonic() < deadline
+            ):
+                time.sleep(0.1)
+                job_info = job.get_job_info()
+            # the plans found so far are shown while the job runs
+            self.assertEqual(job_info.status, PlanningJobStatus.RUNNING)
+            assert job_info.planning_result is not None
+            self.assertLess(len(job_info.planning_result.plans), 3)
+            self.assertEqual(job_info.planning_result.plans[0].actions, ["a"])
+
+            wait_for_job(job_manager, job)
+            job_info = job.get_job_info()
+            self.assertEqual(job_info.status, PlanningJobStatus.SUCCEEDED)
+            assert job_info.planning_result is not None
+            self.assertEqual(
+                [plan.actions for plan in job_info.planning_result.plans],
+                [["a"], ["b", "c"], ["d"]],
+            )
+            self.assertEqual(job_info.planner, PlanningJobPlanner.SYMK)
+
+    def test_unknown_planning_job(self) -> None:
+        job_manager = PlanningJobManager()
+        self.assertIsNone(job_manager.get_job("unknown"))
+        self.assertIsNone(job_manager.cancel_job("unknown"))
@@ -0,0 +1,112 @@
+import json
+import os
+import unittest
+from typing import List, Optional
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.plan_disambiguator_helper.compact_output_helper import (
+    get_compact_plan_disambiguator_output,
+    get_plan_indices_from_plan_mask,
+    get_plan_mask,
+)
+from server.helpers.plan_disambiguator_helper.selection_flow_helper import (
+    get_selection_flow_output,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}"
+
+
+class TestCompactOutputHelper(unittest.TestCase):
+    gripper_domain: str
+    gripper_problem: str
+    gripper_plans: List[Plan]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestCompactOutputHelper.gripper_domain = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/domain.pddl"))
+        )
+        TestCompactOutputHelper.gripper_problem = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/problem.pddl"))
+        )
+        TestCompactOutputHelper.gripper_plans = PlanningResult(
+            plans=[
+                Plan.model_validate(item)
+                for item in json.loads(
+                    read_str_from_file(
+                        os.path.join(
+                            my_dir, rel_pddl_path.format("gripper/plans.json")
+                        )
+                    )
+                )
+            ]
+        ).plans
+
+    def test_plan_mask(self) -> None:
+        plan_idx_dict = {"a": 0, "b": 1, "c": 4}
+        self.assertEqual(get_plan_mask(["a", "c", "d"], plan_idx_dict), "11")
+        self.assertEqual(get_plan_mask([], plan_idx_dict), "0")
+        self.assertEqual(get_plan_indices_from_plan_mask("11"), [0, 4])
+        self.assertEqual(get_plan_indices_from_plan_mask("0"), [])
+
+    def test_compact_plan_disambiguator_output(self) -> None:
+        plan_disambiguator_output, _, _ = get_selection_flow_output(
+            [],
+            [],
+            TestCompactOutputHelper.gripper_domain,
+            TestCompactOutputHelper.gripper_problem,
+            TestCompactOutputHelper.gripper_plans,
+            None,
+        )
+        compact_output = get_compact_plan_disambiguator_output(
+            plan_disambiguator_output
+        )
+        plan_hashes = [plan.plan_hash for plan in compact_output.plans]
+
+        def get_plan_hashes(plan_mask: str) -> List[Optional[str]]:
+            return [
+                plan_hashes[idx]
+                for idx in get_plan_indices_from_plan_mask(plan_mask)
+            ]
+
+        for choice_info, compact_choice_info in zip(
+            plan_disambiguator_output.choice_infos,
+            compact_output.choice_infos,
+        ):
+            for (
+                action_name,
+                plan_mask,
+            ) in compact_choice_info.action_name_plan_mask.items():
+                self.assertCountEqual(
+                    get_plan_hashes(plan_mask),
+                    choice_info.action_name_plan_hash_map[action_name],
+                )
+        for node in compact_output.networkx_graph["nodes"]:
+            self.assertNotIn("plan_hashes", node)
+            # a plan may pass through a node more than once
+            self.assertEqual(
+                set(get_plan_hashes(node["plan_mask"])),
+                set(
+                    plan_disambiguator_output.node_plan_hashes_dict[node["id"]]
+                ),
+            )
+        for link in compact_output.networkx_graph["links"]:
+            self.assertEqual(
+                set(get_plan_hashes(link["plan_mask"])),
+                set(
+                    plan_disambiguator_output.edge_plan_hashes_dict[
+                        f"{link['source']}_{link['target']}"
+                    ]
+                ),
+            )
+        # the output itself is left as is
+        self.assertIn(
+            "plan_hashes", plan_disambiguator_output.networkx_graph["nodes"][0]
+        )
+        # plan hashes are listed once per node and edge in either output
+        self.assertLess(
+            len(compact_output.model_dump_json()),
+            len(plan_disambiguator_output.model_dump_json()) * 3 / 4,
+        )
@@ -0,0 +1,113 @@
+import json
+import os
+import unittest
+from typing import List, Tuple
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.plan_disambiguator_helper.build_flow_helper import (
+    get_build_flow_output,
+)
+from server.helpers.plan_disambiguator_helper.multi_view_helper import (
+    get_plan_disambiguator_views_output,
+)
+from server.helpers.plan_disambiguator_helper.selection_flow_helper import (
+    get_selection_flow_output,
+)
+from server.helpers.planner_helper.planner_helper_data_types import (
+    Landmark,
+    PlanDisambiguationView,
+    SelectionInfo,
+    SelectionPriority,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}"
+
+
+class TestMultiViewHelper(unittest.TestCase):
+    gripper_domain: str
+    gripper_problem: str
+    gripper_plans: List[Plan]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestMultiViewHelper.gripper_domain = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/domain.pddl"))
+        )
+        TestMultiViewHelper.gripper_problem = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/problem.pddl"))
+        )
+        TestMultiViewHelper.gripper_plans = PlanningResult(
+            plans=[
+                Plan.model_validate(item)
+                for item in json.loads(
+                    read_str_from_file(
+                        os.path.join(
+                            my_dir, rel_pddl_path.format("gripper/plans.json")
+                        )
+                    )
+                )
+            ]
+        ).plans
+
+    def test_views_match_single_views(self) -> None:
+        action_name = "pick ball1 rooma right"
+        selection_infos = [
+            SelectionInfo(
+                selected_first_achiever=action_name,
+                selected_plan_hashes=[
+                    plan.plan_hash
+                    for plan in TestMultiViewHelper.gripper_plans
+                    if plan.plan_hash is not None
+                    and action_name in plan.actions
+                ],
+            )
+        ]
+        args: Tuple[
+            List[SelectionInfo], List[Landmark], str, str, List[Plan]
+        ] = (
+            selection_infos,
+            [],
+            TestMultiViewHelper.gripper_domain,
+            TestMultiViewHelper.gripper_problem,
+            TestMultiViewHelper.gripper_plans,
+        )
+        views_output = get_plan_disambiguator_views_output(
+            *args,
+            SelectionPriority.MAX_PLANS.value,
+            [
+                PlanDisambiguationView.SELECT,
+                PlanDisambiguationView.BUILD_FORWARD,
+                PlanDisambiguationView.BUILD_BACKWARD,
+            ],
+        )
+        self.assertEqual(
+            views_output.select,
+            get_selection_flow_output(*args, SelectionPriority.MAX_PLANS.value)[
+                0
+            ],
+        )
+        self.assertEqual(
+            views_output.build_forward,
+            get_build_flow_output(*args, True)[0],
+        )
+        self.assertEqual(
+            views_output.build_backward,
+            get_build_flow_output(*args, False)[0],
+        )
+        self.assertEqual(len(views_output.select.plans), 3)
+
+    def test_only_requested_views(self) -> None:
+        views_output = get_plan_disambiguator_views_output(
+            [],
+            [],
+            TestMultiViewHelper.gripper_domain,
+            TestMultiViewHelper.gripper_problem,
+            TestMultiViewHelper.gripper_plans,
+            None,
+            [PlanDisambiguationView.BUILD_BACKWARD],
+        )
+        self.assertIsNone(views_output.select)
+        self.assertIsNone(views_output.build_forward)
+        self.assertGreater(len(views_output.build_backward.choice_infos), 0)
@@ -1,7 +1,10 @@
 from typing import List
 import unittest
 import os
-from server.planners.drivers.planner_driver_datatype import PlanningResult
+from server.planners.drivers.planner_driver_datatype import (
+    Plan,
+    PlanningResult,
+)
 from server.helpers.common_helper.file_helper import read_str_from_file
 from server.helpers.planner_helper.planner_helper import (
     get_landmarks_by_landmark_category,
@@ -17,6 +20,7 @@ from server.helpers.planner_helper.planner_helper_data_types import (
 from server.helpers.plan_disambiguator_helper.plan_disambiguator_helper import (
     get_plans_with_selection_infos,
     get_split_by_actions,
+    split_plans_with_actions,
     get_plan_disambiguator_output_filtered_by_selection_infos,
     get_plans_filetered_by_selected_plan_hashes,
     get_plan_idx_edge_dict,
@@ -90,6 +94,22 @@ class TestPlanDisambiguatorHelper(unittest.TestCase):
         )
         self.assertEqual(len(landmark_infos), 8)
 
+    def test_split_plans_with_actions(self) -> None:
+        plans = [
+            Plan(actions=["a", "b", "a"], plan_hash="p0"),
+            Plan(actions=["a", "c"], plan_hash="p1"),
+            Plan(actions=["a", "b"]),
+        ]
+        (
+            action_name_plan_idx_map,
+            action_name_plan_hash_map,
+            max_num_plans,
+        ) = split_plans_with_actions(["a", "b", "c", "d", "e"], plans, {"c"})
+        # an action of all plans does not disambiguate them
+        self.assertEqual(action_name_plan_idx_map, {"b": [0, 2]})
+        self.assertEqual(action_name_plan_hash_map, {"b": ["p0"]})
+        self.assertEqual(max_num_plans, 2)
+
     def test_get_plan_disambiguator_output_filtered_by_selection_infos(
         self,
     ) -> None:
@@ -97,26 +117,18 @@ class TestPlanDisambiguatorHelper(unittest.TestCase):
             selected_first_achiever="pick ball4 rooma left",
             selected_plan_hashes=["6a81b2a65657b4444a989205b590c346"],
         )
-        (
-            selected_plans,
-            landmark_infos,
-            g,
-            _,
-            node_plan_hashes_dict,
-            edge_plan_hash_dict,
-            edge_label_nodes_dict,
-            node_dist_from_initial_state,
-            node_dist_from_end_state,
-        ) = get_plan_disambiguator_output_filtered_by_selection_infos(
-            [selected_landmark_0],
-            TestPlanDisambiguatorHelper.gripper_landmarks,
-            TestPlanDisambiguatorHelper.gripper_domain,
-            TestPlanDisambiguatorHelper.gripper_problem,
-            TestPlanDisambiguatorHelper.planner_response_model.plans,
+        filtered_output = (
+            get_plan_disambiguator_output_filtered_by_selection_infos(
+                [selected_landmark_0],
+                TestPlanDisambiguatorHelper.gripper_landmarks,
+                TestPlanDisambiguatorHelper.gripper_domain,
+                TestPlanDisambiguatorHelper.gripper_problem,
+                TestPlanDisambiguatorHelper.planner_response_model.plans,
+            )
         )
-        self.assertEqual(len(selected_plans), 1)
-        self.assertEqual(len(landmark_infos), 0)
-        self.assertEqual(g.name, "G")
+        self.assertEqual(len(filtered_output.selected_plans), 1)
+        self.assertEqual(len(filtered_output.choice_infos), 0)
+        self.assertEqual(filtered_output.g.name, "G")
 
     def test_get_plans_filetered_by_selected_plan_hashes_no_plan_hash(
         self,
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.planner_helper.landmark_cache_helper import LandmarkCache
+from server.helpers.planner_helper.planner_helper_data_types import (
+    LandmarkCategory,
+)
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}.pddl"
+
+
+class TestLandmarkCacheHelper(unittest.TestCase):
+    def test_get_landmarks(self) -> None:
+        domain = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("domain"))
+        )
+        problem = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("problem"))
+        )
+        with tempfile.TemporaryDirectory() as cache_dir:
+            landmark_cache = LandmarkCache(cache_dir=cache_dir)
+            landmarks = landmark_cache.get_landmarks(
+                LandmarkCategory.RWH.value, domain, problem
+            )
+            self.assertEqual(len(landmarks), 4)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # comments and layout do not change the task
+            landmarks_reformatted = landmark_cache.get_landmarks(
+                LandmarkCategory.RWH.value,
+                "; a comment\n" + domain.replace("\n", "\n  "),
+                problem,
+            )
+            self.assertEqual(landmarks_reformatted, landmarks)
+            stats = landmark_cache.get_stats()
+            self.assertEqual(stats.hits, 1)
+            self.assertEqual(stats.misses, 1)
+
+            # landmarks persisted on disk are reused by a new cache
+            landmark_cache_from_disk = LandmarkCache(cache_dir=cache_dir)
+            self.assertEqual(
+                landmark_cache_from_disk.get_landmarks(
+                    LandmarkCategory.RWH.value, domain, problem
+                ),
+                landmarks,
+            )
+
+    def test_get_landmarks_not_implemented(self) -> None:
+        landmark_cache = LandmarkCache(cache_dir=None)
+        with self.assertRaises(NotImplementedError):
+            landmark_cache.get_landmarks(
+                LandmarkCategory.H1.value, "(define)", "(define)"
+            )
+        self.assertEqual(landmark_cache.get_stats().num_entries, 0)
@@ -0,0 +1,59 @@
+import unittest
+
+from server.helpers.planner_helper.plan_set_helper import (
+    PlanSet,
+    get_action_index,
+    get_plan_index,
+)
+from server.planners.drivers.planner_driver_datatype import Plan
+
+
+class TestPlanSetHelper(unittest.TestCase):
+    def test_get_plan_index(self) -> None:
+        plan_index = get_plan_index(["c", None, "a", "c", "b"])
+        self.assertEqual(plan_index.plan_hashes, ["c", "a", "b"])
+        self.assertEqual(plan_index.plan_ids, {"c": 0, "a": 1, "b": 2})
+
+    def test_plan_set(self) -> None:
+        plan_index = get_plan_index(["a", "b", "c", "d"])
+        plan_set = PlanSet.from_plan_hashes(plan_index, ["d", "b", "unknown"])
+        self.assertEqual(plan_set.get_plan_hashes(), ["b", "d"])
+        self.assertEqual(len(plan_set), 2)
+        self.assertIn("b", plan_set)
+        self.assertNotIn("a", plan_set)
+        self.assertNotIn("unknown", plan_set)
+        self.assertNotIn(None, plan_set)
+
+        other_plan_set = PlanSet.from_plan_hashes(plan_index, ["a", "b"])
+        self.assertEqual((plan_set & other_plan_set).get_plan_hashes(), ["b"])
+        self.assertEqual(
+            (plan_set | other_plan_set).get_plan_hashes(), ["a", "b", "d"]
+        )
+        self.assertEqual(
+            PlanSet.all_plans(plan_index).get_plan_hashes(),
+            ["a", "b", "c", "d"],
+        )
+        self.assertEqual(len(PlanSet(plan_index)), 0)
+        self.assertEqual(
+            plan_set, PlanSet.from_plan_hashes(plan_index, ["b", "d"])
+        )
+
+    def test_plan_sets_of_different_plan_indices(self) -> None:
+        plan_set = PlanSet.all_plans(get_plan_index(["a"]))
+        other_plan_set = PlanSet.all_plans(get_plan_index(["a"]))
+        self.assertNotEqual(plan_set, other_plan_set)
+        with self.assertRaises(ValueError):
+            plan_set & other_plan_set
+
+    def test_get_action_index(self) -> None:
+        action_index = get_action_index(
+            [
+                Plan(actions=["a", "b", "a"]),
+                Plan(actions=["b"]),
+                Plan(actions=[]),
+            ]
+        )
+        self.assertEqual(action_index.num_plans, 3)
+        self.assertEqual(action_index.get_plan_positions("a"), [0])
+        self.assertEqual(action_index.get_plan_positions("b"), [0, 1])
+        self.assertEqual(action_index.get_plan_positions("c"), [])
@@ -0,0 +1,67 @@
+import unittest
+
+from server.helpers.common_helper.hash_helper import get_list_hash
+from server.helpers.plan_disambiguator_helper.plan_disambiguator_helper import (
+    get_plans_filetered_by_selected_plan_hashes,
+    get_plans_with_selection_infos,
+)
+from server.helpers.planner_helper.plan_store_helper import get_plan_store
+from server.helpers.planner_helper.planner_helper_data_types import (
+    SelectionInfo,
+)
+from server.planners.drivers.planner_driver_datatype import Plan
+
+
+class TestPlanStoreHelper(unittest.TestCase):
+    def test_get_plan_store(self) -> None:
+        plans = [
+            Plan(actions=["a"], plan_hash="p0"),
+            Plan(actions=["b"]),
+            Plan(actions=["c"], plan_hash="p0"),
+        ]
+        plan_store = get_plan_store(plans)
+        # missing plan hashes are set on copies of the plans
+        self.assertIsNone(plans[1].plan_hash)
+        self.assertEqual(plan_store.plans[1].plan_hash, get_list_hash(["b"]))
+        self.assertEqual(
+            plan_store.plan_index.plan_hashes, ["p0", get_list_hash(["b"])]
+        )
+        self.assertEqual(plan_store.plan_positions, ((0, 2), (1,)))
+
+        plan_set = plan_store.get_plan_set(["p0", "unknown"])
+        selected_plans = plan_store.get_plans(plan_set)
+        self.assertEqual(len(selected_plans), 2)
+        self.assertIs(selected_plans[0], plans[0])
+        self.assertIs(selected_plans[1], plans[2])
+        self.assertEqual(
+            plan_store.get_plans(plan_store.get_all_plans()),
+            list(plan_store.plans),
+        )
+        with self.assertRaises(ValueError):
+            plan_store.get_plans(get_plan_store(plans).get_plan_set(["p0"]))
+        self.assertIs(get_plan_store(plan_store), plan_store)
+
+    def test_plans_are_not_copied(self) -> None:
+        plans = [
+            Plan(actions=["a"], plan_hash="p0"),
+            Plan(actions=["b"], plan_hash="p1"),
+            Plan(actions=["c"], plan_hash="p2"),
+        ]
+        selected_plans = get_plans_with_selection_infos(
+            [
+                SelectionInfo(selected_plan_hashes=["p0", "p2"]),
+                SelectionInfo(selected_plan_hashes=["p2"]),
+            ],
+            plans,
+        )
+        self.assertEqual(len(selected_plans), 1)
+        self.assertIs(selected_plans[0], plans[2])
+        for selected_plans in [
+            get_plans_with_selection_infos([], plans),
+            get_plans_filetered_by_selected_plan_hashes(
+                SelectionInfo(selected_plan_hashes=[]), plans
+            ),
+        ]:
+            self.assertEqual(len(selected_plans), 3)
+            for selected_plan, plan in zip(selected_plans, plans):
+                self.assertIs(selected_plan, plan)
@@ -1,8 +1,12 @@
 import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+
 from server.helpers.common_helper.file_helper import read_str_from_file
 from server.helpers.planner_helper.planner_helper import (
     get_dot_graph_str,
+    compute_plan_topk,
     get_landmarks_by_landmark_category,
     get_plan_topk,
 )
@@ -16,6 +20,16 @@ rel_pddl_path = "../../data/pddl/{}.pddl"
 
 
 class TestPlannerHelper(unittest.TestCase):
+    def setUp(self) -> None:
+        # planners write their files in the working directory
+        self.cwd = os.getcwd()
+        self.run_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.run_dir.name)
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.run_dir.cleanup()
+
     def test_get_plan_topk(self) -> None:
         domain = read_str_from_file(
             os.path.join(my_dir, rel_pddl_path.format("domain"))
@@ -30,6 +44,24 @@ class TestPlannerHelper(unittest.TestCase):
         )
         self.assertEqual(len(result.plans), 1)
 
+    def test_concurrent_plan_topk(self) -> None:
+        planning_task = PlanningTask(
+            domain=read_str_from_file(
+                os.path.join(my_dir, rel_pddl_path.format("toy/domain"))
+            ),
+            problem=read_str_from_file(
+                os.path.join(my_dir, rel_pddl_path.format("toy/problem"))
+            ),
+            num_plans=4,
+            quality_bound=1.5,
+        )
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(compute_plan_topk, [planning_task] * 4))
+        for result in results:
+            self.assertEqual(len(result.plans), 4)
+        # each call runs in a working directory of its own
+        self.assertEqual(os.listdir(), [])
+
     def test_get_landmarks_by_landmark_category(self) -> None:
         domain = read_str_from_file(
             os.path.join(my_dir, rel_pddl_path.format("domain"))
@@ -0,0 +1,106 @@
+import unittest
+from typing import List
+
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanningTask,
+)
+from server.helpers.planner_helper.planning_result_cache_helper import (
+    PlanningResultCache,
+)
+from server.planners.drivers.planner_driver_datatype import Plan, PlanningResult
+
+
+def get_planning_task(
+    num_plans: int, quality_bound: float, domain: str = "(define (domain d))"
+) -> PlanningTask:
+    return PlanningTask(
+        domain=domain,
+        problem="(define (problem p))",
+        num_plans=num_plans,
+        quality_bound=quality_bound,
+    )
+
+
+def get_planning_result(costs: List[int]) -> PlanningResult:
+    return PlanningResult(
+        plans=[
+            Plan(actions=[f"action_{idx}"], cost=cost)
+            for idx, cost in enumerate(costs)
+        ]
+    )
+
+
+class TestPlanningResultCacheHelper(unittest.TestCase):
+    def test_fewer_plans_are_a_prefix_by_cost(self) -> None:
+        cache = PlanningResultCache()
+        cache.add_planning_result(
+            "topk",
+            get_planning_task(4, 2.0),
+            get_planning_result([12, 10, 11, 20]),
+        )
+        planning_result = cache.get_planning_result(
+            "topk", get_planning_task(2, 2.0)
+        )
+        assert planning_result is not None
+        self.assertEqual(
+            [plan.cost for plan in planning_result.plans], [10, 11]
+        )
+        # more plans than found by a run that stopped at its bound
+        self.assertIsNone(
+            cache.get_planning_result("topk", get_planning_task(5, 2.0))
+        )
+        # other planners and tasks are not shared
+        self.assertIsNone(
+            cache.get_planning_result("symk", get_planning_task(2, 2.0))
+        )
+        self.assertIsNone(
+            cache.get_planning_result(
+                "topk", get_planning_task(2, 2.0, "(define (domain e))")
+            )
+        )
+
+    def test_tighter_quality_bound_filters_plans(self) -> None:
+        cache = PlanningResultCache()
+        cache.add_planning_result(
+            "topk",
+            get_planning_task(10, 2.0),
+            get_planning_result([10, 11, 15, 20]),
+        )
+        planning_result = cache.get_planning_result(
+            "topk", get_planning_task(10, 1.2)
+        )
+        assert planning_result is not None
+        self.assertEqual(
+            [plan.cost for plan in planning_result.plans], [10, 11]
+        )
+        # a looser quality bound needs the planner
+        self.assertIsNone(
+            cache.get_planning_result("topk", get_planning_task(10, 3.0))
+        )
+        stats = cache.get_stats()
+        self.assertEqual(stats.hits, 1)
+        self.assertEqual(stats.misses, 1)
+
+    def test_tighter_quality_bound_of_truncated_run(self) -> None:
+        cache = PlanningResultCache()
+        cache.add_planning_result(
+            "topk", get_planning_task(3, 2.0), get_planning_result([10, 11, 15])
+        )
+        planning_result = cache.get_planning_result(
+            "topk", get_planning_task(2, 1.2)
+        )
+        assert planning_result is not None
+        self.assertEqual(len(planning_result.plans), 2)
+        # there may be more plans within the bound than the run returned
+        self.assertIsNone(
+            cache.get_planning_result("topk", get_planning_task(3, 1.2))
+        )
+
+    def test_empty_planning_result_is_not_cached(self) -> None:
+        cache = PlanningResultCache()
+        cache.add_planning_result(
+            "topk", get_planning_task(3, 2.0), get_planning_result([])
+        )
+        self.assertIsNone(
+            cache.get_planning_result("topk", get_planning_task(1, 1.0))
+        )
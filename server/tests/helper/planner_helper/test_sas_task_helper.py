@@ -0,0 +1,110 @@
+import unittest
+
+from server.helpers.planner_helper.sas_task_helper import (
+    SASEffect,
+    get_normalized_operator_name,
+    parse_sas_task_str,
+)
+
+# operators without parameters are named with a trailing space
+SAS_TASK_STR = """begin_version
+3
+end_version
+begin_metric
+0
+end_metric
+2
+begin_variable
+var0
+-1
+2
+Atom at(rooma)
+Atom at(roomb)
+end_variable
+begin_variable
+var1
+-1
+2
+Atom lit()
+NegatedAtom lit()
+end_variable
+1
+begin_mutex_group
+2
+0 0
+0 1
+end_mutex_group
+begin_state
+0
+1
+end_state
+begin_goal
+1
+0 1
+end_goal
+2
+begin_operator
+move rooma roomb
+1
+1 0
+2
+0 0 0 1
+1 0 0 1 -1 0
+1
+end_operator
+begin_operator
+switch\x20
+0
+1
+0 1 -1 0
+1
+end_operator
+0
+"""
+
+
+class TestSASTaskHelper(unittest.TestCase):
+    def test_parse_sas_task_str(self) -> None:
+        sas_task = parse_sas_task_str(SAS_TASK_STR)
+        self.assertEqual(
+            sas_task.value_names,
+            [
+                ["Atom at(rooma)", "Atom at(roomb)"],
+                ["Atom lit()", "NegatedAtom lit()"],
+            ],
+        )
+        self.assertEqual(sas_task.initial_state, (0, 1))
+        self.assertEqual(sas_task.goal, ((0, 1),))
+        self.assertEqual(sas_task.num_axioms, 0)
+        self.assertEqual(
+            list(sas_task.operators), ["move rooma roomb", "switch"]
+        )
+
+        operator = sas_task.operators["move rooma roomb"]
+        # prevail conditions come before the preconditions of effects
+        self.assertEqual(operator.preconditions, ((1, 0), (0, 0)))
+        self.assertEqual(
+            operator.effects,
+            (
+                SASEffect(conditions=(), var=0, value=1),
+                SASEffect(conditions=((0, 0),), var=1, value=0),
+            ),
+        )
+        self.assertEqual(sas_task.operators["switch"].name, "switch ")
+
+    def test_unsupported_sas_task_str(self) -> None:
+        for sas_task_str in [
+            "",
+            SAS_TASK_STR.replace("begin_version\n3", "begin_version\n2"),
+            SAS_TASK_STR.replace("end_goal", "end"),
+            SAS_TASK_STR[:-3],
+        ]:
+            with self.assertRaises(ValueError):
+                parse_sas_task_str(sas_task_str)
+
+    def test_get_normalized_operator_name(self) -> None:
+        self.assertEqual(
+            get_normalized_operator_name("(PICK ball1  rooma left)"),
+            "pick ball1 rooma left",
+        )
+        self.assertEqual(get_normalized_operator_name("a "), "a")
@@ -0,0 +1,119 @@
+import asyncio
+import marshal
+import unittest
+
+from server.helpers.profile_helper.profile_helper import (
+    ProfileStore,
+    get_collapsed_stacks,
+    is_profiling,
+    is_profiling_authorized,
+    profile_store,
+    profiled,
+    requested_profile,
+)
+
+
+def get_sum(n: int) -> int:
+    return sum(range(n))
+
+
+@profiled
+def get_sums(n: int) -> int:
+    return get_sum(n) + get_sum(n)
+
+
+@profiled
+async def get_sum_async(n: int) -> int:
+    return get_sum(n)
+
+
+class TestProfileHelper(unittest.TestCase):
+    def setUp(self) -> None:
+        profile_store.clear()
+
+    def test_is_profiling_authorized(self) -> None:
+        self.assertTrue(is_profiling_authorized("secret", "secret"))
+        self.assertFalse(is_profiling_authorized("guess", "secret"))
+        self.assertFalse(is_profiling_authorized(None, "secret"))
+        # profiling is disabled without a token
+        self.assertFalse(is_profiling_authorized("secret", None))
+
+    def test_not_requested(self) -> None:
+        self.assertFalse(is_profiling())
+        self.assertEqual(get_sums(10), 90)
+        self.assertEqual(len(profile_store.get_profile_infos()), 0)
+
+    def test_requested(self) -> None:
+        with requested_profile("/sums") as profile_request:
+            self.assertTrue(is_profiling())
+            self.assertEqual(get_sums(10000), 2 * 49995000)
+        self.assertFalse(is_profiling())
+        assert profile_request.profile_id is not None
+        profile_infos = profile_store.get_profile_infos()
+        self.assertEqual(len(profile_infos), 1)
+        self.assertEqual(profile_infos[0].endpoint, "/sums")
+        self.assertEqual(
+            profile_infos[0].profile_id, profile_request.profile_id
+        )
+
+        profile = profile_store.get_profile(profile_request.profile_id)
+        assert profile is not None
+        function_names = {
+            function_name
+            for (_, _, function_name) in marshal.loads(profile.get_pstats())
+        }
+        self.assertIn("get_sum", function_names)
+        self.assertIn("get_sum", profile.get_text())
+        collapsed_stacks = profile.get_collapsed_stacks()
+        self.assertIn("test_profile_helper.py:get_sum:", collapsed_stacks)
+        for line in collapsed_stacks.splitlines():
+            _, self_time = line.rsplit(" ", 1)
+            self.assertGreater(int(self_time), 0)
+
+    def test_requested_async(self) -> None:
+        with requested_profile("/sum") as profile_request:
+            self.assertEqual(asyncio.run(get_sum_async(10)), 45)
+        self.assertIsNotNone(profile_request.profile_id)
+
+    def test_collapsed_stacks(self) -> None:
+        root = ("main.py", 1, "main")
+        child = ("main.py", 5, "child")
+        # the child is called by main and by itself
+        stats = {
+            root: (1, 1, 0.5, 1.5, {}),
+            child: (
+                2,
+                3,
+                1.0,
+                1.0,
+                {root: (1, 1, 0.5, 1.0), child: (1, 2, 0.5, 0.5)},
+            ),
+        }
+        self.assertEqual(
+            get_collapsed_stacks(stats),
+            {
+                "main.py:main:1": 500000,
+                "main.py:main:1;main.py:child:5": 1000000,
+            },
+        )
+
+    def test_profile_store(self) -> None:
+        store = ProfileStore(max_profiles=2)
+        profile_ids = []
+        for _ in range(3):
+            with requested_profile("/sums") as profile_request:
+                get_sums(10)
+            assert profile_request.profile_id is not None
+            profile = profile_store.get_profile(profile_request.profile_id)
+            assert profile is not None
+            store.add_profile(profile)
+            profile_ids.append(profile.profile_id)
+        # the oldest profile is dropped and the latest comes first
+        self.assertIsNone(store.get_profile(profile_ids[0]))
+        self.assertEqual(
+            [
+                profile_info.profile_id
+                for profile_info in store.get_profile_infos()
+            ],
+            profile_ids[:0:-1],
+        )
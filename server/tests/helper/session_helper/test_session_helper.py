@@ -0,0 +1,131 @@
+import json
+import os
+import unittest
+from typing import List
+
+from fastapi import HTTPException
+
+from server.helpers.common_helper.file_helper import read_str_from_file
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanDisambiguationView,
+    PlanDisambiguatorInput,
+    SelectionInfo,
+)
+from server.helpers.session_helper.session_helper import SessionStore
+from server.planners.drivers.planner_driver_datatype import Plan
+
+my_dir = os.path.dirname(__file__)
+rel_pddl_path = "../../data/pddl/{}"
+
+
+class TestSessionHelper(unittest.TestCase):
+    gripper_domain: str
+    gripper_problem: str
+    gripper_plans: List[Plan]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestSessionHelper.gripper_domain = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/domain.pddl"))
+        )
+        TestSessionHelper.gripper_problem = read_str_from_file(
+            os.path.join(my_dir, rel_pddl_path.format("gripper/problem.pddl"))
+        )
+        TestSessionHelper.gripper_plans = [
+            Plan.model_validate(item)
+            for item in json.loads(
+                read_str_from_file(
+                    os.path.join(
+                        my_dir, rel_pddl_path.format("gripper/plans.json")
+                    )
+                )
+            )
+        ]
+
+    def get_plan_disambiguator_input(self) -> PlanDisambiguatorInput:
+        return PlanDisambiguatorInput(
+            selection_priority=None,
+            selection_infos=[],
+            landmarks=[],
+            plans=TestSessionHelper.gripper_plans,
+            domain=TestSessionHelper.gripper_domain,
+            problem=TestSessionHelper.gripper_problem,
+        )
+
+    def test_session_select_undo_reset(self) -> None:
+        session_store = SessionStore()
+        session = session_store.create_session(
+            self.get_plan_disambiguator_input()
+        )
+        self.assertIs(session_store.get_session(session.session_id), session)
+        self.assertEqual(
+            session.get_session_info().num_plans,
+            len(TestSessionHelper.gripper_plans),
+        )
+
+        self.assertIsNone(session.plan_graph)
+        size_before = session.get_size()
+        output_0 = session.get_output(PlanDisambiguationView.BUILD_FORWARD)
+        assert output_0 is not None
+        # the plan graph of all plans is kept for the lifetime of the session
+        plan_graph = session.plan_graph
+        assert plan_graph is not None
+        self.assertGreater(session.get_size(), size_before)
+        self.assertEqual(
+            len(output_0.plans), len(TestSessionHelper.gripper_plans)
+        )
+        self.assertGreater(len(output_0.choice_infos), 0)
+
+        action_name, plan_hashes = list(
+            output_0.choice_infos[0].action_name_plan_hash_map.items()
+        )[0]
+        session.add_selection_info(
+            SelectionInfo(
+                selected_first_achiever=action_name,
+                selected_plan_hashes=plan_hashes,
+            )
+        )
+        output_1 = session.get_output(PlanDisambiguationView.BUILD_FORWARD)
+        assert output_1 is not None
+        self.assertEqual(len(output_1.plans), len(plan_hashes))
+        self.assertIs(session.plan_graph, plan_graph)
+        for plan in output_1.plans:
+            self.assertIn(plan, session.plans)
+        self.assertEqual(session.get_session_info().num_selections, 1)
+
+        session.undo_selection_info()
+        self.assertIs(
+            session.get_output(PlanDisambiguationView.BUILD_FORWARD), output_0
+        )
+        session.add_selection_info(
+            SelectionInfo(
+                selected_first_achiever=action_name,
+                selected_plan_hashes=plan_hashes,
+            )
+        )
+        session.reset_selection_infos()
+        self.assertEqual(session.get_session_info().num_selections, 0)
+
+        self.assertTrue(session_store.delete_session(session.session_id))
+        self.assertIsNone(session_store.get_session(session.session_id))
+
+    def test_session_store_memory_budget(self) -> None:
+        session_store = SessionStore(memory_budget=1)
+        # a session larger than the whole budget is refused
+        with self.assertRaises(HTTPException) as context:
+            session_store.create_session(self.get_plan_disambiguator_input())
+        self.assertEqual(context.exception.status_code, 413)
+        self.assertEqual(session_store.get_stats().num_entries, 0)
+        self.assertEqual(session_store.get_stats().evictions, 1)
+
+    def test_session_store_resizes_growing_sessions(self) -> None:
+        session_store = SessionStore()
+        session = session_store.create_session(
+            self.get_plan_disambiguator_input()
+        )
+        initial_size = session_store.get_stats().size
+        self.assertEqual(initial_size, session.get_size())
+        session.get_output(PlanDisambiguationView.SELECT)
+        # the plan graph and the output are charged to the memory budget
+        self.assertGreater(session_store.get_stats().size, initial_size)
+        self.assertEqual(session_store.get_stats().size, session.get_size())
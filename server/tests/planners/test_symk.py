@@ -0,0 +1,106 @@
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from server.helpers.planner_helper.planner_helper_data_types import (
+    PlanningTask,
+)
+from server.helpers.planner_helper.planning_result_cache_helper import (
+    planning_result_cache,
+)
+from server.planners.symk import SymKPlanner, read_plan_file
+
+# writes plans like symk does, one plan file per plan, with a duplicate plan
+FAKE_PLANNER = """#!{python}
+import sys
+import time
+
+plan_file = sys.argv[sys.argv.index("--plan-file") + 1]
+plans = [["a x", "b"], ["c"], ["a  x", "b"], ["d", "e"]]
+for idx, actions in enumerate(plans):
+    with open(f"{{plan_file}}.{{idx + 1}}", "w") as f:
+        f.write("".join(f"({{action}})\\n" for action in actions))
+        f.write(f"; cost = {{len(actions)}} (unit cost)\\n")
+    time.sleep({delay})
+sys.exit({exit_code})
+"""
+
+
+class TestSymK(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        # planners write their files in the working directory
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def get_planner(self, delay: float, exit_code: int = 0) -> SymKPlanner:
+        bin_path = Path(self.temp_dir.name) / "fake-downward.py"
+        bin_path.write_text(
+            FAKE_PLANNER.format(
+                python=sys.executable, delay=delay, exit_code=exit_code
+            )
+        )
+        bin_path.chmod(bin_path.stat().st_mode | stat.S_IEXEC)
+        return SymKPlanner(bin_path)
+
+    def get_planning_task(self) -> PlanningTask:
+        # a new task each time, so that the planning result cache is missed
+        return PlanningTask(
+            domain=f"(define (domain {os.path.basename(self.temp_dir.name)}))",
+            problem="(define (problem p))",
+            num_plans=4,
+            quality_bound=2.0,
+        )
+
+    def test_read_plan_file(self) -> None:
+        plan_file = Path(self.temp_dir.name) / "sas_plan.1"
+        plan_file.write_text("(a  x)\n(b)\n")
+        self.assertIsNone(read_plan_file(plan_file))
+        plan_file.write_text("(a  x)\n(b)\n; cost = 2 (unit cost)\n")
+        plan = read_plan_file(plan_file)
+        assert plan is not None
+        self.assertEqual(plan.actions, ["a x", "b"])
+        self.assertEqual(plan.cost, 2)
+        self.assertIsNotNone(plan.plan_hash)
+
+    def test_stream_plans(self) -> None:
+        planner = self.get_planner(0.0)
+        planning_task = self.get_planning_task()
+        plans = list(planner.stream_plans(planning_task))
+        self.assertEqual(
+            [plan.actions for plan in plans],
+            [["a x", "b"], ["c"], ["d", "e"]],
+        )
+        # streamed plans are shared with the planning result cache
+        self.assertEqual(
+            len(list(planner.stream_plans(planning_task))), len(plans)
+        )
+
+    def test_stream_plans_before_planner_finishes(self) -> None:
+        planner = self.get_planner(5.0)
+        start_time = time.monotonic()
+        planning_task = self.get_planning_task()
+        plans = planner.stream_plans(planning_task)
+        self.assertEqual(next(plans).actions, ["a x", "b"])
+        plans.close()  # kills the planner
+        self.assertLess(time.monotonic() - start_time, 5.0)
+        self.assertIsNone(
+            planning_result_cache.get_planning_result("symk", planning_task)
+        )
+
+    def test_stream_plans_of_failed_planner(self) -> None:
+        planner = self.get_planner(0.0, exit_code=1)
+        planning_task = self.get_planning_task()
+        plans = list(planner.stream_plans(planning_task))
+        self.assertEqual(len(plans), 3)
+        # the plans found before the planner failed are not cached
+        self.assertIsNone(
+            planning_result_cache.get_planning_result("symk", planning_task)
+        )